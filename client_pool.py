@@ -0,0 +1,116 @@
+"""
+Clientes por hilo para las integraciones con Jira y GitHub
+Los clientes (y su requests.Session) no son seguros entre hilos: cada hilo
+usa su propia instancia, tomada de un pool de clientes que se reutilizan
+entre hilos (workers de una sola vez y pools de ThreadPoolExecutor)
+"""
+
+import threading
+import weakref
+from typing import Callable, Any
+from requests.adapters import HTTPAdapter
+
+# Conexiones abiertas que conserva cada cliente por host
+POOL_MAXSIZE = 4
+# Hosts distintos que recuerda cada cliente
+POOL_CONNECTIONS = 2
+# Clientes libres que se conservan para los próximos hilos
+MAX_IDLE_CLIENTS = 8
+
+
+def limit_session_pool(session, pool_maxsize: int = POOL_MAXSIZE):
+    """Limita las conexiones que mantiene abiertas una sesión de requests"""
+    for prefix in ('https://', 'http://'):
+        current = session.adapters.get(prefix)
+        max_retries = current.max_retries if current else 0
+        session.mount(prefix, HTTPAdapter(pool_connections=POOL_CONNECTIONS,
+                                          pool_maxsize=pool_maxsize,
+                                          max_retries=max_retries))
+    return session
+
+
+class _ClientLease:
+    """Cliente asignado a un hilo; al terminar el hilo se libera y el cliente vuelve al pool"""
+    
+    __slots__ = ('client', '__weakref__')
+    
+    def __init__(self, client: Any):
+        self.client = client
+
+
+def _close_client(client: Any):
+    """Cierra la sesión de un cliente si tiene close()"""
+    try:
+        close = getattr(client, 'close', None)
+        if close:
+            close()
+    except Exception as e:
+        print(f"Error al cerrar cliente: {e}")
+
+
+class ThreadLocalClient:
+    """
+    Reemplazo del cliente compartido que delega en un cliente propio de cada hilo
+    
+    Se usa igual que el cliente original (client.get_repo(...), client.myself()):
+    cada llamada se resuelve con la instancia del hilo que la hace. El hilo que
+    se conectó reutiliza el cliente ya validado. Los demás toman un cliente
+    libre del pool (con su sesión, conexiones abiertas y cachés) y solo crean
+    uno con factory si no hay ninguno; al terminar el hilo, su cliente vuelve
+    al pool, que conserva hasta max_idle clientes.
+    """
+    
+    def __init__(self, factory: Callable[[], Any], primary: Any = None,
+                 max_idle: int = MAX_IDLE_CLIENTS):
+        self._factory = factory
+        self._max_idle = max_idle
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle = []                    # Clientes libres, listos para otro hilo
+        self._clients = weakref.WeakSet()  # Todos los clientes vivos (para close_all)
+        self._closed = False
+        if primary is not None:
+            self._local.lease = _ClientLease(primary)
+            self._clients.add(primary)
+    
+    def get(self) -> Any:
+        """Cliente del hilo actual"""
+        lease = getattr(self._local, 'lease', None)
+        if lease is None:
+            lease = _ClientLease(self._checkout())
+            self._local.lease = lease
+            # El threading.local se descarta al terminar el hilo y con él la asignación
+            weakref.finalize(lease, self._release, lease.client)
+        return lease.client
+    
+    def _checkout(self) -> Any:
+        """Toma un cliente libre o crea uno nuevo"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        client = self._factory()
+        with self._lock:
+            self._clients.add(client)
+        return client
+    
+    def _release(self, client: Any):
+        """Devuelve al pool el cliente de un hilo terminado"""
+        with self._lock:
+            keep = not self._closed and len(self._idle) < self._max_idle
+            if keep:
+                self._idle.append(client)
+        if not keep:
+            _close_client(client)
+    
+    def close_all(self):
+        """Cierra las sesiones de todos los clientes creados (al desconectar)"""
+        with self._lock:
+            self._closed = True
+            clients = list(self._clients)
+            self._clients.clear()
+            self._idle.clear()
+        for client in clients:
+            _close_client(client)
+    
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
@@ -18,6 +18,19 @@ class AppConfig:
             "github_token": None,
             "jira_server": None,
             "jira_username": None,
+            "jira_query_cache_ttl": 120,
+            "jira_jql_metadata_ttl": 3600,
+            "jira_auto_refresh": False,
+            "jira_qa_role_fields": None,
+            "jira_qa_metrics_jql": None,
+            "qa_batch_output_dir": None,
+            "qa_batch_max_workers": 4,
+            "evidence_max_workers": 3,
+            "webhook_enabled": False,
+            "webhook_host": "127.0.0.1",
+            "webhook_port": 8765,
+            "webhook_jira_secret": None,
+            "webhook_github_secret": None,
             "last_project": None
         }
         self.ensure_config_dir()
@@ -73,6 +73,43 @@ class TareaQAController:
         """Actualiza el link de Jira"""
         self.tarea.jira = jira
     
+    def autocompletar_desde_jira(self, datos: dict) -> dict:
+        """
+        Completa la tarea con los datos reunidos desde un issue de Jira
+        
+        No duplica PRs ni responsables ya cargados. Cada PR se asocia al ambiente
+        de su rama destino o, si no se conoce, al primer ambiente mencionado en el issue.
+        
+        Returns:
+            dict: Cantidad de PRs y responsables agregados
+        """
+        if datos.get('summary'):
+            self.tarea.titulo = datos['summary']
+        if datos.get('url'):
+            self.tarea.jira = datos['url']
+        
+        ambientes = datos.get('environments') or []
+        prs_cargados = {item.pr for item in self.tarea.ambientes_prs}
+        prs_agregados = 0
+        for pr in datos.get('prs', []):
+            if pr['url'] in prs_cargados:
+                continue
+            ambiente = pr.get('environment') or (ambientes[0] if ambientes else 'Por definir')
+            if self.agregar_ambiente_pr(ambiente, pr['url']):
+                prs_cargados.add(pr['url'])
+                prs_agregados += 1
+        
+        roles = datos.get('qa_roles') or {}
+        responsables_agregados = 0
+        for nombre in roles.get('qa_usabilidad', []):
+            if nombre not in self.tarea.qa_usabilidad and self.agregar_qa_usabilidad(nombre):
+                responsables_agregados += 1
+        for nombre in roles.get('qa_codigo', []):
+            if nombre not in self.tarea.qa_codigo and self.agregar_qa_codigo(nombre):
+                responsables_agregados += 1
+        
+        return {'prs': prs_agregados, 'responsables': responsables_agregados}
+    
     def generar_texto(self) -> str:
         """Genera el texto formateado de la tarea"""
         return self.tarea.generar_texto()
@@ -0,0 +1,279 @@
+"""
+Diálogo para subir evidencias a un issue de Jira y a Slack
+"""
+
+import os
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                           QPushButton, QLineEdit, QMessageBox, QProgressBar,
+                           QCheckBox, QFileDialog, QTreeWidget, QTreeWidgetItem)
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QFont
+from styles import ThemeManager
+from evidence_uploads import (EvidenceUploadPipeline, JiraEvidenceTarget,
+                              SlackEvidenceTarget)
+
+class EvidenceUploadWorker(QThread):
+    """Worker para subir las evidencias en background"""
+    file_progress = pyqtSignal(str, str, int)     # ruta, destino, porcentaje
+    file_result = pyqtSignal(str, str, str, str)  # ruta, destino, estado, mensaje
+    upload_completed = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, pipeline, paths):
+        super().__init__()
+        self.pipeline = pipeline
+        self.paths = paths
+        self._stop_requested = False
+    
+    def stop(self):
+        """No empieza más subidas; las que están en curso terminan"""
+        self._stop_requested = True
+    
+    def run(self):
+        try:
+            summary = self.pipeline.run(
+                self.paths,
+                on_progress=lambda path, target, sent, total: self.file_progress.emit(
+                    path, target, int(sent * 100 / total) if total else 100),
+                on_result=self.file_result.emit,
+                should_stop=lambda: self._stop_requested
+            )
+            self.upload_completed.emit(summary)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+class EvidenceUploadDialog(QDialog):
+    """Diálogo para elegir archivos y subirlos a Jira y Slack con avance por archivo"""
+    
+    STATUS_ICONS = {'done': "✅ Subido", 'skipped': "⏩ Omitido", 'failed': "❌ Error", 'stopped': "⏹️ Detenido"}
+    
+    def __init__(self, parent, jira_service=None, issue_key="", slack_client=None,
+                 slack_channel=None, slack_destination="",
+                 max_workers=EvidenceUploadPipeline.DEFAULT_MAX_WORKERS):
+        super().__init__(parent)
+        self.jira_service = jira_service
+        self.slack_client = slack_client
+        self.slack_channel = slack_channel
+        self.slack_destination = slack_destination
+        self.max_workers = max_workers
+        self.paths = []
+        self.rows = {}  # (ruta, destino) -> (item, barra de progreso)
+        self.worker = None
+        
+        self.setWindowTitle("📎 Subir Evidencias")
+        self.setModal(True)
+        self.resize(680, 520)
+        self.setup_ui(issue_key)
+    
+    def setup_ui(self, issue_key):
+        """Configura la interfaz del diálogo"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+        layout.setContentsMargins(20, 20, 20, 20)
+        
+        # Aplicar estilos
+        self.setStyleSheet(ThemeManager.get_theme_class().get_main_stylesheet())
+        
+        info_label = QLabel("📎 Sube capturas, videos o logs al issue de Jira y al canal de Slack")
+        info_label.setFont(QFont("Arial", 11, QFont.Weight.Bold))
+        info_label.setWordWrap(True)
+        info_label.setStyleSheet("color: #f8f8f2; background-color: #44475a; padding: 10px; border-radius: 6px;")
+        layout.addWidget(info_label)
+        
+        # Destinos
+        jira_layout = QHBoxLayout()
+        self.jira_check = QCheckBox("🎫 Adjuntar al issue")
+        self.jira_check.setEnabled(self.jira_service is not None)
+        self.jira_check.setChecked(self.jira_service is not None)
+        jira_layout.addWidget(self.jira_check)
+        
+        self.issue_input = QLineEdit(issue_key)
+        self.issue_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.issue_input.setPlaceholderText("Ej: PROJ-123")
+        self.issue_input.setEnabled(self.jira_service is not None)
+        jira_layout.addWidget(self.issue_input)
+        layout.addLayout(jira_layout)
+        
+        self.slack_check = QCheckBox(f"📤 Enviar a Slack ({self.slack_destination or 'sin destino'})")
+        self.slack_check.setEnabled(self.slack_client is not None)
+        layout.addWidget(self.slack_check)
+        
+        self.comment_input = QLineEdit()
+        self.comment_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.comment_input.setPlaceholderText("Comentario para Slack (opcional)")
+        self.comment_input.setEnabled(self.slack_client is not None)
+        layout.addWidget(self.comment_input)
+        
+        # Archivos y avance por destino
+        files_layout = QHBoxLayout()
+        self.add_btn = QPushButton("➕ Agregar Archivos")
+        self.add_btn.clicked.connect(self.add_files)
+        self.add_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        files_layout.addWidget(self.add_btn)
+        
+        self.clear_btn = QPushButton("🗑️ Limpiar")
+        self.clear_btn.clicked.connect(self.clear_files)
+        self.clear_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        files_layout.addWidget(self.clear_btn)
+        files_layout.addStretch()
+        layout.addLayout(files_layout)
+        
+        self.files_tree = QTreeWidget()
+        self.files_tree.setHeaderLabels(["Archivo", "Avance", "Estado"])
+        self.files_tree.setColumnWidth(0, 300)
+        self.files_tree.setColumnWidth(1, 160)
+        layout.addWidget(self.files_tree)
+        
+        # Botones
+        buttons_layout = QHBoxLayout()
+        
+        self.start_btn = QPushButton("🚀 Subir")
+        self.start_btn.clicked.connect(self.start_upload)
+        self.start_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(self.start_btn)
+        
+        self.cancel_btn = QPushButton("❌ Cancelar")
+        self.cancel_btn.clicked.connect(self.reject)
+        self.cancel_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(self.cancel_btn)
+        
+        layout.addLayout(buttons_layout)
+    
+    def add_files(self):
+        """Agrega archivos a la lista (sin repetir rutas)"""
+        paths, _ = QFileDialog.getOpenFileNames(self, "Evidencias")
+        for path in paths:
+            if path not in self.paths:
+                self.paths.append(path)
+                item = QTreeWidgetItem([os.path.basename(path), self.format_size(os.path.getsize(path)), ""])
+                item.setToolTip(0, path)
+                self.files_tree.addTopLevelItem(item)
+    
+    def clear_files(self):
+        """Vacía la lista de archivos"""
+        self.paths = []
+        self.rows = {}
+        self.files_tree.clear()
+    
+    @staticmethod
+    def format_size(size):
+        """Tamaño legible de un archivo"""
+        for unit in ("B", "KB", "MB"):
+            if size < 1024:
+                return f"{size:.0f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
+    
+    def get_targets(self):
+        """Destinos elegidos; None si falta algún dato"""
+        targets = []
+        if self.jira_check.isChecked():
+            issue_key = self.issue_input.text().strip().upper()
+            if not issue_key:
+                QMessageBox.warning(self, "⚠️ Advertencia", "Escribe la clave del issue de Jira")
+                return None
+            targets.append(JiraEvidenceTarget(self.jira_service, issue_key))
+        if self.slack_check.isChecked():
+            targets.append(SlackEvidenceTarget(self.slack_client, self.slack_channel, self.slack_destination,
+                                               self.comment_input.text().strip() or None))
+        if not targets:
+            QMessageBox.warning(self, "⚠️ Advertencia", "Elige al menos un destino")
+            return None
+        return targets
+    
+    def start_upload(self):
+        """Arma una fila por archivo y destino y lanza la subida"""
+        if not self.paths:
+            QMessageBox.warning(self, "⚠️ Advertencia", "Agrega al menos un archivo")
+            return
+        targets = self.get_targets()
+        if not targets:
+            return
+        
+        self.rows = {}
+        for index, path in enumerate(self.paths):
+            parent = self.files_tree.topLevelItem(index)
+            parent.takeChildren()
+            for target in targets:
+                item = QTreeWidgetItem([target.label, "", "⏳ Pendiente"])
+                parent.addChild(item)
+                progress_bar = QProgressBar()
+                progress_bar.setRange(0, 100)
+                self.files_tree.setItemWidget(item, 1, progress_bar)
+                self.rows[(path, target.label)] = (item, progress_bar)
+            parent.setExpanded(True)
+        
+        # Deshabilitar controles mientras se sube
+        for widget in (self.start_btn, self.add_btn, self.clear_btn, self.jira_check,
+                       self.issue_input, self.slack_check, self.comment_input):
+            widget.setEnabled(False)
+        self.cancel_btn.setText("⏹️ Detener")
+        self.cancel_btn.clicked.disconnect()
+        self.cancel_btn.clicked.connect(self.stop_upload)
+        
+        pipeline = EvidenceUploadPipeline(targets, max_workers=self.max_workers)
+        self.worker = EvidenceUploadWorker(pipeline, list(self.paths))
+        self.worker.file_progress.connect(self.on_file_progress)
+        self.worker.file_result.connect(self.on_file_result)
+        self.worker.upload_completed.connect(self.on_upload_completed)
+        self.worker.error_occurred.connect(self.on_upload_error)
+        self.worker.start()
+    
+    def reject(self):
+        """Cerrar durante la subida la detiene en lugar de abandonar el worker"""
+        if self.worker and self.worker.isRunning():
+            self.stop_upload()
+            return
+        super().reject()
+    
+    def stop_upload(self):
+        """Detiene la subida; lo subido queda registrado y no se repite"""
+        if self.worker:
+            self.worker.stop()
+        self.cancel_btn.setEnabled(False)
+    
+    def on_file_progress(self, path, target, percent):
+        """Actualiza la barra de un archivo en un destino"""
+        row = self.rows.get((path, target))
+        if row:
+            row[0].setText(2, "📤 Subiendo")
+            row[1].setValue(percent)
+    
+    def on_file_result(self, path, target, status, message):
+        """Muestra el resultado de un archivo en un destino"""
+        row = self.rows.get((path, target))
+        if not row:
+            return
+        item, progress_bar = row
+        if status in ('done', 'skipped'):
+            progress_bar.setValue(100)
+        item.setText(2, self.STATUS_ICONS.get(status, status))
+        item.setToolTip(2, message)
+    
+    def finish_upload(self):
+        """Deja el diálogo listo para cerrarse"""
+        self.cancel_btn.setText("✅ Cerrar")
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.clicked.disconnect()
+        self.cancel_btn.clicked.connect(self.accept)
+    
+    def on_upload_completed(self, summary):
+        """Muestra el resumen de la subida"""
+        self.finish_upload()
+        
+        failed = summary['failed']
+        text = f"✅ Subidos: {summary['uploaded']}\n⏩ Omitidos (ya subidos): {summary['skipped']}\n❌ Fallidos: {len(failed)}"
+        if summary['stopped']:
+            text += "\n⏹️ Subida detenida: vuelve a ejecutarla para continuar"
+        if failed:
+            text += "\n\n" + "\n".join(f"• {name}: {error}" for name, error in list(failed.items())[:10])
+            if len(failed) > 10:
+                text += f"\n... y {len(failed) - 10} más"
+            QMessageBox.warning(self, "📎 Resumen de Evidencias", text)
+        else:
+            QMessageBox.information(self, "📎 Resumen de Evidencias", text)
+    
+    def on_upload_error(self, message):
+        """La subida se cortó; lo ya subido queda registrado"""
+        self.finish_upload()
+        QMessageBox.warning(self, "📎 Subida interrumpida", f"❌ {message}")
@@ -0,0 +1,327 @@
+"""
+Subida de evidencias (capturas, videos, logs) a Jira y Slack
+Los archivos se leen del disco por partes mientras se envían, sin cargarlos
+completos en memoria. Se suben varios a la vez con avance por archivo, se
+reintentan los que fallan y un registro por hash de contenido evita subir dos
+veces el mismo archivo al mismo destino.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """Hash SHA-256 del contenido leyendo el archivo por partes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileChunkReader:
+    """
+    Archivo binario que informa cuántos bytes se enviaron
+    
+    requests y el MultipartEncoder de Jira lo leen por bloques y usan len()
+    para el Content-Length, así el cuerpo se envía en streaming. Volver al
+    inicio (reintento de la petición) reinicia el avance.
+    """
+    
+    def __init__(self, path: str, on_progress: Callable[[int, int], None] = None):
+        self.name = path
+        self.size = os.path.getsize(path)
+        self.on_progress = on_progress
+        self._file = open(path, 'rb')
+        self._reported = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        position = self._file.tell()
+        # Se informa cada CHUNK_SIZE bytes y al llegar al final
+        if self.on_progress and (position - self._reported >= CHUNK_SIZE or
+                                 (position == self.size and position != self._reported)):
+            self._reported = position
+            self.on_progress(position, self.size)
+        return data
+    
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        position = self._file.seek(offset, whence)
+        self._reported = position
+        return position
+    
+    def tell(self) -> int:
+        return self._file.tell()
+    
+    def close(self):
+        self._file.close()
+
+
+class EvidenceUploadLedger:
+    """
+    Registro en disco de lo ya subido: destino -> hash del contenido -> estado
+    
+    El estado 'done' marca el archivo como subido; en Slack el estado
+    'uploaded' guarda el file_id de un archivo ya enviado pero sin publicar,
+    para que un reintento solo complete la subida.
+    """
+    
+    LEDGER_FILE = Path.home() / ".qa_generator" / "evidence_uploads.json"
+    
+    def __init__(self, ledger_file: Path = LEDGER_FILE):
+        self.ledger_file = Path(ledger_file)
+        self.entries: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+        self.load()
+    
+    def load(self):
+        """Carga el registro desde disco"""
+        try:
+            if self.ledger_file.exists():
+                with open(self.ledger_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+        except Exception as e:
+            print(f"Error cargando registro de evidencias: {e}")
+            self.entries = {}
+    
+    def save(self):
+        """Guarda el registro (escritura atómica); se llama con el lock tomado"""
+        try:
+            self.ledger_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.ledger_file.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.ledger_file)
+        except Exception as e:
+            print(f"Error guardando registro de evidencias: {e}")
+    
+    def get(self, target_key: str, sha: str) -> Optional[Dict]:
+        """Estado de un contenido en un destino"""
+        with self._lock:
+            entry = self.entries.get(target_key, {}).get(sha)
+            return dict(entry) if entry else None
+    
+    def record(self, target_key: str, sha: str, entry: Dict):
+        """Guarda el estado de un contenido en un destino"""
+        with self._lock:
+            self.entries.setdefault(target_key, {})[sha] = dict(entry, time=time.time())
+            self.save()
+    
+    def forget(self, target_key: str, sha: str):
+        """Descarta el estado de un contenido (se vuelve a subir completo)"""
+        with self._lock:
+            if self.entries.get(target_key, {}).pop(sha, None) is not None:
+                self.save()
+
+
+class JiraEvidenceTarget:
+    """Adjunta los archivos a un issue de Jira"""
+    
+    def __init__(self, jira_service, issue_key: str):
+        self.jira_service = jira_service
+        self.issue_key = issue_key
+        self.key = f"jira:{jira_service.server_url}|{issue_key}"
+        self.label = f"Jira {issue_key}"
+        self.existing = set()  # (nombre, tamaño) de los adjuntos que ya tiene el issue
+    
+    def prepare(self):
+        """Lee los adjuntos actuales para no repetir los subidos desde otro equipo"""
+        detail = self.jira_service.get_issue_detail(self.issue_key, use_cache=False)
+        self.existing = {(a['filename'], a['size']) for a in detail.get('attachments', [])}
+    
+    def upload(self, reader: FileChunkReader, name: str, state: Optional[Dict],
+               checkpoint: Callable[[Dict], None]) -> Dict:
+        """Sube el archivo; Jira no permite reanudar a mitad, cada intento lo envía completo"""
+        if (name, len(reader)) in self.existing:
+            return {'stage': 'done', 'name': name, 'existing': True}
+        attachment = self.jira_service.add_attachment(self.issue_key, reader, name)
+        self.existing.add((name, len(reader)))
+        return {'stage': 'done', 'name': name, 'id': attachment['id']}
+
+
+class SlackEvidenceTarget:
+    """
+    Publica los archivos en un canal de Slack con la subida externa
+    
+    El flujo tiene dos pasos (enviar el contenido y completar la subida); si
+    falla el segundo, el file_id queda en el registro y el reintento solo
+    completa la subida en lugar de enviar el archivo de nuevo. Un destino que
+    es un usuario (U…/W…) se publica en su mensaje directo.
+    """
+    
+    def __init__(self, slack_client, channel_id: str, channel_name: str = "", comment: str = None):
+        self.slack_client = slack_client
+        self.channel_id = channel_id
+        self.comment = comment
+        self.key = f"slack:{slack_client.base_url}|{channel_id}"
+        self.label = f"Slack {channel_name or channel_id}"
+        self.conversation_id = channel_id  # Canal donde se completa la subida
+    
+    def prepare(self):
+        """files.completeUploadExternal pide una conversación: los usuarios se pasan a su mensaje directo"""
+        if self.channel_id and self.channel_id[0] in ('U', 'W'):
+            self.conversation_id = self.slack_client.abrir_conversacion(self.channel_id)
+    
+    def upload(self, reader: FileChunkReader, name: str, state: Optional[Dict],
+               checkpoint: Callable[[Dict], None]) -> Dict:
+        """Envía el contenido y completa la subida (o solo la completa si quedó pendiente)"""
+        resumed = bool(state and state.get('stage') == 'uploaded')
+        if resumed:
+            file_id = state['id']
+        else:
+            upload_url, file_id = self.slack_client.obtener_url_subida(name, len(reader))
+            self.slack_client.subir_contenido(upload_url, reader)
+            checkpoint({'stage': 'uploaded', 'name': name, 'id': file_id})
+        
+        try:
+            self.slack_client.completar_subida([{'id': file_id, 'title': name}], self.conversation_id, self.comment)
+        except Exception:
+            if resumed:
+                # El archivo pendiente pudo expirar: el próximo intento lo sube de nuevo
+                checkpoint(None)
+            raise
+        return {'stage': 'done', 'name': name, 'id': file_id}
+
+
+class EvidenceUploadPipeline:
+    """
+    Sube una lista de archivos a uno o más destinos
+    
+    Primero calcula los hashes (en paralelo) y descarta los archivos repetidos
+    en la lista y los que el registro ya tiene subidos a cada destino; el resto
+    se sube con max_workers hilos, con reintentos que vuelven a leer el archivo
+    desde el inicio.
+    """
+    
+    DEFAULT_MAX_WORKERS = 3
+    MAX_RETRIES = 3
+    RETRY_DELAY = 2  # Segundos; crece con cada intento
+    
+    def __init__(self, targets: List, ledger: EvidenceUploadLedger = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, max_retries: int = MAX_RETRIES):
+        self.targets = targets
+        self.ledger = ledger or EvidenceUploadLedger()
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max(1, max_retries)
+    
+    def run(self, paths: List[str],
+            on_progress: Callable[[str, str, int, int], None] = None,
+            on_result: Callable[[str, str, str, str], None] = None,
+            should_stop: Callable[[], bool] = None) -> Dict:
+        """
+        Sube los archivos
+        
+        Args:
+            paths: Rutas de los archivos
+            on_progress: Recibe (ruta, destino, bytes enviados, tamaño)
+            on_result: Recibe (ruta, destino, estado, mensaje); estado es
+                'done', 'skipped', 'failed' o 'stopped'
+            should_stop: Devuelve True para no empezar más subidas
+        
+        Returns:
+            Dict: uploaded, skipped, failed ("ruta -> destino" -> error) y stopped
+        """
+        summary = {'uploaded': 0, 'skipped': 0, 'failed': {}, 'stopped': False}
+        
+        def report(path, target_label, status, message=""):
+            if status == 'done':
+                summary['uploaded'] += 1
+            elif status == 'skipped':
+                summary['skipped'] += 1
+            elif status == 'failed':
+                summary['failed'][f"{os.path.basename(path)} -> {target_label}"] = message
+            elif status == 'stopped':
+                summary['stopped'] = True
+            if on_result:
+                on_result(path, target_label, status, message)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            hash_futures = {executor.submit(file_sha256, path): path for path in paths}
+            hashes = {}
+            for future in as_completed(hash_futures):
+                path = hash_futures[future]
+                try:
+                    hashes[path] = future.result()
+                except Exception as e:
+                    for target in self.targets:
+                        report(path, target.label, 'failed', f"No se pudo leer el archivo: {e}")
+            
+            targets = []
+            for target in self.targets:
+                try:
+                    target.prepare()
+                    targets.append(target)
+                except Exception as e:
+                    for path in hashes:
+                        report(path, target.label, 'failed', str(e))
+            
+            seen = {}  # Hash -> primera ruta con ese contenido
+            futures = {}
+            for path in paths:
+                sha = hashes.get(path)
+                if sha is None:
+                    continue
+                if sha in seen:
+                    for target in targets:
+                        report(path, target.label, 'skipped', f"Mismo contenido que {os.path.basename(seen[sha])}")
+                    continue
+                seen[sha] = path
+                for target in targets:
+                    entry = self.ledger.get(target.key, sha)
+                    if entry and entry.get('stage') == 'done':
+                        report(path, target.label, 'skipped', f"Ya subido como {entry.get('name', '')}")
+                        continue
+                    future = executor.submit(self._upload, path, sha, target, on_progress, should_stop)
+                    futures[future] = (path, target)
+            
+            for future in as_completed(futures):
+                path, target = futures[future]
+                status, message = future.result()
+                report(path, target.label, status, message)
+        
+        return summary
+    
+    def _upload(self, path: str, sha: str, target, on_progress, should_stop):
+        """Sube un archivo a un destino con reintentos; devuelve (estado, mensaje)"""
+        name = os.path.basename(path)
+        progress = (lambda sent, total: on_progress(path, target.label, sent, total)) if on_progress else None
+        
+        def checkpoint(entry):
+            if entry is None:
+                self.ledger.forget(target.key, sha)
+            else:
+                self.ledger.record(target.key, sha, entry)
+        
+        last_error = None
+        for attempt in range(1, self.max_retries + 1):
+            if should_stop and should_stop():
+                return 'stopped', "Detenido antes de subir"
+            try:
+                with FileChunkReader(path, progress) as reader:
+                    entry = target.upload(reader, name, self.ledger.get(target.key, sha), checkpoint)
+                existing = entry.pop('existing', False)
+                checkpoint(entry)
+                return ('skipped', "Ya estaba adjunto") if existing else ('done', "")
+            except Exception as e:
+                last_error = e
+                print(f"Error subiendo {name} a {target.label} (intento {attempt}): {e}")
+                if attempt < self.max_retries:
+                    time.sleep(self.RETRY_DELAY * attempt)
+        return 'failed', str(last_error)
@@ -110,6 +110,118 @@ class SlackClient:
         except json.JSONDecodeError as e:
             raise DomainException(f"Error al procesar respuesta: {str(e)}")
     
+    def obtener_url_subida(self, nombre_archivo: str, tamano: int) -> tuple:
+        """
+        Pide a Slack una URL para subir un archivo (files.getUploadURLExternal)
+        
+        Returns:
+            tuple: (upload_url, file_id)
+        """
+        try:
+            response = requests.post(
+                f"{self.base_url}/files.getUploadURLExternal",
+                headers={"Authorization": f"Bearer {self.token}"},
+                data={"filename": nombre_archivo, "length": tamano},
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("ok"):
+                    return result["upload_url"], result["file_id"]
+                else:
+                    raise DomainException(f"Error de Slack: {result.get('error', 'Unknown error')}")
+            else:
+                raise DomainException(f"Error HTTP {response.status_code}: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            raise DomainException(f"Error de conexión: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise DomainException(f"Error al procesar respuesta: {str(e)}")
+    
+    def subir_contenido(self, upload_url: str, contenido) -> bool:
+        """
+        Envía el contenido del archivo a la URL obtenida con obtener_url_subida
+        
+        contenido puede ser un objeto tipo archivo con longitud conocida; así
+        se envía por partes sin cargarlo completo en memoria.
+        """
+        try:
+            response = requests.post(
+                upload_url,
+                data=contenido,
+                headers={"Content-Type": "application/octet-stream"},
+                timeout=(30, 300)
+            )
+            
+            if response.status_code == 200:
+                return True
+            raise DomainException(f"Error HTTP {response.status_code}: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            raise DomainException(f"Error de conexión: {str(e)}")
+    
+    def completar_subida(self, archivos: list, canal: str, comentario: str = None) -> bool:
+        """
+        Publica en el canal los archivos ya subidos (files.completeUploadExternal)
+        
+        archivos es una lista de {"id": file_id, "title": titulo}
+        """
+        try:
+            payload = {"files": archivos, "channel_id": canal}
+            if comentario:
+                payload["initial_comment"] = comentario
+            
+            response = requests.post(
+                f"{self.base_url}/files.completeUploadExternal",
+                headers=self.headers,
+                json=payload,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("ok"):
+                    return True
+                else:
+                    raise DomainException(f"Error de Slack: {result.get('error', 'Unknown error')}")
+            else:
+                raise DomainException(f"Error HTTP {response.status_code}: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            raise DomainException(f"Error de conexión: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise DomainException(f"Error al procesar respuesta: {str(e)}")
+    
+    def abrir_conversacion(self, usuario_id: str) -> str:
+        """
+        Abre (o recupera) el mensaje directo con un usuario (conversations.open)
+        
+        Returns:
+            str: ID de la conversación, que sirve como canal
+        """
+        try:
+            response = requests.post(
+                f"{self.base_url}/conversations.open",
+                headers=self.headers,
+                json={"users": usuario_id},
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("ok"):
+                    return result["channel"]["id"]
+                else:
+                    raise DomainException(f"Error de Slack: {result.get('error', 'Unknown error')}")
+            else:
+                raise DomainException(f"Error HTTP {response.status_code}: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            raise DomainException(f"Error de conexión: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise DomainException(f"Error al procesar respuesta: {str(e)}")
+    
     def verificar_conexion(self) -> bool:
         """
         Verifica que la conexión con Slack funcione
@@ -0,0 +1,148 @@
+"""
+Índice de clones locales para repositorios de GitHub
+Relaciona el full_name de un repositorio (owner/repo) con su checkout local
+"""
+
+import os
+import re
+import json
+from pathlib import Path
+from typing import List, Dict, Optional
+from PyQt6.QtCore import QThread, pyqtSignal
+from git_workspace_service import GitWorkspaceService, resolve_git_dir
+
+# Soporta https://github.com/owner/repo(.git), git@github.com:owner/repo(.git)
+# y ssh://git@github.com/owner/repo(.git)
+GITHUB_REMOTE_PATTERN = re.compile(r'github\.com[:/]+([^/\s]+)/([^/\s]+?)(?:\.git)?/?$', re.IGNORECASE)
+
+
+def parse_github_full_name(remote_url: str) -> Optional[str]:
+    """Extrae 'owner/repo' de una URL remota de GitHub"""
+    if not remote_url:
+        return None
+    match = GITHUB_REMOTE_PATTERN.search(remote_url.strip())
+    if not match:
+        return None
+    return f"{match.group(1)}/{match.group(2)}"
+
+
+def read_remote_urls(repo_path: str) -> Dict[str, str]:
+    """Lee las URLs de los remotos directamente de .git/config, sin lanzar git"""
+    git_dir = resolve_git_dir(repo_path)
+    if not git_dir:
+        return {}
+    
+    config_path = os.path.join(git_dir, 'config')
+    # En worktrees la configuración vive en el directorio común
+    commondir_path = os.path.join(git_dir, 'commondir')
+    if not os.path.exists(config_path) and os.path.exists(commondir_path):
+        try:
+            with open(commondir_path, 'r', encoding='utf-8') as f:
+                common_dir = f.read().strip()
+            config_path = os.path.join(os.path.normpath(os.path.join(git_dir, common_dir)), 'config')
+        except OSError:
+            return {}
+    
+    remotes = {}
+    current_remote = None
+    try:
+        with open(config_path, 'r', encoding='utf-8', errors='replace') as f:
+            for raw_line in f:
+                line = raw_line.strip()
+                if not line or line[0] in '#;':
+                    continue
+                if line.startswith('['):
+                    match = re.match(r'\[\s*remote\s+"([^"]+)"\s*\]', line)
+                    current_remote = match.group(1) if match else None
+                    continue
+                if current_remote and '=' in line:
+                    key, value = line.split('=', 1)
+                    if key.strip().lower() == 'url' and current_remote not in remotes:
+                        remotes[current_remote] = value.strip()
+    except OSError:
+        return {}
+    
+    return remotes
+
+
+class GitCloneIndex:
+    """Índice persistente de full_name de GitHub -> rutas locales"""
+    
+    def __init__(self, index_file: Path = None):
+        self.index_file = index_file or Path.home() / ".qa_generator" / "clone_index.json"
+        self.index: Dict[str, List[str]] = {}
+        self.load()
+    
+    def load(self):
+        """Carga el índice desde disco"""
+        try:
+            if self.index_file.exists():
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+        except Exception as e:
+            print(f"Error cargando índice de clones: {e}")
+            self.index = {}
+    
+    def save(self):
+        """Guarda el índice en disco"""
+        try:
+            self.index_file.parent.mkdir(exist_ok=True)
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"Error guardando índice de clones: {e}")
+    
+    def build(self, directories: List[str]) -> Dict[str, List[str]]:
+        """Escanea los directorios y construye un índice nuevo"""
+        workspace_service = GitWorkspaceService()
+        index: Dict[str, List[str]] = {}
+        
+        for directory in directories:
+            for repo_path in workspace_service.find_repositories(os.path.expanduser(directory)):
+                # 'origin' primero para que sea el remoto preferido
+                remotes = read_remote_urls(repo_path)
+                urls = [remotes.pop('origin')] if 'origin' in remotes else []
+                urls.extend(remotes.values())
+                for url in urls:
+                    full_name = parse_github_full_name(url)
+                    if full_name:
+                        paths = index.setdefault(full_name.lower(), [])
+                        if repo_path not in paths:
+                            paths.append(repo_path)
+                        break
+        
+        return index
+    
+    def replace(self, index: Dict[str, List[str]]):
+        """Reemplaza el índice actual y lo persiste"""
+        self.index = index
+        self.save()
+    
+    def lookup(self, full_name: str) -> Optional[str]:
+        """Obtiene la ruta local de un repositorio, verificando que siga existiendo"""
+        if not full_name:
+            return None
+        for path in self.index.get(full_name.lower(), []):
+            if resolve_git_dir(path):
+                return path
+        return None
+
+
+class GitCloneIndexWorker(QThread):
+    """Worker para reconstruir el índice de clones sin bloquear la UI"""
+    
+    index_ready = pyqtSignal(dict)     # Señal con el índice nuevo
+    error_occurred = pyqtSignal(str)   # Señal cuando ocurre un error
+    
+    def __init__(self, clone_index: GitCloneIndex, directories: List[str]):
+        super().__init__()
+        self.clone_index = clone_index
+        self.directories = directories
+    
+    def run(self):
+        """Construye el índice en un hilo separado"""
+        try:
+            index = self.clone_index.build(self.directories)
+            self.index_ready.emit(index)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
@@ -0,0 +1,317 @@
+"""
+Motor de diferencias lado a lado
+Calcula la alineación de líneas con patience diff en un proceso aparte y construye
+las filas de cada hunk bajo demanda, con resaltado de palabras dentro de la línea
+"""
+
+import re
+import multiprocessing
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from typing import List, Dict, Optional, Tuple
+from PyQt6.QtCore import QThread, pyqtSignal
+from github_commit_service import GitCommitService
+from lru_cache import LRUCache
+
+# Regiones sin líneas únicas más grandes que esto se tratan como reemplazo completo
+# para no caer en el peor caso cuadrático de SequenceMatcher
+MAX_FALLBACK_REGION = 4_000_000
+
+# Las líneas más largas no reciben resaltado por palabras
+MAX_WORD_DIFF_LENGTH = 500
+
+WORD_PATTERN = re.compile(r'\w+|\s+|[^\w\s]')
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def _unique_common_lines(a: List[str], b: List[str], alo: int, ahi: int,
+                         blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """Obtiene la LCS de líneas que aparecen una sola vez en ambos lados (patience sorting)"""
+    positions_a: Dict[str, int] = {}
+    for i in range(alo, ahi):
+        line = a[i]
+        positions_a[line] = -1 if line in positions_a else i
+    
+    positions_b: Dict[str, int] = {}
+    for j in range(blo, bhi):
+        line = b[j]
+        if positions_a.get(line, -1) >= 0:
+            positions_b[line] = -1 if line in positions_b else j
+    
+    pairs = sorted(
+        (positions_a[line], j) for line, j in positions_b.items() if j >= 0
+    )
+    if not pairs:
+        return []
+    
+    # Subsecuencia creciente más larga sobre los índices de b
+    tails: List[int] = []          # Índice b final de cada pila
+    tail_pairs: List[int] = []     # Índice en pairs del tope de cada pila
+    backpointers: List[int] = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pile = bisect_right(tails, j)
+        if pile > 0:
+            backpointers[index] = tail_pairs[pile - 1]
+        if pile == len(tails):
+            tails.append(j)
+            tail_pairs.append(index)
+        else:
+            tails[pile] = j
+            tail_pairs[pile] = index
+    
+    result = []
+    index = tail_pairs[-1]
+    while index >= 0:
+        result.append(pairs[index])
+        index = backpointers[index]
+    result.reverse()
+    return result
+
+
+def _match_lines(a: List[str], b: List[str], alo: int, ahi: int, blo: int, bhi: int,
+                 matches: List[Tuple[int, int]]):
+    """Agrega a matches los pares de líneas iguales de la región usando patience diff"""
+    # Prefijo común
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        matches.append((alo, blo))
+        alo += 1
+        blo += 1
+    
+    # Sufijo común (se agrega al final para mantener el orden)
+    suffix = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        suffix.append((ahi, bhi))
+    
+    if alo < ahi and blo < bhi:
+        anchors = _unique_common_lines(a, b, alo, ahi, blo, bhi)
+        if anchors:
+            last_a, last_b = alo, blo
+            for anchor_a, anchor_b in anchors:
+                _match_lines(a, b, last_a, anchor_a, last_b, anchor_b, matches)
+                matches.append((anchor_a, anchor_b))
+                last_a, last_b = anchor_a + 1, anchor_b + 1
+            _match_lines(a, b, last_a, ahi, last_b, bhi, matches)
+        elif (ahi - alo) * (bhi - blo) <= MAX_FALLBACK_REGION:
+            # Sin líneas únicas: alinear con el matcher clásico
+            matcher = SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            for block_a, block_b, size in matcher.get_matching_blocks():
+                for offset in range(size):
+                    matches.append((alo + block_a + offset, blo + block_b + offset))
+    
+    matches.extend(reversed(suffix))
+
+
+def patience_opcodes(a: List[str], b: List[str]) -> List[Opcode]:
+    """Calcula los opcodes (formato difflib) entre dos listas de líneas"""
+    matches: List[Tuple[int, int]] = []
+    _match_lines(a, b, 0, len(a), 0, len(b), matches)
+    matches.append((len(a), len(b)))  # Centinela
+    
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for match_a, match_b in matches:
+        if i < match_a and j < match_b:
+            opcodes.append(('replace', i, match_a, j, match_b))
+        elif i < match_a:
+            opcodes.append(('delete', i, match_a, j, j))
+        elif j < match_b:
+            opcodes.append(('insert', i, i, j, match_b))
+        if match_a < len(a) and match_b < len(b):
+            if opcodes and opcodes[-1][0] == 'equal':
+                tag, i1, _, j1, _ = opcodes.pop()
+                opcodes.append(('equal', i1, match_a + 1, j1, match_b + 1))
+            else:
+                opcodes.append(('equal', match_a, match_a + 1, match_b, match_b + 1))
+        i, j = match_a + 1, match_b + 1
+    return opcodes
+
+
+def group_opcodes(opcodes: List[Opcode], context: int = 3) -> List[List[Opcode]]:
+    """Agrupa los opcodes en hunks con líneas de contexto (como difflib.get_grouped_opcodes)"""
+    if not opcodes:
+        return []
+    if len(opcodes) == 1 and opcodes[0][0] == 'equal':
+        return []
+    
+    codes = list(opcodes)
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+    
+    groups = []
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == 'equal' and i2 - i1 > context * 2:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        groups.append(group)
+    return groups
+
+
+def hunk_row_count(hunk: List[Opcode]) -> int:
+    """Cantidad de filas lado a lado de un hunk, incluyendo su encabezado"""
+    rows = 1
+    for tag, i1, i2, j1, j2 in hunk:
+        rows += max(i2 - i1, j2 - j1)
+    return rows
+
+
+def compute_alignment(old_lines: List[str], new_lines: List[str], context: int = 3) -> Dict:
+    """
+    Calcula la alineación completa entre dos versiones de un archivo
+    
+    Función de módulo para poder ejecutarse en un proceso del pool.
+    """
+    opcodes = patience_opcodes(old_lines, new_lines)
+    hunks = group_opcodes(opcodes, context)
+    return {
+        'hunks': hunks,
+        'row_counts': [hunk_row_count(hunk) for hunk in hunks]
+    }
+
+
+def word_diff(old_line: str, new_line: str) -> Tuple[List[Tuple[str, bool]], List[Tuple[str, bool]]]:
+    """Divide dos líneas en segmentos (texto, cambiado) para resaltar palabras"""
+    if len(old_line) > MAX_WORD_DIFF_LENGTH or len(new_line) > MAX_WORD_DIFF_LENGTH:
+        return [(old_line, True)], [(new_line, True)]
+    
+    old_words = WORD_PATTERN.findall(old_line)
+    new_words = WORD_PATTERN.findall(new_line)
+    matcher = SequenceMatcher(None, old_words, new_words, autojunk=False)
+    
+    old_segments: List[Tuple[str, bool]] = []
+    new_segments: List[Tuple[str, bool]] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        changed = tag != 'equal'
+        if i2 > i1:
+            old_segments.append((''.join(old_words[i1:i2]), changed))
+        if j2 > j1:
+            new_segments.append((''.join(new_words[j1:j2]), changed))
+    return old_segments, new_segments
+
+
+def split_lines(content: str) -> List[str]:
+    """Divide el contenido en líneas sin la línea vacía final"""
+    lines = content.split('\n')
+    if lines and lines[-1] == '':
+        lines.pop()
+    return lines
+
+
+def build_hunk_rows(old_lines: List[str], new_lines: List[str], hunk: List[Opcode]) -> List[Dict]:
+    """Construye las filas lado a lado de un hunk"""
+    first = hunk[0]
+    last = hunk[-1]
+    header = f"@@ -{first[1] + 1},{last[2] - first[1]} +{first[3] + 1},{last[4] - first[3]} @@"
+    rows = [{'kind': 'header', 'old_no': None, 'new_no': None,
+             'old': [(header, False)], 'new': [(header, False)]}]
+    
+    for tag, i1, i2, j1, j2 in hunk:
+        if tag == 'equal':
+            for offset in range(i2 - i1):
+                line = old_lines[i1 + offset]
+                rows.append({'kind': 'equal', 'old_no': i1 + offset + 1, 'new_no': j1 + offset + 1,
+                             'old': [(line, False)], 'new': [(new_lines[j1 + offset], False)]})
+            continue
+        
+        for offset in range(max(i2 - i1, j2 - j1)):
+            has_old = i1 + offset < i2
+            has_new = j1 + offset < j2
+            old_line = old_lines[i1 + offset] if has_old else None
+            new_line = new_lines[j1 + offset] if has_new else None
+            
+            if has_old and has_new:
+                old_segments, new_segments = word_diff(old_line, new_line)
+                kind = 'replace'
+            else:
+                old_segments = [(old_line, True)] if has_old else []
+                new_segments = [(new_line, True)] if has_new else []
+                kind = 'delete' if has_old else 'insert'
+            
+            rows.append({'kind': kind,
+                         'old_no': i1 + offset + 1 if has_old else None,
+                         'new_no': j1 + offset + 1 if has_new else None,
+                         'old': old_segments, 'new': new_segments})
+    return rows
+
+
+class DiffEngine:
+    """Calcula alineaciones en un proceso aparte y las memoiza por par de blobs"""
+    
+    def __init__(self, max_cached: int = 16):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.alignment_cache = LRUCache(max_entries=max_cached)
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Obtiene el pool de procesos, creándolo la primera vez"""
+        if self._executor is None:
+            # 'spawn' evita hacer fork de un proceso con hilos de Qt activos
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+    
+    def get_alignment(self, old_blob: str, new_blob: str,
+                      old_lines: List[str], new_lines: List[str]) -> Dict:
+        """Obtiene la alineación del par de blobs (bloquea hasta que el proceso termine)"""
+        cache_key = (old_blob, new_blob)
+        alignment = self.alignment_cache.get(cache_key)
+        if alignment is None:
+            future = self._get_executor().submit(compute_alignment, old_lines, new_lines)
+            alignment = future.result()
+            self.alignment_cache.put(cache_key, alignment)
+        return alignment
+    
+    def shutdown(self):
+        """Cierra el pool de procesos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Instancia global del motor de diferencias
+diff_engine = DiffEngine()
+
+
+class SideBySideDiffWorker(QThread):
+    """Worker que obtiene ambas versiones de un archivo y espera su alineación"""
+    
+    alignment_ready = pyqtSignal(dict)   # Líneas de cada lado, hunks y filas por hunk
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, git_service: GitCommitService, filepath: str, engine: DiffEngine = None):
+        super().__init__()
+        self.git_service = git_service
+        self.filepath = filepath
+        self.engine = engine or diff_engine
+    
+    def run(self):
+        """Lee las versiones y calcula la alineación fuera del hilo de la UI"""
+        try:
+            sides = self.git_service.get_diff_sides(self.filepath)
+            old_lines = split_lines(sides['old_content'])
+            new_lines = split_lines(sides['new_content'])
+            
+            alignment = self.engine.get_alignment(
+                sides['old_blob'], sides['new_blob'], old_lines, new_lines
+            )
+            self.alignment_ready.emit({
+                'old_lines': old_lines,
+                'new_lines': new_lines,
+                'hunks': alignment['hunks'],
+                'row_counts': alignment['row_counts']
+            })
+        except Exception as e:
+            self.error_occurred.emit(str(e))
@@ -0,0 +1,1033 @@
+"""
+Widget de Git local para la aplicación QA Generator
+"""
+
+import os
+from datetime import datetime
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                           QLineEdit, QPushButton, QMessageBox, QFrame,
+                           QTabWidget, QTreeWidget, QTreeWidgetItem, QFileDialog,
+                           QHeaderView, QDialog, QDialogButtonBox, QListWidget,
+                           QListWidgetItem, QTextEdit, QSplitter, QTableView,
+                           QStyledItemDelegate, QStyle)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QFont, QColor
+from bisect import bisect_right
+from git_workspace_service import GitWorkspaceService, GitWorkspaceScanWorker
+from github_commit_service import (GitCommitService, GitStatusWorker, GitDiffWorker, GitBlameWorker,
+                                   GitLogPageWorker, GitCommitStatsWorker)
+from git_diff_engine import SideBySideDiffWorker, build_hunk_rows, diff_engine
+from config import app_config
+from styles import ThemeManager
+
+class BlameTableModel(QAbstractTableModel):
+    """Modelo de líneas de un archivo con sus anotaciones de blame"""
+    
+    HEADERS = ["Commit", "Autor", "Fecha", "Línea", "Código"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lines = []
+        self.annotations = []  # Bloque de blame por línea (o None mientras no llega)
+    
+    def set_content(self, content):
+        """Carga el contenido del archivo sin anotaciones"""
+        self.beginResetModel()
+        self.lines = content.split('\n')
+        if self.lines and self.lines[-1] == '':
+            self.lines.pop()
+        self.annotations = [None] * len(self.lines)
+        self.endResetModel()
+    
+    def apply_chunks(self, chunks):
+        """Anota las líneas cubiertas por cada bloque recibido"""
+        for chunk in chunks:
+            start = chunk['final_line'] - 1
+            end = min(start + chunk['num_lines'], len(self.annotations))
+            for row in range(start, end):
+                self.annotations[row] = chunk
+            if start < end:
+                self.dataChanged.emit(self.index(start, 0), self.index(end - 1, 2))
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row, column = index.row(), index.column()
+        chunk = self.annotations[row]
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 3:
+                return str(row + 1)
+            if column == 4:
+                return self.lines[row]
+            if chunk is None:
+                return "…"
+            if column == 0:
+                return chunk['sha'][:8]
+            if column == 1:
+                return chunk.get('author', '')
+            if column == 2:
+                author_time = chunk.get('author_time')
+                return datetime.fromtimestamp(int(author_time)).strftime('%Y-%m-%d') if author_time else ''
+        elif role == Qt.ItemDataRole.ToolTipRole and chunk is not None and column < 3:
+            return f"{chunk['sha'][:12]} • {chunk.get('author', '')} {chunk.get('author_mail', '')}\n{chunk.get('summary', '')}"
+        return None
+
+class GitBlameDialog(QDialog):
+    """Diálogo que muestra la autoría de cada línea de un archivo"""
+    
+    def __init__(self, git_service, filepath, revision='HEAD', parent=None):
+        super().__init__(parent)
+        self.git_service = git_service
+        self.filepath = filepath
+        self.revision = revision
+        self.worker = None
+        self.setup_ui()
+        self.load_blame()
+    
+    def setup_ui(self):
+        """Configura la interfaz del diálogo"""
+        self.setWindowTitle(f"🕵️ Blame - {self.filepath}")
+        self.resize(1000, 700)
+        
+        layout = QVBoxLayout(self)
+        
+        # Título
+        title = QLabel(f"🕵️ {self.filepath} @ {self.revision}")
+        title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setStyleSheet("color: #3D3D3D; margin-bottom: 10px;")
+        layout.addWidget(title)
+        
+        # Tabla de líneas anotadas
+        self.blame_model = BlameTableModel(self)
+        self.blame_view = QTableView()
+        self.blame_view.setModel(self.blame_model)
+        self.blame_view.setFont(QFont("Courier New", 10))
+        self.blame_view.verticalHeader().setVisible(False)
+        self.blame_view.verticalHeader().setDefaultSectionSize(20)
+        self.blame_view.setWordWrap(False)
+        self.blame_view.horizontalHeader().setStretchLastSection(True)
+        self.blame_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        layout.addWidget(self.blame_view)
+        
+        self.blame_status = QLabel("🔄 Calculando autoría...")
+        self.blame_status.setStyleSheet("color: #6272a4; padding: 5px;")
+        layout.addWidget(self.blame_status)
+        
+        # Botones del diálogo
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(self.close)
+        layout.addWidget(button_box)
+    
+    def load_blame(self):
+        """Inicia el blame incremental del archivo"""
+        self.worker = GitBlameWorker(self.git_service, self.filepath, self.revision)
+        self.worker.content_ready.connect(self.on_content_ready)
+        self.worker.chunks_ready.connect(self.blame_model.apply_chunks)
+        self.worker.blame_finished.connect(self.on_blame_finished)
+        self.worker.error_occurred.connect(self.on_blame_error)
+        self.worker.start()
+    
+    def on_content_ready(self, content):
+        """Muestra el archivo de inmediato; las anotaciones llegan después"""
+        self.blame_model.set_content(content)
+        self.blame_view.setColumnWidth(0, 90)
+        self.blame_view.setColumnWidth(1, 160)
+        self.blame_view.setColumnWidth(2, 95)
+        self.blame_view.setColumnWidth(3, 60)
+    
+    def on_blame_finished(self, from_cache):
+        """Maneja el fin del blame"""
+        origin = " (caché)" if from_cache else ""
+        self.blame_status.setText(f"✅ {len(self.blame_model.lines)} líneas anotadas{origin}")
+    
+    def on_blame_error(self, error_msg):
+        """Maneja errores del blame"""
+        self.blame_status.setText(f"❌ Error: {error_msg}")
+    
+    def cleanup_threads(self):
+        """Detiene el blame en curso"""
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            if not self.worker.wait(2000):  # Esperar máximo 2 segundos
+                self.worker.terminate()
+                self.worker.wait()
+    
+    def closeEvent(self, event):
+        """Maneja el evento de cierre del diálogo"""
+        self.cleanup_threads()
+        super().closeEvent(event)
+
+class SideBySideDiffModel(QAbstractTableModel):
+    """Modelo lado a lado que construye las filas de cada hunk solo cuando se muestran"""
+    
+    HEADERS = ["#", "HEAD", "#", "Árbol de trabajo"]
+    SEGMENTS_ROLE = Qt.ItemDataRole.UserRole + 1
+    
+    BACKGROUNDS = {
+        'header': QColor('#e8eaf6'),
+        'delete': QColor('#ffecec'),
+        'insert': QColor('#eaffea'),
+        'replace_old': QColor('#ffecec'),
+        'replace_new': QColor('#eaffea'),
+        'empty': QColor('#f4f4f4'),
+    }
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.old_lines = []
+        self.new_lines = []
+        self.hunks = []
+        self.hunk_offsets = []  # Primera fila de cada hunk
+        self.total_rows = 0
+        self._hunk_rows = {}    # Índice de hunk -> filas construidas
+    
+    def set_alignment(self, alignment):
+        """Carga la alineación; las filas se construyen al pedirlas la vista"""
+        self.beginResetModel()
+        self.old_lines = alignment['old_lines']
+        self.new_lines = alignment['new_lines']
+        self.hunks = alignment['hunks']
+        self.hunk_offsets = []
+        self.total_rows = 0
+        for count in alignment['row_counts']:
+            self.hunk_offsets.append(self.total_rows)
+            self.total_rows += count
+        self._hunk_rows = {}
+        self.endResetModel()
+    
+    def built_hunks(self):
+        """Cantidad de hunks cuyas filas ya fueron construidas"""
+        return len(self._hunk_rows)
+    
+    def _row(self, row):
+        """Obtiene la fila construyendo su hunk si aún no existe"""
+        hunk_index = bisect_right(self.hunk_offsets, row) - 1
+        rows = self._hunk_rows.get(hunk_index)
+        if rows is None:
+            rows = build_hunk_rows(self.old_lines, self.new_lines, self.hunks[hunk_index])
+            self._hunk_rows[hunk_index] = rows
+        return rows[row - self.hunk_offsets[hunk_index]]
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.total_rows
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row = self._row(index.row())
+        column = index.column()
+        side = 'old' if column < 2 else 'new'
+        kind = row['kind']
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column in (0, 2):
+                number = row[f'{side}_no']
+                return str(number) if number else ''
+            return ''.join(text for text, _ in row[side])
+        if role == self.SEGMENTS_ROLE and column in (1, 3):
+            return row[side]
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if kind == 'equal':
+                return None
+            if kind == 'header':
+                return self.BACKGROUNDS['header']
+            if row[f'{side}_no'] is None:
+                return self.BACKGROUNDS['empty']
+            if kind == 'replace':
+                return self.BACKGROUNDS[f'replace_{side}']
+            return self.BACKGROUNDS[kind]
+        if role == Qt.ItemDataRole.ForegroundRole and kind == 'header':
+            return QColor('#6272a4')
+        return None
+
+class DiffSegmentsDelegate(QStyledItemDelegate):
+    """Dibuja el texto de una línea resaltando las palabras que cambiaron"""
+    
+    HIGHLIGHTS = {'old': QColor('#f8b4b4'), 'new': QColor('#a6f3a6')}
+    
+    def paint(self, painter, option, index):
+        segments = index.data(SideBySideDiffModel.SEGMENTS_ROLE)
+        if not segments or not any(changed for _, changed in segments) or len(segments) == 1:
+            super().paint(painter, option, index)
+            return
+        
+        painter.save()
+        background = index.data(Qt.ItemDataRole.BackgroundRole)
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        elif background is not None:
+            painter.fillRect(option.rect, background)
+        
+        painter.setFont(option.font)
+        metrics = option.fontMetrics
+        highlight = self.HIGHLIGHTS['old' if index.column() < 2 else 'new']
+        x = option.rect.left() + 3
+        baseline = option.rect.top() + (option.rect.height() + metrics.ascent() - metrics.descent()) // 2
+        for text, changed in segments:
+            width = metrics.horizontalAdvance(text)
+            if changed:
+                painter.fillRect(x, option.rect.top() + 1, width, option.rect.height() - 2, highlight)
+            painter.drawText(x, baseline, text)
+            x += width
+            if x > option.rect.right():
+                break
+        painter.restore()
+
+class SideBySideDiffDialog(QDialog):
+    """Diálogo que compara HEAD con el árbol de trabajo en dos columnas"""
+    
+    def __init__(self, git_service, filepath, parent=None):
+        super().__init__(parent)
+        self.git_service = git_service
+        self.filepath = filepath
+        self.worker = None
+        self.setup_ui()
+        self.load_diff()
+    
+    def setup_ui(self):
+        """Configura la interfaz del diálogo"""
+        self.setWindowTitle(f"↔️ Lado a Lado - {self.filepath}")
+        self.resize(1200, 750)
+        
+        layout = QVBoxLayout(self)
+        
+        # Título
+        title = QLabel(f"↔️ {self.filepath} • HEAD ↔ árbol de trabajo")
+        title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setStyleSheet("color: #3D3D3D; margin-bottom: 10px;")
+        layout.addWidget(title)
+        
+        # Tabla de filas alineadas
+        self.diff_model = SideBySideDiffModel(self)
+        self.diff_view = QTableView()
+        self.diff_view.setModel(self.diff_model)
+        self.diff_view.setItemDelegate(DiffSegmentsDelegate(self.diff_view))
+        self.diff_view.setFont(QFont("Courier New", 10))
+        self.diff_view.verticalHeader().setVisible(False)
+        # Altura fija para que la vista no consulte filas fuera de pantalla
+        self.diff_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.diff_view.verticalHeader().setDefaultSectionSize(20)
+        self.diff_view.setWordWrap(False)
+        self.diff_view.setShowGrid(False)
+        self.diff_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        header = self.diff_view.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.diff_view.setColumnWidth(0, 50)
+        self.diff_view.setColumnWidth(2, 50)
+        layout.addWidget(self.diff_view)
+        
+        self.diff_status = QLabel("🔄 Calculando alineación...")
+        self.diff_status.setStyleSheet("color: #6272a4; padding: 5px;")
+        layout.addWidget(self.diff_status)
+        
+        # Botones del diálogo
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(self.close)
+        layout.addWidget(button_box)
+    
+    def load_diff(self):
+        """Inicia el cálculo de la alineación en segundo plano"""
+        self.worker = SideBySideDiffWorker(self.git_service, self.filepath)
+        self.worker.alignment_ready.connect(self.on_alignment_ready)
+        self.worker.error_occurred.connect(self.on_diff_error)
+        self.worker.start()
+    
+    def on_alignment_ready(self, alignment):
+        """Muestra la alineación calculada"""
+        self.diff_model.set_alignment(alignment)
+        hunks = len(alignment['hunks'])
+        if not hunks:
+            self.diff_status.setText("✅ No hay diferencias con HEAD")
+            return
+        self.diff_status.setText(
+            f"✅ {hunks} bloques de cambios • {len(alignment['old_lines'])} → {len(alignment['new_lines'])} líneas"
+        )
+    
+    def on_diff_error(self, error_msg):
+        """Maneja errores del cálculo de diferencias"""
+        self.diff_status.setText(f"❌ Error: {error_msg}")
+    
+    def cleanup_threads(self):
+        """Espera a que termine el cálculo en curso"""
+        if self.worker and self.worker.isRunning():
+            self.worker.quit()
+            if not self.worker.wait(2000):  # Esperar máximo 2 segundos
+                self.worker.terminate()
+                self.worker.wait()
+    
+    def closeEvent(self, event):
+        """Maneja el evento de cierre del diálogo"""
+        self.cleanup_threads()
+        super().closeEvent(event)
+
+class CommitHistoryDialog(QDialog):
+    """Diálogo que muestra el historial de commits cargándolo por páginas"""
+    
+    PAGE_SIZE = 200
+    
+    def __init__(self, git_service, title=None, parent=None):
+        super().__init__(parent)
+        self.git_service = git_service
+        self.title = title or os.path.basename(os.path.normpath(git_service.current_repo_path))
+        self.active_workers = []  # Lista para rastrear workers activos
+        self.generation = 0       # Invalida páginas de filtros anteriores
+        self.next_page = 0
+        self.loading_page = False
+        self.history_complete = False
+        self.stats_loaded = set()  # SHAs con archivos ya cargados
+        self.setup_ui()
+        self.reload_history()
+    
+    def setup_ui(self):
+        """Configura la interfaz del diálogo"""
+        self.setWindowTitle(f"📜 Historial - {self.title}")
+        self.resize(1000, 700)
+        
+        layout = QVBoxLayout(self)
+        
+        # Título
+        title = QLabel(f"📜 {self.title} • 🌿 {self.git_service.get_current_branch()}")
+        title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setStyleSheet("color: #3D3D3D; margin-bottom: 10px;")
+        layout.addWidget(title)
+        
+        # Filtros (se aplican directamente en git log)
+        filters_layout = QHBoxLayout()
+        
+        filters_layout.addWidget(QLabel("📄 Ruta:"))
+        self.path_filter = QLineEdit()
+        self.path_filter.setPlaceholderText("src/ o archivo.py")
+        self.path_filter.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.path_filter.returnPressed.connect(self.reload_history)
+        filters_layout.addWidget(self.path_filter)
+        
+        filters_layout.addWidget(QLabel("👤 Autor:"))
+        self.author_filter = QLineEdit()
+        self.author_filter.setPlaceholderText("Nombre o email")
+        self.author_filter.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.author_filter.returnPressed.connect(self.reload_history)
+        filters_layout.addWidget(self.author_filter)
+        
+        self.filter_btn = QPushButton("🔍 Filtrar")
+        self.filter_btn.clicked.connect(self.reload_history)
+        self.filter_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        filters_layout.addWidget(self.filter_btn)
+        
+        layout.addLayout(filters_layout)
+        
+        # Árbol de commits; los archivos se cargan al expandir
+        self.history_tree = QTreeWidget()
+        self.history_tree.setHeaderLabels(["Commit", "Mensaje", "Autor", "Fecha"])
+        self.history_tree.setUniformRowHeights(True)
+        self.history_tree.setStyleSheet(ThemeManager.get_theme_class().get_listwidget_style())
+        self.history_tree.itemExpanded.connect(self.on_commit_expanded)
+        self.history_tree.verticalScrollBar().valueChanged.connect(self.on_history_scrolled)
+        header = self.history_tree.header()
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.history_tree.setColumnWidth(0, 130)
+        self.history_tree.setColumnWidth(2, 160)
+        layout.addWidget(self.history_tree)
+        
+        self.history_status = QLabel("")
+        self.history_status.setStyleSheet("color: #6272a4; padding: 5px;")
+        layout.addWidget(self.history_status)
+        
+        # Botones del diálogo
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(self.close)
+        layout.addWidget(button_box)
+    
+    def _track_worker(self, worker):
+        """Registra un worker para poder limpiarlo al cerrar"""
+        worker.finished.connect(lambda: self.active_workers.remove(worker) if worker in self.active_workers else None)
+        self.active_workers.append(worker)
+        worker.start()
+    
+    def reload_history(self):
+        """Reinicia el historial con los filtros actuales"""
+        self.generation += 1
+        self.next_page = 0
+        self.loading_page = False
+        self.history_complete = False
+        self.stats_loaded.clear()
+        self.history_tree.clear()
+        self.load_next_page()
+    
+    def load_next_page(self):
+        """Solicita la siguiente página del historial"""
+        if self.loading_page or self.history_complete:
+            return
+        
+        self.loading_page = True
+        self.history_status.setText(f"🔄 Cargando commits {self.next_page * self.PAGE_SIZE + 1}...")
+        
+        generation = self.generation
+        worker = GitLogPageWorker(
+            self.git_service, self.next_page, self.PAGE_SIZE,
+            self.path_filter.text().strip() or None,
+            self.author_filter.text().strip() or None
+        )
+        worker.page_ready.connect(lambda page, commits: self.on_page_ready(generation, page, commits))
+        worker.error_occurred.connect(lambda error_msg: self.on_history_error(generation, error_msg))
+        self._track_worker(worker)
+    
+    def on_page_ready(self, generation, page, commits):
+        """Agrega una página de commits al árbol"""
+        if generation != self.generation:
+            return  # Página de un filtro anterior
+        
+        self.loading_page = False
+        self.next_page = page + 1
+        self.history_complete = len(commits) < self.PAGE_SIZE
+        
+        items = []
+        for commit in commits:
+            date = datetime.fromtimestamp(commit['author_time']).strftime('%Y-%m-%d %H:%M')
+            item = QTreeWidgetItem([commit['short_sha'], commit['subject'], commit['author'], date])
+            item.setData(0, Qt.ItemDataRole.UserRole, commit)
+            item.setToolTip(1, f"{commit['sha']}\n{commit['author']} <{commit['author_email']}>")
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            items.append(item)
+        self.history_tree.addTopLevelItems(items)
+        
+        total = self.history_tree.topLevelItemCount()
+        suffix = "" if self.history_complete else " (desplázate para cargar más)"
+        self.history_status.setText(f"✅ {total} commits{suffix}")
+        
+        # Si la página no llena la vista, seguir cargando
+        scroll_bar = self.history_tree.verticalScrollBar()
+        if not self.history_complete and scroll_bar.maximum() == 0:
+            self.load_next_page()
+    
+    def on_history_error(self, generation, error_msg):
+        """Maneja errores al cargar el historial"""
+        if generation != self.generation:
+            return
+        self.loading_page = False
+        self.history_status.setText(f"❌ Error: {error_msg}")
+    
+    def on_history_scrolled(self, value):
+        """Carga la siguiente página al acercarse al final"""
+        scroll_bar = self.history_tree.verticalScrollBar()
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self.load_next_page()
+    
+    def on_commit_expanded(self, item):
+        """Carga los archivos del commit la primera vez que se expande"""
+        commit = item.data(0, Qt.ItemDataRole.UserRole)
+        if not commit or commit['sha'] in self.stats_loaded:
+            return
+        
+        self.stats_loaded.add(commit['sha'])
+        item.addChild(QTreeWidgetItem(["", "🔄 Cargando archivos..."]))
+        
+        generation = self.generation
+        worker = GitCommitStatsWorker(self.git_service, commit['sha'])
+        worker.stats_ready.connect(lambda sha, stats: self.on_commit_stats_ready(generation, item, stats))
+        worker.error_occurred.connect(
+            lambda error_msg: self.on_commit_stats_error(generation, item, commit['sha'], error_msg))
+        self._track_worker(worker)
+    
+    def on_commit_stats_ready(self, generation, item, stats):
+        """Muestra los archivos modificados por el commit"""
+        if generation != self.generation:
+            return  # El árbol se reinició mientras se cargaba y el item ya no existe
+        
+        item.takeChildren()
+        if not stats:
+            item.addChild(QTreeWidgetItem(["", "Sin cambios de archivos"]))
+            return
+        
+        for file_stats in stats:
+            if file_stats['additions'] is None:
+                changes = "binario"
+            else:
+                changes = f"+{file_stats['additions']} -{file_stats['deletions']}"
+            item.addChild(QTreeWidgetItem([changes, file_stats['path']]))
+    
+    def on_commit_stats_error(self, generation, item, sha, error_msg):
+        """Maneja errores al cargar los archivos de un commit"""
+        if generation != self.generation:
+            return  # reload_history() ya vació stats_loaded y borró el item
+        self.stats_loaded.discard(sha)
+        item.takeChildren()
+        item.addChild(QTreeWidgetItem(["", f"❌ Error: {error_msg}"]))
+    
+    def cleanup_threads(self):
+        """Limpia todos los threads activos del diálogo"""
+        for worker in self.active_workers[:]:  # Copiar lista para evitar modificación durante iteración
+            if worker and worker.isRunning():
+                worker.quit()
+                if not worker.wait(2000):  # Esperar máximo 2 segundos
+                    worker.terminate()
+                    worker.wait()
+            if worker in self.active_workers:
+                self.active_workers.remove(worker)
+    
+    def closeEvent(self, event):
+        """Maneja el evento de cierre del diálogo"""
+        self.cleanup_threads()
+        GitCommitService.close_log_cursors()
+        super().closeEvent(event)
+
+class LocalChangesDialog(QDialog):
+    """Diálogo que muestra los cambios locales de un repositorio"""
+    
+    def __init__(self, repo_path, title=None, parent=None):
+        super().__init__(parent)
+        self.git_service = GitCommitService()
+        self.git_service.set_repository_path(repo_path)
+        self.repo_path = repo_path
+        self.title = title or os.path.basename(os.path.normpath(repo_path))
+        self.active_workers = []  # Lista para rastrear workers activos
+        self.setup_ui()
+        self.load_changes()
+    
+    def setup_ui(self):
+        """Configura la interfaz del diálogo"""
+        self.setWindowTitle(f"💻 Cambios Locales - {self.title}")
+        self.setModal(True)
+        self.resize(900, 650)
+        
+        layout = QVBoxLayout(self)
+        
+        # Título
+        title = QLabel(f"💻 {self.title} • 🌿 {self.git_service.get_current_branch()}")
+        title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setStyleSheet("color: #3D3D3D; margin-bottom: 10px;")
+        layout.addWidget(title)
+        
+        path_label = QLabel(f"📂 {self.repo_path}")
+        path_label.setStyleSheet("color: #6272a4; font-size: 11px;")
+        layout.addWidget(path_label)
+        
+        # Botones de acción
+        actions_layout = QHBoxLayout()
+        
+        self.refresh_btn = QPushButton("🔄 Actualizar")
+        self.refresh_btn.clicked.connect(self.load_changes)
+        self.refresh_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        actions_layout.addWidget(self.refresh_btn)
+        
+        self.blame_btn = QPushButton("🕵️ Blame")
+        self.blame_btn.setToolTip("Ver la autoría de cada línea del archivo seleccionado")
+        self.blame_btn.clicked.connect(self.show_blame)
+        self.blame_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        self.blame_btn.setEnabled(False)
+        actions_layout.addWidget(self.blame_btn)
+        
+        self.side_by_side_btn = QPushButton("↔️ Lado a Lado")
+        self.side_by_side_btn.setToolTip("Comparar HEAD con el árbol de trabajo en dos columnas")
+        self.side_by_side_btn.clicked.connect(self.show_side_by_side)
+        self.side_by_side_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        self.side_by_side_btn.setEnabled(False)
+        actions_layout.addWidget(self.side_by_side_btn)
+        
+        self.history_btn = QPushButton("📜 Historial")
+        self.history_btn.setToolTip("Ver el historial de commits del repositorio")
+        self.history_btn.clicked.connect(self.show_history)
+        self.history_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        actions_layout.addWidget(self.history_btn)
+        
+        actions_layout.addStretch()
+        layout.addLayout(actions_layout)
+        
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        
+        # Lista de archivos modificados
+        self.files_list = QListWidget()
+        self.files_list.setStyleSheet(ThemeManager.get_theme_class().get_listwidget_style())
+        self.files_list.itemClicked.connect(self.on_file_selected)
+        splitter.addWidget(self.files_list)
+        
+        # Diferencias del archivo seleccionado
+        self.diff_view = QTextEdit()
+        self.diff_view.setReadOnly(True)
+        self.diff_view.setFont(QFont("Courier New", 10))
+        self.diff_view.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.diff_view.setStyleSheet(ThemeManager.get_theme_class().get_textedit_style())
+        self.diff_view.setPlaceholderText("Selecciona un archivo para ver sus diferencias...")
+        splitter.addWidget(self.diff_view)
+        
+        splitter.setSizes([300, 600])
+        layout.addWidget(splitter)
+        
+        # Botones del diálogo
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(self.close)
+        layout.addWidget(button_box)
+    
+    def _track_worker(self, worker):
+        """Registra un worker para poder limpiarlo al cerrar"""
+        worker.finished.connect(lambda: self.active_workers.remove(worker) if worker in self.active_workers else None)
+        self.active_workers.append(worker)
+        worker.start()
+    
+    def load_changes(self):
+        """Carga los archivos modificados del repositorio"""
+        self.files_list.clear()
+        self.files_list.addItem("🔄 Cargando cambios...")
+        self.refresh_btn.setEnabled(False)
+        
+        worker = GitStatusWorker(self.git_service)
+        worker.status_ready.connect(self.on_changes_loaded)
+        worker.error_occurred.connect(self.on_changes_error)
+        self._track_worker(worker)
+    
+    def on_changes_loaded(self, files):
+        """Maneja la carga exitosa de los archivos modificados"""
+        self.files_list.clear()
+        self.refresh_btn.setEnabled(True)
+        
+        if not files:
+            self.files_list.addItem("✅ No hay cambios locales")
+            return
+        
+        for file_info in files:
+            item = QListWidgetItem(f"{file_info['icon']} {file_info['path']}\n{file_info['status_text']}")
+            item.setData(Qt.ItemDataRole.UserRole, file_info)
+            self.files_list.addItem(item)
+    
+    def on_changes_error(self, error_msg):
+        """Maneja errores al cargar los cambios"""
+        self.files_list.clear()
+        self.files_list.addItem(f"❌ Error: {error_msg}")
+        self.refresh_btn.setEnabled(True)
+    
+    def on_file_selected(self, item):
+        """Muestra las diferencias del archivo seleccionado"""
+        file_info = item.data(Qt.ItemDataRole.UserRole)
+        self.selected_file = file_info
+        # Los archivos nuevos no tienen historial para blame
+        self.blame_btn.setEnabled(bool(file_info) and 'A' not in file_info['status'] and file_info['status'] != '??')
+        self.side_by_side_btn.setEnabled(bool(file_info))
+        if not file_info:
+            return
+        
+        self.diff_view.setPlainText("🔄 Cargando diferencias...")
+        worker = GitDiffWorker(self.git_service, file_info['path'])
+        worker.diff_ready.connect(self.diff_view.setPlainText)
+        worker.error_occurred.connect(lambda error_msg: self.diff_view.setPlainText(f"❌ Error: {error_msg}"))
+        self._track_worker(worker)
+    
+    def show_blame(self):
+        """Abre el blame del archivo seleccionado"""
+        if not getattr(self, 'selected_file', None):
+            return
+        
+        dialog = GitBlameDialog(self.git_service, self.selected_file['path'], parent=self)
+        dialog.exec()
+    
+    def show_side_by_side(self):
+        """Abre la comparación lado a lado del archivo seleccionado"""
+        if not getattr(self, 'selected_file', None):
+            return
+        
+        dialog = SideBySideDiffDialog(self.git_service, self.selected_file['path'], parent=self)
+        dialog.exec()
+    
+    def show_history(self):
+        """Abre el historial de commits del repositorio"""
+        dialog = CommitHistoryDialog(self.git_service, self.title, parent=self)
+        dialog.exec()
+    
+    def cleanup_threads(self):
+        """Limpia todos los threads activos del diálogo"""
+        for worker in self.active_workers[:]:  # Copiar lista para evitar modificación durante iteración
+            if worker and worker.isRunning():
+                worker.quit()
+                if not worker.wait(2000):  # Esperar máximo 2 segundos
+                    worker.terminate()
+                    worker.wait()
+            if worker in self.active_workers:
+                self.active_workers.remove(worker)
+    
+    def closeEvent(self, event):
+        """Maneja el evento de cierre del diálogo"""
+        self.cleanup_threads()
+        super().closeEvent(event)
+
+class GitLocalWidget(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.workspace_service = GitWorkspaceService()
+        self.scan_worker = None
+        self.workspace_items = {}  # path -> QTreeWidgetItem
+        
+        # Registrar para cambios de tema
+        ThemeManager.register_theme_changed_callback(self.on_theme_changed)
+        
+        self.setup_ui()
+    
+    def on_theme_changed(self, theme_name):
+        """Callback cuando cambia el tema"""
+        self.apply_theme_to_widgets()
+    
+    def apply_theme_to_widgets(self):
+        """Aplica el tema actual a todos los widgets"""
+        theme_class = ThemeManager.get_theme_class()
+        
+        widgets_to_update = [
+            (getattr(self, 'main_frame', None), 'frame'),
+            (getattr(self, 'tabs', None), 'frame'),
+            (getattr(self, 'workspace_root_input', None), 'lineedit'),
+            (getattr(self, 'browse_workspace_btn', None), 'button'),
+            (getattr(self, 'scan_workspace_btn', None), 'button'),
+            (getattr(self, 'force_scan_btn', None), 'button'),
+            (getattr(self, 'workspace_tree', None), 'listwidget'),
+            (getattr(self, 'workspace_status', None), 'label'),
+        ]
+        
+        for widget, widget_type in widgets_to_update:
+            if widget:
+                style_method = getattr(theme_class, f'get_{widget_type}_style', None)
+                if style_method:
+                    widget.setStyleSheet(style_method())
+        
+        self.update()
+    
+    def setup_ui(self):
+        """Configura la interfaz del widget"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(20)
+        layout.setContentsMargins(20, 20, 20, 20)
+        
+        self.main_frame = QFrame()
+        self.main_frame.setFrameStyle(QFrame.Shape.Box)
+        self.main_frame.setStyleSheet(ThemeManager.get_theme_class().get_frame_style())
+        
+        frame_layout = QVBoxLayout(self.main_frame)
+        frame_layout.setSpacing(15)
+        frame_layout.setContentsMargins(20, 20, 20, 20)
+        
+        # Título principal
+        title = QLabel("💻 Repositorios Locales")
+        title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setStyleSheet("color: #3D3D3D; margin-bottom: 10px;")
+        frame_layout.addWidget(title)
+        
+        # Sistema de pestañas
+        self.tabs = QTabWidget()
+        self.tabs.setStyleSheet(ThemeManager.get_theme_class().get_frame_style())
+        
+        # Pestaña de workspace
+        self.workspace_tab = self.create_workspace_tab()
+        self.tabs.addTab(self.workspace_tab, "🗂️ Workspace")
+        
+        frame_layout.addWidget(self.tabs)
+        layout.addWidget(self.main_frame)
+    
+    def create_workspace_tab(self):
+        """Crea la pestaña del dashboard de workspace"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        layout.setSpacing(10)
+        
+        # Selector del directorio raíz
+        root_label = QLabel("📂 Directorio raíz del workspace:")
+        root_label.setStyleSheet("color: #3D3D3D; font-weight: bold;")
+        layout.addWidget(root_label)
+        
+        root_layout = QHBoxLayout()
+        
+        self.workspace_root_input = QLineEdit()
+        self.workspace_root_input.setPlaceholderText("/home/usuario/proyectos")
+        self.workspace_root_input.setText(app_config.get("git_workspace_root") or "")
+        self.workspace_root_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        root_layout.addWidget(self.workspace_root_input)
+        
+        self.browse_workspace_btn = QPushButton("📁")
+        self.browse_workspace_btn.setMaximumWidth(40)
+        self.browse_workspace_btn.setToolTip("Seleccionar directorio")
+        self.browse_workspace_btn.clicked.connect(self.browse_workspace_root)
+        self.browse_workspace_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        root_layout.addWidget(self.browse_workspace_btn)
+        
+        layout.addLayout(root_layout)
+        
+        # Botones de escaneo
+        buttons_layout = QHBoxLayout()
+        
+        self.scan_workspace_btn = QPushButton("🔄 Escanear Cambios")
+        self.scan_workspace_btn.setToolTip("Solo vuelve a consultar los repositorios que cambiaron")
+        self.scan_workspace_btn.clicked.connect(lambda: self.scan_workspace(force=False))
+        self.scan_workspace_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(self.scan_workspace_btn)
+        
+        self.force_scan_btn = QPushButton("♻️ Escanear Todo")
+        self.force_scan_btn.setToolTip("Ignora la caché y consulta todos los repositorios")
+        self.force_scan_btn.clicked.connect(lambda: self.scan_workspace(force=True))
+        self.force_scan_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(self.force_scan_btn)
+        
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+        
+        # Dashboard de repositorios
+        self.workspace_tree = QTreeWidget()
+        self.workspace_tree.setHeaderLabels(["Repositorio", "Rama", "↑ / ↓", "Staged", "Modificados", "Sin seguimiento", "Estado"])
+        self.workspace_tree.setRootIsDecorated(False)
+        self.workspace_tree.setSortingEnabled(True)
+        self.workspace_tree.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.workspace_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.workspace_tree.setStyleSheet(ThemeManager.get_theme_class().get_listwidget_style())
+        self.workspace_tree.itemDoubleClicked.connect(self.on_workspace_repo_double_clicked)
+        layout.addWidget(self.workspace_tree)
+        
+        self.workspace_status = QLabel("Selecciona un directorio y presiona escanear • Doble clic abre los cambios locales")
+        self.workspace_status.setStyleSheet("color: #6272a4; padding: 5px;")
+        layout.addWidget(self.workspace_status)
+        
+        return tab
+    
+    def browse_workspace_root(self):
+        """Abre un diálogo para seleccionar el directorio raíz"""
+        directory = QFileDialog.getExistingDirectory(
+            self, "Seleccionar directorio del workspace", self.workspace_root_input.text().strip()
+        )
+        if directory:
+            self.workspace_root_input.setText(directory)
+    
+    def scan_workspace(self, force=False):
+        """Escanea todos los repositorios del workspace"""
+        root_path = self.workspace_root_input.text().strip()
+        
+        if not root_path or not os.path.isdir(root_path):
+            QMessageBox.warning(self, "⚠️ Directorio Inválido",
+                              "Por favor selecciona un directorio existente")
+            return
+        
+        if self.scan_worker and self.scan_worker.isRunning():
+            return
+        
+        # Si cambió la raíz, empezar con un dashboard limpio
+        if root_path != app_config.get("git_workspace_root"):
+            app_config.set("git_workspace_root", root_path)
+            self.workspace_tree.clear()
+            self.workspace_items = {}
+        
+        self.scan_workspace_btn.setEnabled(False)
+        self.force_scan_btn.setEnabled(False)
+        self.workspace_status.setText("🔄 Escaneando repositorios...")
+        
+        self.scanned_paths = set()
+        self.scan_worker = GitWorkspaceScanWorker(self.workspace_service, root_path, force)
+        self.scan_worker.repo_scanned.connect(self.on_workspace_repo_scanned)
+        self.scan_worker.scan_finished.connect(self.on_workspace_scan_finished)
+        self.scan_worker.error_occurred.connect(self.on_workspace_scan_error)
+        self.scan_worker.start()
+    
+    def on_workspace_repo_scanned(self, status):
+        """Agrega o actualiza la fila de un repositorio a medida que llega"""
+        path = status.get('path')
+        self.scanned_paths.add(path)
+        
+        item = self.workspace_items.get(path)
+        if item is None:
+            item = QTreeWidgetItem()
+            self.workspace_tree.addTopLevelItem(item)
+            self.workspace_items[path] = item
+        
+        item.setText(0, status.get('name', path))
+        item.setToolTip(0, path)
+        item.setData(0, Qt.ItemDataRole.UserRole, status)
+        
+        if status.get('error'):
+            for column in range(1, 6):
+                item.setText(column, "")
+            item.setText(6, f"❌ {status['error']}")
+            return
+        
+        item.setText(1, status.get('branch', 'N/A'))
+        if status.get('upstream'):
+            item.setText(2, f"↑{status.get('ahead', 0)} ↓{status.get('behind', 0)}")
+        else:
+            item.setText(2, "sin upstream")
+        item.setText(3, str(status.get('staged', 0)))
+        item.setText(4, str(status.get('modified', 0)))
+        item.setText(5, str(status.get('untracked', 0)))
+        
+        if status.get('conflicts'):
+            state_text = f"⚠️ {status['conflicts']} conflictos"
+        elif status.get('staged') or status.get('modified') or status.get('untracked'):
+            state_text = "📝 Con cambios"
+        else:
+            state_text = "✅ Limpio"
+        if status.get('cached'):
+            state_text += " (caché)"
+        item.setText(6, state_text)
+    
+    def on_workspace_repo_double_clicked(self, item, column):
+        """Abre los cambios locales del repositorio seleccionado"""
+        status = item.data(0, Qt.ItemDataRole.UserRole)
+        if not status or status.get('error'):
+            return
+        
+        dialog = LocalChangesDialog(status['path'], status.get('name'), self)
+        dialog.exec()
+    
+    def on_workspace_scan_finished(self, total):
+        """Maneja el fin del escaneo del workspace"""
+        # Quitar repositorios que ya no existen bajo la raíz
+        for path in list(self.workspace_items):
+            if path not in self.scanned_paths:
+                item = self.workspace_items.pop(path)
+                index = self.workspace_tree.indexOfTopLevelItem(item)
+                if index >= 0:
+                    self.workspace_tree.takeTopLevelItem(index)
+        
+        self.scan_workspace_btn.setEnabled(True)
+        self.force_scan_btn.setEnabled(True)
+        self.workspace_status.setText(f"✅ {total} repositorios escaneados")
+    
+    def on_workspace_scan_error(self, error_msg):
+        """Maneja errores del escaneo del workspace"""
+        self.scan_workspace_btn.setEnabled(True)
+        self.force_scan_btn.setEnabled(True)
+        self.workspace_status.setText(f"❌ Error: {error_msg}")
+    
+    def cleanup_threads(self):
+        """Limpia y cierra todos los threads activos"""
+        if self.scan_worker and self.scan_worker.isRunning():
+            self.scan_worker.stop()
+            if not self.scan_worker.wait(3000):  # Esperar máximo 3 segundos
+                self.scan_worker.terminate()
+                self.scan_worker.wait()
+        
+        self.workspace_service.shutdown()
+        diff_engine.shutdown()
+    
+    def closeEvent(self, event):
+        """Maneja el evento de cierre del widget"""
+        self.cleanup_threads()
+        super().closeEvent(event)
@@ -0,0 +1,276 @@
+"""
+Servicio de workspace para múltiples repositorios Git locales
+Descubre repositorios bajo un directorio raíz y obtiene su estado en un pool de procesos
+"""
+
+import os
+import multiprocessing
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple, Iterator
+from PyQt6.QtCore import QThread, pyqtSignal
+
+# Directorios que nunca contienen repositorios de interés y son costosos de recorrer
+IGNORED_DIRS = {'node_modules', '.venv', 'venv', '__pycache__', '.tox', '.nox', 'dist', 'build'}
+
+
+def resolve_git_dir(repo_path: str) -> Optional[str]:
+    """Obtiene el directorio .git real (soporta worktrees y submódulos con archivo .git)"""
+    git_path = os.path.join(repo_path, '.git')
+    if os.path.isdir(git_path):
+        return git_path
+    if os.path.isfile(git_path):
+        try:
+            with open(git_path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            if content.startswith('gitdir:'):
+                git_dir = content[len('gitdir:'):].strip()
+                if not os.path.isabs(git_dir):
+                    git_dir = os.path.normpath(os.path.join(repo_path, git_dir))
+                return git_dir
+        except OSError:
+            return None
+    return None
+
+
+def get_repository_signature(repo_path: str) -> Tuple:
+    """
+    Calcula una firma basada en mtimes para invalidar la caché de estado
+    
+    Incluye los metadatos de Git (index, HEAD, refs) y los directorios del primer
+    nivel del árbol de trabajo. Editar un archivo ya versionado en un directorio
+    más profundo no cambia ninguno de esos mtimes, por eso el estado en caché
+    además vence a los GitWorkspaceService.STATUS_CACHE_TTL segundos.
+    """
+    git_dir = resolve_git_dir(repo_path) or os.path.join(repo_path, '.git')
+    paths = [
+        os.path.join(git_dir, 'index'),
+        os.path.join(git_dir, 'HEAD'),
+        os.path.join(git_dir, 'FETCH_HEAD'),
+        os.path.join(git_dir, 'packed-refs'),
+        os.path.join(git_dir, 'refs', 'heads'),
+        os.path.join(git_dir, 'refs', 'remotes'),
+        repo_path,
+    ]
+    signature = []
+    for path in paths:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(0)
+    
+    try:
+        with os.scandir(repo_path) as entries:
+            for entry in entries:
+                if entry.name != '.git' and entry.is_dir(follow_symlinks=False):
+                    signature.append((entry.name, entry.stat(follow_symlinks=False).st_mtime_ns))
+    except OSError:
+        pass
+    
+    return tuple(signature)
+
+
+def scan_repository(repo_path: str) -> Dict:
+    """
+    Obtiene rama, ahead/behind y conteo de cambios de un repositorio
+    
+    Función de módulo para poder ejecutarse en un proceso del pool.
+    """
+    repo_info = {
+        'path': repo_path,
+        'name': os.path.basename(os.path.normpath(repo_path)),
+        'branch': 'N/A',
+        'upstream': None,
+        'ahead': 0,
+        'behind': 0,
+        'staged': 0,
+        'modified': 0,
+        'untracked': 0,
+        'conflicts': 0,
+        'error': None
+    }
+    
+    try:
+        # --no-optional-locks evita que status reescriba el index y altere la firma
+        result = subprocess.run(
+            ['git', '--no-optional-locks', 'status', '--porcelain=v2', '--branch'],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        repo_info['error'] = (e.stderr or str(e)).strip()
+        return repo_info
+    except OSError as e:
+        repo_info['error'] = str(e)
+        return repo_info
+    
+    for line in result.stdout.split('\n'):
+        if not line:
+            continue
+        if line.startswith('# branch.head '):
+            head = line[len('# branch.head '):]
+            repo_info['branch'] = 'detached HEAD' if head == '(detached)' else head
+        elif line.startswith('# branch.upstream '):
+            repo_info['upstream'] = line[len('# branch.upstream '):]
+        elif line.startswith('# branch.ab '):
+            ahead, behind = line[len('# branch.ab '):].split()
+            repo_info['ahead'] = int(ahead.lstrip('+'))
+            repo_info['behind'] = int(behind.lstrip('-'))
+        elif line.startswith('? '):
+            repo_info['untracked'] += 1
+        elif line.startswith('u '):
+            repo_info['conflicts'] += 1
+        elif line.startswith('1 ') or line.startswith('2 '):
+            xy = line[2:4]
+            if xy[0] != '.':
+                repo_info['staged'] += 1
+            if xy[1] != '.':
+                repo_info['modified'] += 1
+    
+    return repo_info
+
+
+class GitWorkspaceService:
+    """Servicio para escanear todos los repositorios de un directorio raíz"""
+    
+    STATUS_CACHE_TTL = 60  # Segundos que se confía en un estado aunque la firma no cambie
+    
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # path -> (firma, estado, momento del escaneo)
+        self._cache: Dict[str, Tuple[Tuple, Dict, float]] = {}
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Obtiene el pool de procesos, creándolo la primera vez"""
+        if self._executor is None:
+            # 'spawn' evita hacer fork de un proceso con hilos de Qt activos
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+    
+    def find_repositories(self, root_path: str, max_depth: int = 4) -> List[str]:
+        """Encuentra todos los repositorios Git bajo el directorio raíz"""
+        if not os.path.isdir(root_path):
+            return []
+        
+        root_path = os.path.abspath(root_path)
+        root_depth = root_path.rstrip(os.sep).count(os.sep)
+        repositories = []
+        
+        for current_dir, dirnames, filenames in os.walk(root_path):
+            if '.git' in dirnames or '.git' in filenames:
+                repositories.append(current_dir)
+                # No descender dentro de un repositorio ya encontrado
+                dirnames[:] = []
+                continue
+            
+            if current_dir.count(os.sep) - root_depth >= max_depth:
+                dirnames[:] = []
+                continue
+            
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in IGNORED_DIRS]
+        
+        return sorted(repositories)
+    
+    def get_cached_status(self, repo_path: str, signature: Tuple = None) -> Optional[Dict]:
+        """Obtiene el estado en caché si la firma del repositorio no cambió y no venció"""
+        cached = self._cache.get(repo_path)
+        if not cached:
+            return None
+        if signature is None:
+            signature = get_repository_signature(repo_path)
+        cached_signature, status, scanned_at = cached
+        if time.monotonic() - scanned_at > self.STATUS_CACHE_TTL:
+            return None
+        return status if cached_signature == signature else None
+    
+    def scan_workspace(self, root_path: str, force: bool = False,
+                       should_stop=None) -> Iterator[Dict]:
+        """
+        Escanea el workspace y entrega el estado de cada repositorio a medida que termina
+        
+        Los repositorios sin cambios desde el último escaneo (y escaneados hace menos
+        de STATUS_CACHE_TTL segundos) se entregan desde la caché sin lanzar git.
+        """
+        pending = {}
+        started_at = time.monotonic()
+        for repo_path in self.find_repositories(root_path):
+            signature = get_repository_signature(repo_path)
+            cached = None if force else self.get_cached_status(repo_path, signature)
+            if cached is not None:
+                yield dict(cached, cached=True)
+            else:
+                pending[repo_path] = signature
+        
+        if not pending:
+            return
+        
+        executor = self._get_executor()
+        futures = {executor.submit(scan_repository, path): path for path in pending}
+        
+        try:
+            for future in as_completed(futures):
+                if should_stop and should_stop():
+                    break
+                repo_path = futures[future]
+                try:
+                    status = future.result()
+                except Exception as e:
+                    status = {'path': repo_path, 'name': os.path.basename(repo_path), 'error': str(e)}
+                else:
+                    # La firma se toma antes de ejecutar git para no ocultar cambios concurrentes
+                    self._cache[repo_path] = (pending[repo_path], status, started_at)
+                yield dict(status, cached=False)
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    def clear_cache(self):
+        """Limpia la caché de estados"""
+        self._cache.clear()
+    
+    def shutdown(self):
+        """Cierra el pool de procesos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class GitWorkspaceScanWorker(QThread):
+    """Worker para escanear el workspace sin bloquear la UI"""
+    
+    repo_scanned = pyqtSignal(dict)    # Señal por cada repositorio escaneado
+    scan_finished = pyqtSignal(int)    # Señal con el total de repositorios
+    error_occurred = pyqtSignal(str)   # Señal cuando ocurre un error
+    
+    def __init__(self, workspace_service: GitWorkspaceService, root_path: str, force: bool = False):
+        super().__init__()
+        self.workspace_service = workspace_service
+        self.root_path = root_path
+        self.force = force
+        self._stop_requested = False
+    
+    def stop(self):
+        """Solicita detener el escaneo en curso"""
+        self._stop_requested = True
+    
+    def run(self):
+        """Escanea los repositorios en un hilo separado"""
+        try:
+            total = 0
+            for status in self.workspace_service.scan_workspace(
+                self.root_path, self.force, should_stop=lambda: self._stop_requested
+            ):
+                if self._stop_requested:
+                    break
+                total += 1
+                self.repo_scanned.emit(status)
+            self.scan_finished.emit(total)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
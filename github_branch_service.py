@@ -3,7 +3,10 @@ Servicio especializado para gestión de ramas en GitHub
 """
 
 import re
+import threading
+import time
 import uuid
+from datetime import datetime, timezone
 from typing import List, Dict, Optional, Tuple
 from PyQt6.QtCore import QThread, pyqtSignal
 from github import Github, GithubException
@@ -75,15 +78,16 @@ class GitHubBranchesWorker(QThread):
     branches_ready = pyqtSignal(list)  # Señal cuando las ramas están listas
     error_occurred = pyqtSignal(str)   # Señal cuando ocurre un error
     
-    def __init__(self, branch_service, repo_full_name: str):
+    def __init__(self, branch_service, repo_full_name: str, use_cache: bool = True):
         super().__init__()
         self.branch_service = branch_service
         self.repo_full_name = repo_full_name
+        self.use_cache = use_cache
     
     def run(self):
         """Obtiene las ramas en un hilo separado"""
         try:
-            branches = self.branch_service.get_repository_branches(self.repo_full_name)
+            branches = self.branch_service.get_repository_branches(self.repo_full_name, self.use_cache)
             self.branches_ready.emit(branches)
         except Exception as e:
             self.error_occurred.emit(str(e))
@@ -145,20 +149,38 @@ class GitHubDeleteBranchWorker(QThread):
 class GitHubBranchService:
     """Servicio especializado para gestión de ramas en GitHub"""
     
-    def __init__(self, github_client: Github):
+    BRANCH_CACHE_TTL = 60  # Segundos que se usan las ramas en caché sin webhooks
+    
+    def __init__(self, github_client: Github, key_index=None, webhooks_active: bool = False):
         self.github_client = github_client
         self.validator = GitHubBranchValidator()
+        self.key_index = key_index  # Índice de claves de Jira (JiraGitIndex) que se alimenta con lo descargado
+        # Ramas por repositorio -> (momento de la descarga, ramas); los webhooks de
+        # push las corrigen sin volver a pedirlas
+        self.branch_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._cache_lock = threading.Lock()
+        # Con el receptor de webhooks activo la caché se mantiene al día y no caduca
+        self.webhooks_active = webhooks_active
     
     def is_authenticated(self) -> bool:
         """Verifica si el cliente de GitHub está autenticado"""
         return self.github_client is not None
     
-    def get_repository_branches(self, repo_full_name: str) -> List[Dict]:
+    def get_repository_branches(self, repo_full_name: str, use_cache: bool = True) -> List[Dict]:
         """Obtiene las ramas de un repositorio específico"""
         if not self.is_authenticated():
             raise Exception("No está autenticado con GitHub")
         
+        if use_cache:
+            with self._cache_lock:
+                cached = self.branch_cache.get(repo_full_name)
+            if cached is not None:
+                fetched_at, branches = cached
+                if self.webhooks_active or time.monotonic() - fetched_at <= self.BRANCH_CACHE_TTL:
+                    return list(branches)
+        
         try:
+            fetched_at = time.monotonic()
             repo = self.github_client.get_repo(repo_full_name)
             branches = repo.get_branches()
             
@@ -196,14 +218,113 @@ class GitHubBranchService:
                     branch_list.append(branch_info)
                     print(f"Error obteniendo detalles de la rama {branch.name}: {e}")
             
-            # Ordenar por fecha de último commit (más recientes primero)
-            branch_list.sort(key=lambda x: x['last_commit_date'] if x['last_commit_date'] != "N/A" else "1970-01-01", reverse=True)
-            
-            return branch_list
+            self._sort_branches(branch_list)
+            with self._cache_lock:
+                self.branch_cache[repo_full_name] = (fetched_at, branch_list)
+            self._index_for_jira(repo_full_name, branches=branch_list)
+            return list(branch_list)
             
         except Exception as e:
             raise Exception(f"Error obteniendo ramas del repositorio: {str(e)}")
     
+    def _index_for_jira(self, repo_full_name: str, branches: List[Dict] = None, commits: List[Dict] = None):
+        """Pasa al índice de claves de Jira las ramas o commits ya descargados"""
+        if not self.key_index:
+            return
+        if branches is not None:
+            self.key_index.index_branches(repo_full_name, branches)
+        if commits:
+            self.key_index.index_commits(repo_full_name, commits)
+        self.key_index.save_later()
+    
+    @staticmethod
+    def _sort_branches(branch_list: List[Dict]):
+        """Ordena por fecha de último commit (más recientes primero)"""
+        branch_list.sort(key=lambda x: x['last_commit_date'] if x['last_commit_date'] != "N/A" else "1970-01-01", reverse=True)
+    
+    def invalidate_branches(self, repo_full_name: str):
+        """Descarta las ramas en caché de un repositorio"""
+        with self._cache_lock:
+            self.branch_cache.pop(repo_full_name, None)
+    
+    @staticmethod
+    def _branch_from_push(name: str, payload: Dict) -> Dict:
+        """Datos de la rama con el formato de get_repository_branches a partir de un push"""
+        sha = payload.get('after') or ''
+        head_commit = payload.get('head_commit') or {}
+        message = head_commit.get('message') or ''
+        commit_date = "N/A"
+        if head_commit.get('timestamp'):
+            try:
+                # Mismo formato UTC que las fechas de PyGithub para ordenar
+                commit_date = datetime.fromisoformat(head_commit['timestamp'].replace('Z', '+00:00')) \
+                    .astimezone(timezone.utc).isoformat()
+            except ValueError:
+                commit_date = head_commit['timestamp']
+        return {
+            'name': name,
+            'sha': sha,
+            'protected': False,
+            'last_commit_date': commit_date,
+            'last_commit_author': (head_commit.get('author') or {}).get('name') or "Desconocido",
+            'last_commit_message': message[:100] + "..." if len(message) > 100 else message,
+            'last_commit_sha': sha[:7] if sha else "N/A"
+        }
+    
+    def apply_webhook_event(self, event: str, payload: Dict) -> Optional[str]:
+        """
+        Aplica a la caché de ramas un webhook de push, create o delete
+        
+        Un push actualiza el último commit de la rama (o la agrega si es nueva
+        o la quita si se borró). Un create no trae el commit, así que descarta
+        las ramas del repositorio para pedirlas de nuevo. El índice de claves de
+        Jira se actualiza aunque el repositorio no tenga ramas en caché.
+        
+        Returns:
+            Optional[str]: Repositorio cuya caché cambió (None si no había nada en caché)
+        """
+        repo_full_name = (payload.get('repository') or {}).get('full_name')
+        ref = payload.get('ref') or ''
+        if event in ('create', 'delete'):
+            if payload.get('ref_type') != 'branch':
+                return None
+            name, deleted, pushed = ref, event == 'delete', None
+        elif event == 'push' and ref.startswith('refs/heads/'):
+            name, deleted = ref[len('refs/heads/'):], bool(payload.get('deleted'))
+            pushed = None if deleted else self._branch_from_push(name, payload)
+        else:
+            return None
+        
+        if self.key_index:
+            if deleted:
+                self.key_index.remove_branch(repo_full_name, name)
+            elif pushed:
+                self.key_index.index_branch(repo_full_name, pushed)
+            self.key_index.index_commits(repo_full_name, [
+                {'sha': commit.get('id'), 'message': commit.get('message'), 'html_url': commit.get('url'),
+                 'date': commit.get('timestamp')}
+                for commit in payload.get('commits') or []
+            ])
+            self.key_index.save_later()
+        
+        with self._cache_lock:
+            cached = self.branch_cache.get(repo_full_name)
+            if cached is None:
+                return None
+            fetched_at, branches = cached
+            current = next((branch for branch in branches if branch['name'] == name), None)
+            remaining = [branch for branch in branches if branch['name'] != name]
+            if deleted:
+                self.branch_cache[repo_full_name] = (fetched_at, remaining)
+            elif pushed:
+                pushed['protected'] = current.get('protected', False) if current else False
+                remaining.append(pushed)
+                self._sort_branches(remaining)
+                self.branch_cache[repo_full_name] = (fetched_at, remaining)
+            else:
+                del self.branch_cache[repo_full_name]
+            return repo_full_name
+    
     def branch_exists(self, repo_full_name: str, branch_name: str) -> bool:
         """Verifica si una rama ya existe en el repositorio"""
         if not self.is_authenticated():
@@ -248,6 +369,7 @@ class GitHubBranchService:
             
             # Crear la nueva rama
             repo.create_git_ref(ref=f"refs/heads/{branch_name}", sha=source_sha)
+            self.invalidate_branches(repo_full_name)
             
             return True
             
@@ -284,6 +406,7 @@ class GitHubBranchService:
             
             # Crear la nueva rama
             repo.create_git_ref(ref=f"refs/heads/{branch_name}", sha=source_sha)
+            self.invalidate_branches(repo_full_name)
             
             return True
             
@@ -309,6 +432,7 @@ class GitHubBranchService:
             # Eliminar la rama
             ref = repo.get_git_ref(f"heads/{branch_name}")
             ref.delete()
+            self.invalidate_branches(repo_full_name)
             
             return True
             
@@ -341,6 +465,7 @@ class GitHubBranchService:
             
             # Crear la nueva rama
             repo.create_git_ref(ref=f"refs/heads/{branch_name}", sha=commit_sha)
+            self.invalidate_branches(repo_full_name)
             
             return True
             
@@ -403,6 +528,7 @@ class GitHubBranchService:
                 }
                 commit_list.append(commit_info)
             
+            self._index_for_jira(repo_full_name, commits=commit_list)
             return commit_list
             
         except Exception as e:
@@ -464,9 +590,9 @@ class GitHubBranchService:
             if counter > 100:
                 return f"{base_name}-{str(uuid.uuid4())[:8]}"
     
-    def get_branches_async(self, repo_full_name: str) -> GitHubBranchesWorker:
+    def get_branches_async(self, repo_full_name: str, use_cache: bool = True) -> GitHubBranchesWorker:
         """Obtiene ramas de forma asíncrona"""
-        worker = GitHubBranchesWorker(self, repo_full_name)
+        worker = GitHubBranchesWorker(self, repo_full_name, use_cache)
         return worker
     
     def create_branch_async(self, repo_full_name: str, branch_name: str, source_branch: str = None) -> GitHubCreateBranchWorker:
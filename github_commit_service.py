@@ -4,14 +4,34 @@ Maneja operaciones de staging, commits y visualización de cambios
 """
 
 import os
+import time
 import subprocess
-from typing import List, Dict, Optional, Tuple
+import threading
+from itertools import islice
+from typing import List, Dict, Optional, Tuple, Iterator
 from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtWidgets import QMessageBox
+from lru_cache import LRUCache
 
 class GitCommitService:
     """Servicio para operaciones de Git locales"""
     
+    # Blame por (blob SHA, commit SHA, ruta), compartido entre instancias
+    blame_cache = LRUCache(max_entries=32)
+    
+    # Páginas de historial por (repositorio, HEAD, filtros, página)
+    log_page_cache = LRUCache(max_entries=64)
+    
+    # git log abiertos que continúan donde terminó la última página entregada:
+    # (repositorio, HEAD, filtros, tamaño de página) -> (siguiente página, generador)
+    log_cursors: Dict[Tuple, Tuple[int, Iterator[Dict]]] = {}
+    log_cursors_lock = threading.Lock()
+    MAX_LOG_CURSORS = 4
+    
+    # Separador de campos del formato de git log (no aparece en mensajes normales)
+    LOG_FIELDS = ['sha', 'short_sha', 'author', 'author_email', 'author_time', 'subject']
+    LOG_FORMAT = '%x1f'.join(['%H', '%h', '%an', '%ae', '%at', '%s'])
+    
     def __init__(self):
         self.current_repo_path = None
     
@@ -38,7 +58,8 @@ class GitCommitService:
             )
             
             files = []
-            for line in result.stdout.strip().split('\n'):
+            # No usar strip() sobre toda la salida: el status de la primera línea puede empezar con espacio
+            for line in result.stdout.rstrip('\n').split('\n'):
                 if line.strip():
                     status = line[:2]
                     # El nombre del archivo empieza en la posición 3 (después del status y espacio)
@@ -163,7 +184,7 @@ class GitCommitService:
             )
             
             return result.stdout if result.stdout.strip() else "No hay cambios para mostrar"
-            
+        
         except subprocess.CalledProcessError as e:
             return f"Error al obtener diferencias: {e}"
         except Exception as e:
@@ -240,6 +261,311 @@ class GitCommitService:
     def is_git_repository(self, path: str) -> bool:
         """Verifica si la ruta es un repositorio Git"""
         return os.path.exists(os.path.join(path, '.git'))
+    
+    def resolve_blob(self, filepath: str, revision: str = 'HEAD') -> Tuple[str, str]:
+        """Obtiene el SHA del commit y el SHA del blob de un archivo en una revisión"""
+        if not self.current_repo_path:
+            raise Exception("No hay repositorio seleccionado")
+        
+        try:
+            result = subprocess.run(
+                ['git', 'rev-parse', f'{revision}^{{commit}}', f'{revision}:{filepath}'],
+                cwd=self.current_repo_path,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            commit_sha, blob_sha = result.stdout.split()
+            return commit_sha, blob_sha
+        except (subprocess.CalledProcessError, ValueError):
+            raise Exception(f"El archivo '{filepath}' no existe en {revision}")
+    
+    def get_file_content(self, filepath: str, revision: str = 'HEAD') -> str:
+        """Obtiene el contenido de un archivo en una revisión"""
+        if not self.current_repo_path:
+            return ""
+        
+        try:
+            result = subprocess.run(
+                ['git', 'show', f'{revision}:{filepath}'],
+                cwd=self.current_repo_path,
+                capture_output=True,
+                check=True
+            )
+            return result.stdout.decode('utf-8', errors='replace')
+        except subprocess.CalledProcessError:
+            return ""
+    
+    def get_diff_sides(self, filepath: str) -> Dict:
+        """
+        Obtiene las dos versiones de un archivo para compararlas lado a lado
+        
+        Compara la versión de HEAD con el árbol de trabajo. Cada lado incluye el SHA
+        de su blob (None si no existe) para poder memoizar la alineación.
+        """
+        if not self.current_repo_path:
+            raise Exception("No hay repositorio seleccionado")
+        
+        sides = {'old_blob': None, 'old_content': '', 'new_blob': None, 'new_content': ''}
+        
+        result = subprocess.run(
+            ['git', 'rev-parse', '--verify', '--quiet', f'HEAD:{filepath}'],
+            cwd=self.current_repo_path,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode == 0:
+            sides['old_blob'] = result.stdout.strip()
+            sides['old_content'] = self.get_file_content(filepath)
+        
+        full_path = os.path.join(self.current_repo_path, filepath)
+        if os.path.isfile(full_path):
+            try:
+                result = subprocess.run(
+                    ['git', 'hash-object', '--', filepath],
+                    cwd=self.current_repo_path,
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+                sides['new_blob'] = result.stdout.strip()
+                with open(full_path, 'rb') as f:
+                    sides['new_content'] = f.read().decode('utf-8', errors='replace')
+            except (subprocess.CalledProcessError, OSError) as e:
+                raise Exception(f"Error leyendo '{filepath}': {e}")
+        
+        return sides
+    
+    def iter_blame_chunks(self, filepath: str, revision: str = 'HEAD') -> Iterator[Dict]:
+        """
+        Ejecuta git blame --incremental y entrega cada bloque de líneas apenas llega
+        
+        Cada bloque contiene la línea final inicial (1-based), la cantidad de líneas
+        y los datos del commit que las introdujo.
+        """
+        if not self.current_repo_path:
+            return
+        
+        process = subprocess.Popen(
+            ['git', 'blame', '--incremental', '--porcelain', revision, '--', filepath],
+            cwd=self.current_repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+        
+        # Los datos de cada commit solo se envían la primera vez que aparece
+        commits: Dict[str, Dict] = {}
+        chunk = None
+        
+        try:
+            for line in process.stdout:
+                line = line.rstrip('\n')
+                if chunk is None:
+                    parts = line.split(' ')
+                    if len(parts) != 4:
+                        continue
+                    sha = parts[0]
+                    chunk = {
+                        'sha': sha,
+                        'final_line': int(parts[2]),
+                        'num_lines': int(parts[3]),
+                    }
+                    commits.setdefault(sha, {'sha': sha})
+                    continue
+                
+                key, _, value = line.partition(' ')
+                if key == 'filename':
+                    chunk.update(commits[chunk['sha']])
+                    yield chunk
+                    chunk = None
+                elif key in ('author', 'author-mail', 'author-time', 'summary'):
+                    commits[chunk['sha']][key.replace('-', '_')] = value
+            
+            process.wait()
+            if process.returncode != 0:
+                raise Exception(f"Error en git blame: {process.stderr.read().strip()}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+    
+    def get_head_sha(self) -> Optional[str]:
+        """Obtiene el SHA de HEAD (None si el repositorio no tiene commits)"""
+        if not self.current_repo_path:
+            return None
+        
+        result = subprocess.run(
+            ['git', 'rev-parse', '--verify', '--quiet', 'HEAD'],
+            cwd=self.current_repo_path,
+            capture_output=True,
+            text=True
+        )
+        return result.stdout.strip() if result.returncode == 0 else None
+    
+    def iter_log(self, skip: int = 0, limit: int = None, path: str = None,
+                 author: str = None, revision: str = 'HEAD') -> Iterator[Dict]:
+        """
+        Ejecuta git log -z y entrega cada commit a medida que git lo produce
+        
+        Los filtros de ruta y autor se aplican en git para no recorrer el historial
+        completo en Python.
+        """
+        if not self.current_repo_path:
+            return
+        
+        command = ['git', 'log', '-z', f'--format={self.LOG_FORMAT}', f'--skip={skip}']
+        if limit:
+            command.append(f'--max-count={limit}')
+        if author:
+            command.extend(['--regexp-ignore-case', f'--author={author}'])
+        command.append(revision)
+        command.append('--')
+        if path:
+            command.append(path)
+        
+        process = subprocess.Popen(
+            command,
+            cwd=self.current_repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        
+        try:
+            buffer = b''
+            while True:
+                data = process.stdout.read1(65536)
+                if not data:
+                    break
+                buffer += data
+                *records, buffer = buffer.split(b'\0')
+                for record in records:
+                    commit = self._parse_log_record(record)
+                    if commit:
+                        yield commit
+            
+            commit = self._parse_log_record(buffer)
+            if commit:
+                yield commit
+            
+            process.wait()
+            if process.returncode != 0:
+                error = process.stderr.read().decode('utf-8', errors='replace').strip()
+                # Un repositorio sin commits no es un error para el historial
+                if 'does not have any commits' not in error:
+                    raise Exception(f"Error en git log: {error}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+    
+    def _parse_log_record(self, record: bytes) -> Optional[Dict]:
+        """Convierte un registro de git log -z en un diccionario"""
+        record = record.strip(b'\n')
+        if not record:
+            return None
+        values = record.decode('utf-8', errors='replace').split('\x1f')
+        if len(values) != len(self.LOG_FIELDS):
+            return None
+        commit = dict(zip(self.LOG_FIELDS, values))
+        commit['author_time'] = int(commit['author_time'] or 0)
+        return commit
+    
+    def get_log_page(self, page: int, page_size: int = 200, path: str = None,
+                     author: str = None) -> List[Dict]:
+        """
+        Obtiene una página del historial, usando la caché si HEAD no cambió
+        
+        La página siguiente a la última entregada se lee del mismo git log, que
+        sigue abierto donde se detuvo; así pedir páginas en orden cuesta lo mismo
+        en cualquier profundidad. Solo un salto a otra página usa --skip.
+        """
+        head_sha = self.get_head_sha()
+        if not head_sha:
+            return []
+        
+        cache_key = (self.current_repo_path, head_sha, path or '', author or '', page_size, page)
+        cached = GitCommitService.log_page_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        cursor_key = cache_key[:-1]
+        with GitCommitService.log_cursors_lock:
+            cursor = GitCommitService.log_cursors.pop(cursor_key, None)
+        if cursor and cursor[0] == page:
+            log = cursor[1]
+        else:
+            if cursor:
+                cursor[1].close()
+            log = self.iter_log(page * page_size, None, path, author, head_sha)
+        
+        try:
+            commits = list(islice(log, page_size))
+        except Exception:
+            log.close()
+            raise
+        GitCommitService.log_page_cache.put(cache_key, commits)
+        
+        if len(commits) < page_size:
+            log.close()  # Fin del historial
+        else:
+            self._store_log_cursor(cursor_key, page + 1, log)
+        return commits
+    
+    @classmethod
+    def _store_log_cursor(cls, cursor_key: Tuple, next_page: int, log: Iterator[Dict]):
+        """Guarda un git log abierto; cierra los de un HEAD anterior y los más viejos"""
+        stale = []
+        with cls.log_cursors_lock:
+            for key in list(cls.log_cursors):
+                if key[0] == cursor_key[0] and key[2:] == cursor_key[2:]:
+                    stale.append(cls.log_cursors.pop(key)[1])  # Mismo historial, otro HEAD
+            cls.log_cursors[cursor_key] = (next_page, log)
+            while len(cls.log_cursors) > cls.MAX_LOG_CURSORS:
+                stale.append(cls.log_cursors.pop(next(iter(cls.log_cursors)))[1])
+        for old_log in stale:
+            old_log.close()
+    
+    @classmethod
+    def close_log_cursors(cls):
+        """Termina los git log abiertos (al cerrar la vista de historial)"""
+        with cls.log_cursors_lock:
+            logs = [log for _, log in cls.log_cursors.values()]
+            cls.log_cursors.clear()
+        for log in logs:
+            log.close()
+    
+    def get_commit_stats(self, sha: str) -> List[Dict]:
+        """Obtiene las líneas agregadas y eliminadas por archivo de un commit"""
+        if not self.current_repo_path:
+            return []
+        
+        try:
+            result = subprocess.run(
+                ['git', 'diff-tree', '--no-commit-id', '--numstat', '-r', '--root', sha],
+                cwd=self.current_repo_path,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Error obteniendo estadísticas del commit: {e.stderr.strip()}")
+        
+        stats = []
+        for line in result.stdout.split('\n'):
+            parts = line.split('\t', 2)
+            if len(parts) != 3:
+                continue
+            added, deleted, filepath = parts
+            # Los archivos binarios se reportan con '-'
+            stats.append({
+                'path': filepath,
+                'additions': int(added) if added.isdigit() else None,
+                'deletions': int(deleted) if deleted.isdigit() else None
+            })
+        return stats
 
 class GitStatusWorker(QThread):
     """Worker para obtener el estado del repositorio de forma asíncrona"""
@@ -259,6 +585,63 @@ class GitStatusWorker(QThread):
         except Exception as e:
             self.error_occurred.emit(str(e))
 
+class GitBlameWorker(QThread):
+    """Worker que entrega el blame de un archivo en lotes a medida que git lo produce"""
+    
+    content_ready = pyqtSignal(str)     # Contenido del archivo en la revisión
+    chunks_ready = pyqtSignal(list)     # Lote de bloques de blame
+    blame_finished = pyqtSignal(bool)   # True si el resultado vino de la caché
+    error_occurred = pyqtSignal(str)
+    
+    # Intervalo máximo entre lotes para no saturar la cola de eventos de la UI
+    BATCH_INTERVAL = 0.05
+    
+    def __init__(self, git_service: GitCommitService, filepath: str, revision: str = 'HEAD'):
+        super().__init__()
+        self.git_service = git_service
+        self.filepath = filepath
+        self.revision = revision
+        self._stop_requested = False
+    
+    def stop(self):
+        """Solicita detener el blame en curso"""
+        self._stop_requested = True
+    
+    def run(self):
+        """Ejecuta el blame incremental"""
+        try:
+            commit_sha, blob_sha = self.git_service.resolve_blob(self.filepath, self.revision)
+            cache_key = (blob_sha, commit_sha, self.filepath)
+            self.content_ready.emit(self.git_service.get_file_content(self.filepath, commit_sha))
+            
+            cached = GitCommitService.blame_cache.get(cache_key)
+            if cached is not None:
+                self.chunks_ready.emit(cached)
+                self.blame_finished.emit(True)
+                return
+            
+            all_chunks = []
+            batch = []
+            last_emit = time.monotonic()
+            for chunk in self.git_service.iter_blame_chunks(self.filepath, commit_sha):
+                if self._stop_requested:
+                    return
+                batch.append(chunk)
+                if time.monotonic() - last_emit >= self.BATCH_INTERVAL:
+                    self.chunks_ready.emit(batch)
+                    all_chunks.extend(batch)
+                    batch = []
+                    last_emit = time.monotonic()
+            
+            if batch:
+                self.chunks_ready.emit(batch)
+                all_chunks.extend(batch)
+            
+            GitCommitService.blame_cache.put(cache_key, all_chunks)
+            self.blame_finished.emit(False)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
 class GitDiffWorker(QThread):
     """Worker para obtener las diferencias de un archivo de forma asíncrona"""
     
@@ -277,3 +660,44 @@ class GitDiffWorker(QThread):
             self.diff_ready.emit(diff)
         except Exception as e:
             self.error_occurred.emit(str(e))
+
+class GitLogPageWorker(QThread):
+    """Worker para obtener una página del historial de forma asíncrona"""
+    
+    page_ready = pyqtSignal(int, list)   # Número de página y sus commits
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, git_service: GitCommitService, page: int, page_size: int = 200,
+                 path: str = None, author: str = None):
+        super().__init__()
+        self.git_service = git_service
+        self.page = page
+        self.page_size = page_size
+        self.path = path
+        self.author = author
+    
+    def run(self):
+        """Ejecuta la obtención de la página"""
+        try:
+            commits = self.git_service.get_log_page(self.page, self.page_size, self.path, self.author)
+            self.page_ready.emit(self.page, commits)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+class GitCommitStatsWorker(QThread):
+    """Worker para obtener los archivos de un commit al expandirlo"""
+    
+    stats_ready = pyqtSignal(str, list)  # SHA del commit y estadísticas por archivo
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, git_service: GitCommitService, sha: str):
+        super().__init__()
+        self.git_service = git_service
+        self.sha = sha
+    
+    def run(self):
+        """Ejecuta la obtención de estadísticas"""
+        try:
+            self.stats_ready.emit(self.sha, self.git_service.get_commit_stats(self.sha))
+        except Exception as e:
+            self.error_occurred.emit(str(e))
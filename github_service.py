@@ -11,15 +11,17 @@ from PyQt6.QtGui import QPixmap
 from github import Github, GithubException
 import requests
 import io
+from client_pool import ThreadLocalClient, POOL_MAXSIZE
 
 # Importar el servicio especializado de ramas
+from jira_git_index import JiraGitIndex
 from github_branch_service import GitHubBranchService, GitHubBranchesWorker, GitHubCreateBranchWorker
 
 class GitHubAuthService:
     """Servicio de autenticación con GitHub usando Personal Access Token"""
     
     def __init__(self):
-        self.github_client: Optional[Github] = None
+        self.github_client: Optional[ThreadLocalClient] = None  # Un Github por hilo
         self.user_info: Optional[Dict] = None
         self.access_token: Optional[str] = None
     
@@ -27,7 +29,8 @@ class GitHubAuthService:
         """Autentica con un Personal Access Token"""
         try:
             self.access_token = token
-            self.github_client = Github(token)
+            # Los workers de repositorios y ramas corren en paralelo: cada hilo usa su propio cliente
+            self.github_client = ThreadLocalClient(lambda: Github(token, pool_size=POOL_MAXSIZE))
             
             # Verificar que el token funciona obteniendo info del usuario
             user = self.github_client.get_user()
@@ -88,6 +91,8 @@ class GitHubAuthService:
     
     def logout(self):
         """Cierra la sesión"""
+        if self.github_client:
+            self.github_client.close_all()
         self.github_client = None
         self.user_info = None
         self.access_token = None
@@ -183,11 +188,20 @@ class GitHubService:
         self.auth_service = GitHubAuthService()
         self.current_repositories: List[Dict] = []
         self.branch_service: Optional[GitHubBranchService] = None
+        self.key_index = JiraGitIndex()  # Claves de Jira -> ramas y commits (persiste entre sesiones)
+        self.webhooks_active = False
     
     def _initialize_branch_service(self):
         """Inicializa el servicio de ramas si está autenticado"""
         if self.is_authenticated() and not self.branch_service:
-            self.branch_service = GitHubBranchService(self.auth_service.github_client)
+            self.branch_service = GitHubBranchService(self.auth_service.github_client, self.key_index,
+                                                      self.webhooks_active)
+    
+    def set_webhooks_active(self, active: bool):
+        """Indica si el receptor de webhooks está corriendo (las ramas en caché no caducan)"""
+        self.webhooks_active = active
+        if self.branch_service:
+            self.branch_service.webhooks_active = active
     
     def authenticate(self, token: str) -> bool:
         """Autentica con GitHub"""
@@ -434,12 +448,18 @@ class GitHubService:
             print(f"Error inesperado al descargar el avatar: {e}")
             return None
     
-    def get_repository_branches(self, repo_full_name: str) -> List[Dict]:
+    def get_repository_branches(self, repo_full_name: str, use_cache: bool = True) -> List[Dict]:
         """Obtiene las ramas de un repositorio específico"""
         self._initialize_branch_service()
         if not self.branch_service:
             raise Exception("Servicio de ramas no disponible")
-        return self.branch_service.get_repository_branches(repo_full_name)
+        return self.branch_service.get_repository_branches(repo_full_name, use_cache)
+    
+    def apply_webhook_event(self, event: str, payload: Dict) -> Optional[str]:
+        """Aplica un webhook de push/create/delete a la caché de ramas"""
+        if not self.branch_service:
+            return None
+        return self.branch_service.apply_webhook_event(event, payload)
     
     def create_branch(self, repo_full_name: str, branch_name: str, source_branch: str = None) -> bool:
         """Crea una nueva rama en el repositorio"""
@@ -476,12 +496,12 @@ class GitHubService:
             raise Exception("Servicio de ramas no disponible")
         return self.branch_service.suggest_branch_name(base_name, repo_full_name)
     
-    def get_branches_async(self, repo_full_name: str) -> GitHubBranchesWorker:
+    def get_branches_async(self, repo_full_name: str, use_cache: bool = True) -> GitHubBranchesWorker:
         """Obtiene ramas de forma asíncrona"""
         self._initialize_branch_service()
         if not self.branch_service:
             raise Exception("Servicio de ramas no disponible")
-        return self.branch_service.get_branches_async(repo_full_name)
+        return self.branch_service.get_branches_async(repo_full_name, use_cache)
     
     def create_branch_async(self, repo_full_name: str, branch_name: str, source_branch: str = None) -> GitHubCreateBranchWorker:
         """Crea una rama de forma asíncrona"""
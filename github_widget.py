@@ -5,11 +5,16 @@ Widget de GitHub para la aplicación QA Generator
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QLineEdit, QPushButton, QListWidget, QTextEdit,
                            QMessageBox, QFrame, QScrollArea, QListWidgetItem,
-                           QTabWidget, QComboBox, QSplitter, QDialog, QDialogButtonBox)
+                           QTabWidget, QComboBox, QSplitter, QDialog, QDialogButtonBox,
+                           QFileDialog)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont, QPixmap, QPainter, QPainterPath
 from github_service import GitHubService, GitHubAvatarWorker
 from github_branch_service import GitHubBranchesWorker, GitHubCreateBranchWorker
+from git_clone_index import GitCloneIndex, GitCloneIndexWorker
+from jira_git_index import JiraGitIndexWorker
+from git_local_widget import LocalChangesDialog
+from config import app_config
 from styles import ThemeManager
 
 class GitHubWorker(QThread):
@@ -93,7 +98,7 @@ class BranchManagerDialog(QDialog):
         actions_layout = QHBoxLayout()
         
         self.refresh_btn = QPushButton("🔄 Actualizar")
-        self.refresh_btn.clicked.connect(self.load_branches)
+        self.refresh_btn.clicked.connect(lambda: self.load_branches(force=True))
         self.refresh_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
         actions_layout.addWidget(self.refresh_btn)
         
@@ -128,15 +133,15 @@ class BranchManagerDialog(QDialog):
         button_box.rejected.connect(self.close)
         layout.addWidget(button_box)
     
-    def load_branches(self):
-        """Carga las ramas del repositorio"""
+    def load_branches(self, force=False):
+        """Carga las ramas del repositorio (de la caché salvo que se fuerce)"""
         self.branches_list.clear()
         self.branches_list.addItem("🔄 Cargando ramas...")
         self.refresh_btn.setEnabled(False)
         self.create_branch_btn.setEnabled(False)
         
         # Usar el worker del servicio de ramas
-        worker = self.github_service.get_branches_async(self.repo_full_name)
+        worker = self.github_service.get_branches_async(self.repo_full_name, use_cache=not force)
         worker.branches_ready.connect(self.on_branches_loaded)
         worker.error_occurred.connect(self.on_branches_error)
         worker.finished.connect(lambda: self.active_workers.remove(worker) if worker in self.active_workers else None)
@@ -429,12 +434,19 @@ class GitHubWidget(QWidget):
         self.avatar_worker = None
         self.selected_user_repo = None  # Almacenar repo seleccionado del usuario
         self.selected_org_repo = None   # Almacenar repo seleccionado de org
+        self.clone_index = GitCloneIndex()  # Índice persistente de clones locales
+        self.clone_index_worker = None
+        self.branch_dialog = None  # Diálogo de ramas abierto (se refresca con los webhooks)
+        self.key_index_worker = None
         
         # Registrar para cambios de tema
         ThemeManager.register_theme_changed_callback(self.on_theme_changed)
         
         self.setup_ui()
         
+        # Commits locales nuevos desde la última vez -> índice de claves de Jira
+        self.start_key_indexing()
+        
     def on_theme_changed(self, theme_name):
         """Callback cuando cambia el tema"""
         self.apply_theme_to_widgets()
@@ -459,6 +471,9 @@ class GitHubWidget(QWidget):
             (getattr(self, 'login_btn', None), 'button'),
             (getattr(self, 'user_branches_btn', None), 'button'),
             (getattr(self, 'org_branches_btn', None), 'button'),
+            (getattr(self, 'user_local_btn', None), 'button'),
+            (getattr(self, 'org_local_btn', None), 'button'),
+            (getattr(self, 'clone_dirs_btn', None), 'button'),
             
             # Listas
             (getattr(self, 'user_repos_list', None), 'listwidget'),
@@ -694,6 +709,13 @@ class GitHubWidget(QWidget):
         
         layout.addWidget(self.tabs)
         
+        # Botón para configurar las carpetas donde buscar clones locales
+        self.clone_dirs_btn = QPushButton("📂 Agregar Carpeta de Clones")
+        self.clone_dirs_btn.setToolTip("Carpetas donde buscar los clones locales de tus repositorios")
+        self.clone_dirs_btn.clicked.connect(self.add_clone_directory)
+        self.clone_dirs_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        layout.addWidget(self.clone_dirs_btn)
+        
         # Botón para desconectar
         disconnect_btn = QPushButton("🚪 Cerrar Sesión")
         disconnect_btn.clicked.connect(self.logout)
@@ -731,6 +753,13 @@ class GitHubWidget(QWidget):
         self.user_branches_btn.setEnabled(False)
         details_layout.addWidget(self.user_branches_btn)
         
+        # Botón para ver cambios del clon local
+        self.user_local_btn = QPushButton("💻 Cambios Locales")
+        self.user_local_btn.clicked.connect(lambda: self.show_local_changes(self.selected_user_repo))
+        self.user_local_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        self.user_local_btn.setEnabled(False)
+        details_layout.addWidget(self.user_local_btn)
+        
         layout.addLayout(details_layout)
         
         return tab
@@ -787,6 +816,13 @@ class GitHubWidget(QWidget):
         self.org_branches_btn.setEnabled(False)
         org_details_layout.addWidget(self.org_branches_btn)
         
+        # Botón para ver cambios del clon local
+        self.org_local_btn = QPushButton("💻 Cambios Locales")
+        self.org_local_btn.clicked.connect(lambda: self.show_local_changes(self.selected_org_repo))
+        self.org_local_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        self.org_local_btn.setEnabled(False)
+        org_details_layout.addWidget(self.org_local_btn)
+        
         layout.addLayout(org_details_layout)
         
         return tab
@@ -842,6 +878,9 @@ class GitHubWidget(QWidget):
                 self.load_repositories()
                 self.load_organizations()
                 
+                # Actualizar el índice de clones locales en segundo plano
+                self.start_clone_indexing()
+                
             else:
                 QMessageBox.critical(self, "❌ Error de Autenticación", 
                                    "Token inválido. Verifica tu Personal Access Token.")
@@ -996,11 +1035,14 @@ class GitHubWidget(QWidget):
         if not repo_data:
             self.selected_org_repo = None
             self.org_branches_btn.setEnabled(False)
+            self.org_local_btn.setEnabled(False)
             return
         
         # Almacenar repositorio seleccionado
         self.selected_org_repo = repo_data
         self.org_branches_btn.setEnabled(True)
+        local_path = self.clone_index.lookup(repo_data.get('full_name'))
+        self.org_local_btn.setEnabled(local_path is not None)
             
         # Mostrar detalles completos del repositorio
         details = f"""📂 {repo_data.get('name', 'N/A')} (🏢 {repo_data.get('organization', 'N/A')})
@@ -1018,7 +1060,8 @@ class GitHubWidget(QWidget):
 • 🔄 Actualizado: {repo_data.get('updated_at', 'N/A')[:10]}
 
 🔒 Privado: {'Sí' if repo_data.get('private', False) else 'No'}
-📋 Fork: {'Sí' if repo_data.get('fork', False) else 'No'}"""
+📋 Fork: {'Sí' if repo_data.get('fork', False) else 'No'}
+💻 Clon local: {local_path or 'No encontrado'}"""
 
         self.org_repo_details.setText(details)
     
@@ -1029,11 +1072,14 @@ class GitHubWidget(QWidget):
         if not repo_data:
             self.selected_user_repo = None
             self.user_branches_btn.setEnabled(False)
+            self.user_local_btn.setEnabled(False)
             return
         
         # Almacenar repositorio seleccionado
         self.selected_user_repo = repo_data
         self.user_branches_btn.setEnabled(True)
+        local_path = self.clone_index.lookup(repo_data.get('full_name'))
+        self.user_local_btn.setEnabled(local_path is not None)
             
         # Mostrar detalles completos del repositorio
         details = f"""📂 {repo_data.get('name', 'N/A')}
@@ -1051,7 +1097,8 @@ class GitHubWidget(QWidget):
 • 🔄 Actualizado: {repo_data.get('updated_at', 'N/A')[:10]}
 
 🔒 Privado: {'Sí' if repo_data.get('private', False) else 'No'}
-📋 Fork: {'Sí' if repo_data.get('fork', False) else 'No'}"""
+📋 Fork: {'Sí' if repo_data.get('fork', False) else 'No'}
+💻 Clon local: {local_path or 'No encontrado'}"""
 
         self.user_repo_details.setText(details)
     
@@ -1194,8 +1241,9 @@ class GitHubWidget(QWidget):
         repo_name = self.selected_user_repo.get('name')
         
         if repo_full_name and repo_name:
-            dialog = BranchManagerDialog(self.github_service, repo_full_name, repo_name, self)
-            dialog.exec()
+            self.branch_dialog = BranchManagerDialog(self.github_service, repo_full_name, repo_name, self)
+            self.branch_dialog.exec()
+            self.branch_dialog = None
     
     def show_org_repo_branches(self):
         """Muestra el diálogo de gestión de ramas para el repositorio de organización"""
@@ -1208,8 +1256,93 @@ class GitHubWidget(QWidget):
         repo_name = self.selected_org_repo.get('name')
         
         if repo_full_name and repo_name:
-            dialog = BranchManagerDialog(self.github_service, repo_full_name, repo_name, self)
-            dialog.exec()
+            self.branch_dialog = BranchManagerDialog(self.github_service, repo_full_name, repo_name, self)
+            self.branch_dialog.exec()
+            self.branch_dialog = None
+    
+    def get_clone_directories(self):
+        """Obtiene las carpetas configuradas donde buscar clones locales"""
+        directories = app_config.get("git_clone_dirs")
+        if directories:
+            return directories
+        # Por defecto usar el workspace de Git local o el home del usuario
+        return [app_config.get("git_workspace_root") or "~"]
+    
+    def add_clone_directory(self):
+        """Agrega una carpeta de clones y vuelve a indexar"""
+        directory = QFileDialog.getExistingDirectory(self, "Seleccionar carpeta de clones")
+        if not directory:
+            return
+        
+        directories = list(app_config.get("git_clone_dirs") or [])
+        if directory not in directories:
+            directories.append(directory)
+            app_config.set("git_clone_dirs", directories)
+        
+        self.start_clone_indexing()
+    
+    def start_clone_indexing(self):
+        """Reconstruye el índice de clones locales en segundo plano"""
+        if self.clone_index_worker and self.clone_index_worker.isRunning():
+            return
+        
+        self.clone_index_worker = GitCloneIndexWorker(self.clone_index, self.get_clone_directories())
+        self.clone_index_worker.index_ready.connect(self.on_clone_index_ready)
+        self.clone_index_worker.error_occurred.connect(lambda error_msg: print(f"Error indexando clones: {error_msg}"))
+        self.clone_index_worker.start()
+    
+    def on_clone_index_ready(self, index):
+        """Aplica el índice nuevo y refresca los botones de la selección actual"""
+        self.clone_index.replace(index)
+        self.start_key_indexing()
+        
+        if self.selected_user_repo:
+            self.user_local_btn.setEnabled(self.clone_index.lookup(self.selected_user_repo.get('full_name')) is not None)
+        if self.selected_org_repo:
+            self.org_local_btn.setEnabled(self.clone_index.lookup(self.selected_org_repo.get('full_name')) is not None)
+    
+    def start_key_indexing(self):
+        """Indexa en segundo plano las claves de Jira del git log de los clones conocidos"""
+        if not self.clone_index.index or (self.key_index_worker and self.key_index_worker.isRunning()):
+            return
+        
+        self.key_index_worker = JiraGitIndexWorker(self.github_service.key_index, dict(self.clone_index.index))
+        self.key_index_worker.index_updated.connect(
+            lambda checked: print(f"Índice de claves de Jira: {checked} commits locales nuevos") if checked else None)
+        self.key_index_worker.error_occurred.connect(lambda error_msg: print(f"Error indexando commits locales: {error_msg}"))
+        self.key_index_worker.start()
+    
+    def show_local_changes(self, repo_data):
+        """Abre los cambios locales del clon asociado al repositorio"""
+        if not repo_data:
+            QMessageBox.warning(self, "⚠️ Sin Repositorio", 
+                              "Por favor selecciona un repositorio primero")
+            return
+        
+        local_path = self.clone_index.lookup(repo_data.get('full_name'))
+        if not local_path:
+            QMessageBox.information(self, "💻 Sin Clon Local", 
+                                  f"No se encontró un clon local de {repo_data.get('full_name')}.\n"
+                                  "Agrega la carpeta donde lo tienes con '📂 Agregar Carpeta de Clones'.")
+            return
+        
+        dialog = LocalChangesDialog(local_path, repo_data.get('full_name'), self)
+        dialog.exec()
+    
+    def apply_webhook_event(self, event, payload):
+        """Aplica un webhook de GitHub a la caché de ramas y refresca el diálogo abierto"""
+        try:
+            repo_full_name = self.github_service.apply_webhook_event(event, payload)
+        except Exception as e:
+            print(f"Error aplicando webhook de GitHub: {e}")
+            return
+        if not repo_full_name:
+            return
+        print(f"Webhook de GitHub aplicado: {event} {repo_full_name}")
+        
+        dialog = self.branch_dialog
+        if dialog and dialog.repo_full_name == repo_full_name and not dialog.active_workers:
+            dialog.load_branches()
     
     def logout(self):
         """Cierra la sesión de GitHub"""
@@ -1250,6 +1383,8 @@ class GitHubWidget(QWidget):
             self.user_repo_details.clear()
         if hasattr(self, 'user_branches_btn'):
             self.user_branches_btn.setEnabled(False)
+        if hasattr(self, 'user_local_btn'):
+            self.user_local_btn.setEnabled(False)
         if hasattr(self, 'org_combo'):
             self.org_combo.clear()
         if hasattr(self, 'org_repos_list'):
@@ -1258,6 +1393,8 @@ class GitHubWidget(QWidget):
             self.org_repo_details.clear()
         if hasattr(self, 'org_branches_btn'):
             self.org_branches_btn.setEnabled(False)
+        if hasattr(self, 'org_local_btn'):
+            self.org_local_btn.setEnabled(False)
         
         QMessageBox.information(self, "🚪 Sesión Cerrada", 
                               "Has cerrado sesión de GitHub exitosamente.")
@@ -1279,6 +1416,12 @@ class GitHubWidget(QWidget):
         if hasattr(self, 'org_repos_worker') and self.org_repos_worker:
             threads_to_cleanup.append(self.org_repos_worker)
         
+        if hasattr(self, 'clone_index_worker') and self.clone_index_worker:
+            threads_to_cleanup.append(self.clone_index_worker)
+        
+        if hasattr(self, 'key_index_worker') and self.key_index_worker:
+            threads_to_cleanup.append(self.key_index_worker)
+        
         # Cerrar todos los threads
         for thread in threads_to_cleanup:
             if thread and thread.isRunning():
@@ -1286,6 +1429,9 @@ class GitHubWidget(QWidget):
                 if not thread.wait(3000):  # Esperar máximo 3 segundos
                     thread.terminate()
                     thread.wait()
+        
+        # Guardar los cambios del índice de claves que esperaban su guardado agrupado
+        self.github_service.key_index.flush()
     
     def closeEvent(self, event):
         """Maneja el evento de cierre del widget"""
@@ -0,0 +1,259 @@
+"""
+Diálogo para generar los reportes QA de todo un sprint o una JQL
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                           QPushButton, QComboBox, QLineEdit, QTextEdit,
+                           QMessageBox, QProgressBar, QCheckBox, QFileDialog)
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QFont
+from styles import ThemeManager
+from qa_batch_reports import QABatchReportPipeline
+
+class BatchReportWorker(QThread):
+    """Worker para ejecutar el lote de reportes en background"""
+    report_processed = pyqtSignal(str, bool, str, int, int)  # issue_key, éxito, mensaje, listos, total (-1 si no se conoce)
+    batch_completed = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, pipeline, jql, restart=False):
+        super().__init__()
+        self.pipeline = pipeline
+        self.jql = jql
+        self.restart = restart
+        self._stop_requested = False
+    
+    def stop(self):
+        """Deja de tomar issues; los que están en curso terminan y quedan en el checkpoint"""
+        self._stop_requested = True
+    
+    def run(self):
+        try:
+            summary = self.pipeline.run(
+                self.jql, restart=self.restart,
+                on_progress=lambda key, success, message, done, total: self.report_processed.emit(
+                    key, success, message, done, total if total is not None else -1),
+                should_stop=lambda: self._stop_requested
+            )
+            self.batch_completed.emit(summary)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+class JiraBatchReportDialog(QDialog):
+    """Diálogo para generar, guardar y enviar los reportes QA de un sprint"""
+    
+    MODE_SPRINT = "🏃 Sprint (id o nombre; vacío = sprints abiertos)"
+    MODE_JQL = "🔎 JQL"
+    
+    def __init__(self, parent, jira_service, output_dir, max_workers=QABatchReportPipeline.DEFAULT_MAX_WORKERS,
+                 role_fields=None, checkpoint_dir=QABatchReportPipeline.CHECKPOINT_DIR,
+                 slack_sender=None, slack_destination=""):
+        super().__init__(parent)
+        self.jira_service = jira_service
+        self.max_workers = max_workers
+        self.role_fields = role_fields
+        self.checkpoint_dir = checkpoint_dir
+        self.slack_sender = slack_sender
+        self.slack_destination = slack_destination
+        self.worker = None
+        
+        self.setWindowTitle("📦 Reportes QA del Sprint")
+        self.setModal(True)
+        self.resize(620, 560)
+        self.setup_ui(output_dir)
+    
+    def setup_ui(self, output_dir):
+        """Configura la interfaz del diálogo"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+        layout.setContentsMargins(20, 20, 20, 20)
+        
+        # Aplicar estilos
+        self.setStyleSheet(ThemeManager.get_theme_class().get_main_stylesheet())
+        
+        info_label = QLabel("📋 Genera un reporte QA por cada issue del sprint o la búsqueda")
+        info_label.setFont(QFont("Arial", 11, QFont.Weight.Bold))
+        info_label.setWordWrap(True)
+        info_label.setStyleSheet("color: #f8f8f2; background-color: #44475a; padding: 10px; border-radius: 6px;")
+        layout.addWidget(info_label)
+        
+        # Origen de los issues
+        self.mode_combo = QComboBox()
+        self.mode_combo.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.mode_combo.addItem(self.MODE_SPRINT)
+        self.mode_combo.addItem(self.MODE_JQL)
+        self.mode_combo.currentTextChanged.connect(self.on_mode_changed)
+        layout.addWidget(self.mode_combo)
+        
+        self.query_input = QLineEdit()
+        self.query_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.query_input.setPlaceholderText("Ej: 42 o Sprint 12")
+        layout.addWidget(self.query_input)
+        
+        # Carpeta de salida
+        output_layout = QHBoxLayout()
+        self.output_input = QLineEdit(output_dir)
+        self.output_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        output_layout.addWidget(self.output_input)
+        
+        browse_btn = QPushButton("📁")
+        browse_btn.setToolTip("Elegir carpeta de salida")
+        browse_btn.clicked.connect(self.browse_output_dir)
+        browse_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        output_layout.addWidget(browse_btn)
+        layout.addLayout(output_layout)
+        
+        # Envío a Slack y reinicio del lote
+        self.slack_check = QCheckBox(f"📤 Enviar cada reporte a Slack ({self.slack_destination or 'sin destino'})")
+        self.slack_check.setEnabled(self.slack_sender is not None)
+        layout.addWidget(self.slack_check)
+        
+        self.restart_check = QCheckBox("♻️ Ignorar el avance guardado y generar todo de nuevo")
+        layout.addWidget(self.restart_check)
+        
+        # Progreso y resultado por issue
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        self.results_text = QTextEdit()
+        self.results_text.setReadOnly(True)
+        self.results_text.setStyleSheet(ThemeManager.get_theme_class().get_textedit_style())
+        self.results_text.setPlaceholderText("Aquí aparecerá el resultado de cada issue...")
+        layout.addWidget(self.results_text)
+        
+        # Botones
+        buttons_layout = QHBoxLayout()
+        
+        self.start_btn = QPushButton("🚀 Generar Reportes")
+        self.start_btn.clicked.connect(self.start_batch)
+        self.start_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(self.start_btn)
+        
+        self.cancel_btn = QPushButton("❌ Cancelar")
+        self.cancel_btn.clicked.connect(self.reject)
+        self.cancel_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(self.cancel_btn)
+        
+        layout.addLayout(buttons_layout)
+    
+    def on_mode_changed(self, mode):
+        """Ajusta el ejemplo del campo según el origen"""
+        if mode == self.MODE_JQL:
+            self.query_input.setPlaceholderText("Ej: project = PROJ AND sprint in openSprints()")
+        else:
+            self.query_input.setPlaceholderText("Ej: 42 o Sprint 12")
+    
+    def browse_output_dir(self):
+        """Elige la carpeta donde se guardan los reportes"""
+        directory = QFileDialog.getExistingDirectory(self, "Carpeta de reportes", self.output_input.text())
+        if directory:
+            self.output_input.setText(directory)
+    
+    def get_jql(self):
+        """JQL del lote según el origen elegido"""
+        text = self.query_input.text().strip()
+        if self.mode_combo.currentText() == self.MODE_JQL:
+            return text
+        return QABatchReportPipeline.sprint_jql(text)
+    
+    def start_batch(self):
+        """Lanza el lote, reanudando si hay avance guardado de la misma búsqueda"""
+        jql = self.get_jql()
+        output_dir = self.output_input.text().strip()
+        if not jql:
+            QMessageBox.warning(self, "⚠️ Advertencia", "Escribe la JQL del lote")
+            return
+        if not output_dir:
+            QMessageBox.warning(self, "⚠️ Advertencia", "Elige la carpeta de salida")
+            return
+        
+        pipeline = QABatchReportPipeline(
+            self.jira_service, output_dir, self.max_workers, self.role_fields,
+            slack_sender=self.slack_sender if self.slack_check.isChecked() else None,
+            checkpoint_dir=self.checkpoint_dir
+        )
+        restart = self.restart_check.isChecked()
+        self.results_text.clear()
+        if not restart:
+            checkpoint = pipeline.load_checkpoint(jql)
+            if checkpoint.done:
+                self.results_text.append(f"⏩ Reanudando: {len(checkpoint.done)} reportes ya generados")
+        
+        # Deshabilitar controles y mostrar progreso
+        self.start_btn.setEnabled(False)
+        self.mode_combo.setEnabled(False)
+        self.query_input.setEnabled(False)
+        self.output_input.setEnabled(False)
+        self.slack_check.setEnabled(False)
+        self.restart_check.setEnabled(False)
+        self.cancel_btn.setText("⏹️ Detener")
+        self.cancel_btn.clicked.disconnect()
+        self.cancel_btn.clicked.connect(self.stop_batch)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.results_text.append(f"🔎 {jql}")
+        
+        self.worker = BatchReportWorker(pipeline, jql, restart)
+        self.worker.report_processed.connect(self.on_report_processed)
+        self.worker.batch_completed.connect(self.on_batch_completed)
+        self.worker.error_occurred.connect(self.on_batch_error)
+        self.worker.start()
+    
+    def reject(self):
+        """Cerrar durante el lote lo detiene en lugar de abandonar el worker"""
+        if self.worker and self.worker.isRunning():
+            self.stop_batch()
+            return
+        super().reject()
+    
+    def stop_batch(self):
+        """Detiene el lote; el avance queda guardado para reanudarlo"""
+        if self.worker:
+            self.worker.stop()
+        self.cancel_btn.setEnabled(False)
+        self.results_text.append("⏹️ Deteniendo: se terminan los issues en curso...")
+    
+    def on_report_processed(self, issue_key, success, message, done, total):
+        """Muestra el resultado de un issue y el avance del lote"""
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(min(done, total))
+        if success:
+            self.results_text.append(f"✅ {issue_key}" + (f" ⚠️ {message}" if message else ""))
+        else:
+            self.results_text.append(f"❌ {issue_key}: {message}")
+    
+    def finish_batch(self):
+        """Deja el diálogo listo para cerrarse"""
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setText("✅ Cerrar")
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.clicked.disconnect()
+        self.cancel_btn.clicked.connect(self.accept)
+    
+    def on_batch_completed(self, summary):
+        """Muestra el resumen final del lote"""
+        self.finish_batch()
+        
+        failed = summary['failed']
+        text = f"✅ Generados: {summary['generated']}\n⏩ Ya generados: {summary['skipped']}\n❌ Fallidos: {len(failed)}"
+        if self.slack_check.isChecked():
+            text += f"\n📤 Enviados a Slack: {summary['sent']}"
+        if summary['stopped']:
+            text += "\n⏹️ Lote detenido: vuelve a ejecutarlo para continuar"
+        text += f"\n\n📁 {summary['output_dir']}"
+        if failed:
+            text += "\n\n" + "\n".join(f"• {key}: {error}" for key, error in list(failed.items())[:10])
+            if len(failed) > 10:
+                text += f"\n... y {len(failed) - 10} más"
+            QMessageBox.warning(self, "📦 Resumen del Lote", text)
+        else:
+            QMessageBox.information(self, "📦 Resumen del Lote", text)
+    
+    def on_batch_error(self, message):
+        """El lote se cortó; lo hecho hasta ahora queda en el checkpoint"""
+        self.finish_batch()
+        self.results_text.append(f"❌ {message}")
+        QMessageBox.warning(self, "📦 Lote interrumpido",
+                            f"❌ {message}\n\nVuelve a ejecutarlo para continuar desde donde quedó.")
@@ -0,0 +1,283 @@
+"""
+Diálogo para cambiar el estado o comentar varios issues de Jira a la vez
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                           QPushButton, QComboBox, QTextEdit, QMessageBox,
+                           QProgressBar)
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QFont
+from styles import ThemeManager
+
+class BulkTransitionsLoadWorker(QThread):
+    """Worker para cargar los estados destino de los workflows de los issues"""
+    statuses_loaded = pyqtSignal(list)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, jira_service, issues):
+        super().__init__()
+        self.jira_service = jira_service
+        self.issues = issues
+    
+    def run(self):
+        try:
+            # Un issue por workflow basta; el resto comparte sus transiciones
+            statuses = set()
+            seen_workflows = set()
+            for issue in self.issues:
+                workflow_key = self.jira_service.get_workflow_key(issue) or issue['key']
+                if workflow_key in seen_workflows:
+                    continue
+                seen_workflows.add(workflow_key)
+                transitions = self.jira_service.get_issue_transitions(issue['key'], issue)
+                statuses.update(transition['to_status'] for transition in transitions)
+            self.statuses_loaded.emit(sorted(statuses))
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+class BulkOperationWorker(QThread):
+    """Worker para ejecutar una operación masiva en background"""
+    issue_processed = pyqtSignal(str, bool, str)  # issue_key, éxito, error
+    bulk_completed = pyqtSignal(list)  # resultados de todos los issues
+    
+    def __init__(self, jira_service, issues, comment, target_status=None):
+        super().__init__()
+        self.jira_service = jira_service
+        self.issues = issues
+        self.comment = comment
+        self.target_status = target_status
+        self._stop_requested = False
+    
+    def stop(self):
+        """Detiene la operación sin esperar a los issues pendientes"""
+        self._stop_requested = True
+    
+    def run(self):
+        results = []
+        try:
+            if self.target_status:
+                bulk_results = self.jira_service.bulk_transition_issues(
+                    self.issues, self.target_status, self.comment or None,
+                    should_stop=lambda: self._stop_requested
+                )
+            else:
+                bulk_results = self.jira_service.bulk_add_comment(
+                    [issue['key'] for issue in self.issues], self.comment,
+                    should_stop=lambda: self._stop_requested
+                )
+            for result in bulk_results:
+                results.append(result)
+                self.issue_processed.emit(result['key'], result['success'], result['error'] or "")
+        except Exception as e:
+            results.append({'key': '', 'success': False, 'error': str(e)})
+        self.bulk_completed.emit(results)
+
+class JiraBulkDialog(QDialog):
+    """Diálogo para transicionar o comentar varios issues"""
+    
+    issues_updated = pyqtSignal(list, str)  # claves actualizadas, nuevo estado ('' si solo se comentó)
+    
+    MODE_TRANSITION = "🔄 Cambiar estado (y comentar)"
+    MODE_COMMENT = "💬 Solo comentar"
+    
+    def __init__(self, parent, jira_service, issues):
+        super().__init__(parent)
+        self.jira_service = jira_service
+        self.issues = issues
+        self.worker = None
+        self.load_worker = None
+        self.processed = 0
+        
+        self.setWindowTitle(f"📦 Acción Masiva - {len(issues)} issues")
+        self.setModal(True)
+        self.resize(560, 520)
+        self.setup_ui()
+        self.load_statuses()
+    
+    def setup_ui(self):
+        """Configura la interfaz del diálogo"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+        layout.setContentsMargins(20, 20, 20, 20)
+        
+        # Aplicar estilos
+        self.setStyleSheet(ThemeManager.get_theme_class().get_main_stylesheet())
+        
+        # Issues seleccionados
+        keys = ", ".join(issue['key'] for issue in self.issues)
+        info_label = QLabel(f"📋 {len(self.issues)} issues seleccionados: {keys}")
+        info_label.setFont(QFont("Arial", 11, QFont.Weight.Bold))
+        info_label.setWordWrap(True)
+        info_label.setStyleSheet("color: #f8f8f2; background-color: #44475a; padding: 10px; border-radius: 6px;")
+        layout.addWidget(info_label)
+        
+        # Tipo de operación
+        self.mode_combo = QComboBox()
+        self.mode_combo.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.mode_combo.addItem(self.MODE_TRANSITION)
+        self.mode_combo.addItem(self.MODE_COMMENT)
+        self.mode_combo.currentTextChanged.connect(self.on_mode_changed)
+        layout.addWidget(self.mode_combo)
+        
+        # Estado destino (editable: los workflows pueden ofrecer estados distintos)
+        self.status_label = QLabel("🎯 Cambiar a:")
+        self.status_label.setStyleSheet("color: #f8f8f2; font-weight: bold;")
+        layout.addWidget(self.status_label)
+        
+        self.status_combo = QComboBox()
+        self.status_combo.setEditable(True)
+        self.status_combo.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.status_combo.lineEdit().setPlaceholderText("🔄 Cargando estados disponibles...")
+        layout.addWidget(self.status_combo)
+        
+        # Comentario
+        comment_label = QLabel("💬 Comentario:")
+        comment_label.setStyleSheet("color: #f8f8f2; font-weight: bold;")
+        layout.addWidget(comment_label)
+        
+        self.comment_text = QTextEdit()
+        self.comment_text.setMaximumHeight(90)
+        self.comment_text.setPlaceholderText("Comentario que se agregará a cada issue...")
+        self.comment_text.setStyleSheet(ThemeManager.get_theme_class().get_textedit_style())
+        layout.addWidget(self.comment_text)
+        
+        # Progreso y resultado por issue
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, len(self.issues))
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        self.results_text = QTextEdit()
+        self.results_text.setReadOnly(True)
+        self.results_text.setStyleSheet(ThemeManager.get_theme_class().get_textedit_style())
+        self.results_text.setPlaceholderText("Aquí aparecerá el resultado de cada issue...")
+        layout.addWidget(self.results_text)
+        
+        # Botones
+        buttons_layout = QHBoxLayout()
+        
+        self.apply_btn = QPushButton("📦 Aplicar")
+        self.apply_btn.clicked.connect(self.apply_bulk_operation)
+        self.apply_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(self.apply_btn)
+        
+        self.cancel_btn = QPushButton("❌ Cancelar")
+        self.cancel_btn.clicked.connect(self.reject)
+        self.cancel_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(self.cancel_btn)
+        
+        layout.addLayout(buttons_layout)
+    
+    def load_statuses(self):
+        """Carga los estados a los que pueden pasar los issues sin bloquear la UI"""
+        self.load_worker = BulkTransitionsLoadWorker(self.jira_service, self.issues)
+        self.load_worker.statuses_loaded.connect(self.on_statuses_loaded)
+        self.load_worker.error_occurred.connect(self.on_statuses_error)
+        self.load_worker.start()
+    
+    def on_statuses_loaded(self, statuses):
+        """Muestra los estados destino disponibles"""
+        self.status_combo.clear()
+        self.status_combo.addItems(statuses)
+        self.status_combo.lineEdit().setPlaceholderText("Escribe o selecciona el estado destino...")
+    
+    def on_statuses_error(self, message):
+        """Permite escribir el estado a mano si no se pudieron cargar"""
+        self.status_combo.lineEdit().setPlaceholderText(f"❌ {message}")
+    
+    def on_mode_changed(self, mode):
+        """Muestra el estado destino solo al transicionar"""
+        is_transition = mode == self.MODE_TRANSITION
+        self.status_label.setVisible(is_transition)
+        self.status_combo.setVisible(is_transition)
+    
+    def apply_bulk_operation(self):
+        """Lanza la operación masiva"""
+        is_transition = self.mode_combo.currentText() == self.MODE_TRANSITION
+        target_status = self.status_combo.currentText().strip() if is_transition else None
+        comment = self.comment_text.toPlainText().strip()
+        
+        if is_transition and not target_status:
+            QMessageBox.warning(self, "⚠️ Advertencia", "Selecciona el estado destino")
+            return
+        if not is_transition and not comment:
+            QMessageBox.warning(self, "⚠️ Advertencia", "Escribe el comentario a agregar")
+            return
+        
+        action = f"cambiar a '{target_status}'" if is_transition else "comentar"
+        reply = QMessageBox.question(
+            self,
+            "Confirmar Acción Masiva",
+            f"¿Estás seguro de {action} {len(self.issues)} issues?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        # Deshabilitar controles y mostrar progreso
+        self.apply_btn.setEnabled(False)
+        self.mode_combo.setEnabled(False)
+        self.status_combo.setEnabled(False)
+        self.comment_text.setEnabled(False)
+        self.cancel_btn.setText("⏹️ Detener")
+        self.cancel_btn.clicked.disconnect()
+        self.cancel_btn.clicked.connect(self.stop_bulk_operation)
+        self.processed = 0
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.results_text.clear()
+        
+        self.worker = BulkOperationWorker(self.jira_service, self.issues, comment, target_status)
+        self.worker.issue_processed.connect(self.on_issue_processed)
+        self.worker.bulk_completed.connect(self.on_bulk_completed)
+        self.worker.start()
+    
+    def reject(self):
+        """Cerrar durante la operación la detiene en lugar de abandonar el worker"""
+        if self.worker and self.worker.isRunning():
+            self.stop_bulk_operation()
+            return
+        super().reject()
+    
+    def stop_bulk_operation(self):
+        """Detiene la operación; los issues en curso terminan igual"""
+        if self.worker:
+            self.worker.stop()
+        self.cancel_btn.setEnabled(False)
+        self.results_text.append("⏹️ Deteniendo: no se procesarán más issues...")
+    
+    def on_issue_processed(self, issue_key, success, error):
+        """Muestra el resultado de un issue"""
+        self.processed += 1
+        self.progress_bar.setValue(self.processed)
+        if success:
+            self.results_text.append(f"✅ {issue_key}")
+        else:
+            self.results_text.append(f"❌ {issue_key}: {error}")
+    
+    def on_bulk_completed(self, results):
+        """Muestra el resumen final de la operación"""
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setText("✅ Cerrar")
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.clicked.disconnect()
+        self.cancel_btn.clicked.connect(self.accept)
+        
+        succeeded = [result['key'] for result in results if result['success']]
+        failed = [result for result in results if not result['success']]
+        skipped = len(self.issues) - len(succeeded) - len([result for result in failed if result['key']])
+        
+        if succeeded:
+            target_status = self.worker.target_status or ""
+            self.issues_updated.emit(succeeded, target_status)
+        
+        summary = f"✅ Exitosos: {len(succeeded)}\n❌ Fallidos: {len(failed)}"
+        if skipped > 0:
+            summary += f"\n⏹️ Sin procesar: {skipped}"
+        if failed:
+            summary += "\n\n" + "\n".join(f"• {result['key'] or 'General'}: {result['error']}" for result in failed[:10])
+            if len(failed) > 10:
+                summary += f"\n... y {len(failed) - 10} más"
+            QMessageBox.warning(self, "📦 Resumen de la Acción Masiva", summary)
+        else:
+            QMessageBox.information(self, "📦 Resumen de la Acción Masiva", summary)
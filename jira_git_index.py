@@ -0,0 +1,275 @@
+"""
+Índice invertido de claves de Jira -> ramas y commits que las mencionan
+Se alimenta con datos que la app ya tiene (ramas y commits pedidos a GitHub,
+webhooks de push y el git log de los clones locales), así buscar una clave no
+hace peticiones y actualizarlo no pide nada nuevo a la API.
+"""
+
+import os
+import re
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from PyQt6.QtCore import QThread, pyqtSignal
+from github_commit_service import GitCommitService
+
+# Clave de Jira: proyecto en mayúsculas, guion y número (PROJ-123)
+JIRA_KEY_PATTERN = re.compile(r'(?<![A-Z0-9])([A-Z][A-Z0-9]+-\d+)(?!\d)')
+
+
+def extract_jira_keys(text: str, ignore_case: bool = False) -> Set[str]:
+    """Claves de Jira mencionadas en un texto (en nombres de rama suelen ir en minúsculas)"""
+    if not text:
+        return set()
+    return set(JIRA_KEY_PATTERN.findall(text.upper() if ignore_case else text))
+
+
+class JiraGitIndex:
+    """
+    Índice persistente de clave de Jira -> ramas y commits
+    
+    Cada referencia (rama o commit) guarda sus claves; en memoria se arma el
+    índice invertido clave -> referencias, por eso lookup() es un acceso a
+    diccionario. Las ramas de un repositorio se reemplazan con cada lista nueva
+    y el git log local se recorre solo desde el último HEAD indexado. Los
+    cambios se guardan en disco agrupados con save_later().
+    """
+    
+    SAVE_DELAY = 5  # Segundos que se esperan para juntar cambios antes de guardar
+    
+    def __init__(self, index_file: Path = None):
+        self.index_file = index_file or Path.home() / ".qa_generator" / "jira_git_index.json"
+        self.refs: Dict[str, Dict] = {}            # Id de referencia -> datos y claves
+        self.postings: Dict[str, Set[str]] = {}    # Clave de Jira -> ids de referencias
+        self.branch_refs: Dict[str, Set[str]] = {}  # Repositorio -> ids de sus ramas
+        self.local_heads: Dict[str, str] = {}      # Ruta del clon -> último HEAD indexado
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()  # Una sola escritura del archivo a la vez
+        self._save_timer: Optional[threading.Timer] = None
+        self._changes = 0        # Se incrementa con cada cambio en las referencias
+        self._saved_changes = 0  # Valor de _changes en el último guardado
+        self.load()
+    
+    def load(self):
+        """Carga las referencias desde disco y rearma el índice invertido"""
+        try:
+            if self.index_file.exists():
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                with self._lock:
+                    self.local_heads = data.get('local_heads', {})
+                    for ref_id, ref in data.get('refs', {}).items():
+                        self._add_ref(ref_id, ref, ref.get('keys', []))
+                    self._saved_changes = self._changes
+        except Exception as e:
+            print(f"Error cargando índice de claves de Jira: {e}")
+            self.refs, self.postings, self.branch_refs, self.local_heads = {}, {}, {}, {}
+    
+    def save(self):
+        """Guarda las referencias en disco (escritura atómica) si cambiaron desde el último guardado"""
+        with self._save_lock:
+            try:
+                with self._lock:
+                    if self._save_timer:
+                        self._save_timer.cancel()
+                        self._save_timer = None
+                    if self._changes == self._saved_changes:
+                        return
+                    changes = self._changes
+                    data = json.dumps({'refs': self.refs, 'local_heads': self.local_heads}, ensure_ascii=False)
+                self.index_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.index_file.with_suffix('.tmp')
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(temp_path, self.index_file)
+                self._saved_changes = changes
+            except Exception as e:
+                print(f"Error guardando índice de claves de Jira: {e}")
+    
+    def save_later(self):
+        """Programa un guardado en SAVE_DELAY segundos; los cambios de ese lapso se guardan juntos"""
+        with self._lock:
+            if self._save_timer or self._changes == self._saved_changes:
+                return
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def flush(self):
+        """Guarda ya los cambios pendientes (al cerrar la app)"""
+        self.save()
+    
+    def _add_ref(self, ref_id: str, ref: Dict, keys: Iterable[str]):
+        """Agrega o reemplaza una referencia (con el lock tomado); sin claves no se guarda"""
+        keys = sorted(set(keys))
+        if keys:
+            ref['keys'] = keys
+            if self.refs.get(ref_id) == ref:
+                return  # Sin cambios: no hay nada que guardar
+        self._remove_ref(ref_id)
+        if not keys:
+            return
+        self.refs[ref_id] = ref
+        self._changes += 1
+        for key in keys:
+            self.postings.setdefault(key, set()).add(ref_id)
+        if ref['type'] == 'branch':
+            self.branch_refs.setdefault(ref['repo'], set()).add(ref_id)
+    
+    def _remove_ref(self, ref_id: str):
+        """Quita una referencia y sus entradas del índice (con el lock tomado)"""
+        ref = self.refs.pop(ref_id, None)
+        if ref is None:
+            return
+        self._changes += 1
+        for key in ref.get('keys', []):
+            ids = self.postings.get(key)
+            if ids is not None:
+                ids.discard(ref_id)
+                if not ids:
+                    del self.postings[key]
+        if ref['type'] == 'branch':
+            self.branch_refs.get(ref['repo'], set()).discard(ref_id)
+    
+    def _add_commit(self, repo: str, sha: str, message: str, url: str = None, date: str = None,
+                    source: str = 'github'):
+        """Indexa un commit; el mismo sha de GitHub y del clon local es una sola referencia"""
+        if not sha:
+            return
+        # El índice de clones guarda el full_name en minúsculas
+        ref_id = f"commit:{repo.lower()}:{sha}"
+        current = self.refs.get(ref_id)
+        if current and source == 'local':
+            return  # Ya indexado con los datos de GitHub
+        keys = extract_jira_keys(message)
+        if keys:
+            self._add_ref(ref_id, {
+                'type': 'commit',
+                'repo': repo,
+                'sha': sha,
+                'message': (message or '').split('\n')[0][:200],
+                'url': url or (f"https://github.com/{repo}/commit/{sha}" if '/' in repo and source == 'github' else None),
+                'date': date or (current or {}).get('date') or '',
+                'source': source
+            }, keys)
+    
+    def index_branch(self, repo_full_name: str, branch: Dict) -> Optional[str]:
+        """Indexa una rama y su último commit; devuelve el id de la rama"""
+        name = branch.get('name')
+        if not name:
+            return None
+        ref_id = f"branch:{repo_full_name}:{name}"
+        date = branch.get('last_commit_date') if branch.get('last_commit_date') != "N/A" else ''
+        with self._lock:
+            self._add_ref(ref_id, {
+                'type': 'branch',
+                'repo': repo_full_name,
+                'name': name,
+                'sha': branch.get('sha', ''),
+                'url': f"https://github.com/{repo_full_name}/tree/{name}",
+                'date': date
+            }, extract_jira_keys(name, ignore_case=True))
+            self._add_commit(repo_full_name, branch.get('sha'), branch.get('last_commit_message'), date=date)
+        return ref_id
+    
+    def index_branches(self, repo_full_name: str, branches: List[Dict]):
+        """Reemplaza las ramas indexadas de un repositorio con su lista actual"""
+        with self._lock:
+            present = {self.index_branch(repo_full_name, branch) for branch in branches}
+            for ref_id in self.branch_refs.get(repo_full_name, set()) - present:
+                self._remove_ref(ref_id)
+    
+    def remove_branch(self, repo_full_name: str, branch_name: str):
+        """Quita una rama borrada"""
+        with self._lock:
+            self._remove_ref(f"branch:{repo_full_name}:{branch_name}")
+    
+    def index_commits(self, repo_full_name: str, commits: List[Dict]):
+        """Indexa commits con sha, message y opcionalmente html_url y date"""
+        with self._lock:
+            for commit in commits:
+                self._add_commit(repo_full_name, commit.get('sha'), commit.get('message'),
+                                 commit.get('html_url'), commit.get('date'))
+    
+    def update_local_repository(self, repo_path: str, full_name: str = None) -> int:
+        """
+        Indexa los commits nuevos del clon local desde el último HEAD indexado
+        
+        Si el historial se reescribió (rebase, reset) se recorre completo.
+        
+        Returns:
+            int: Commits revisados
+        """
+        git_service = GitCommitService()
+        if not git_service.set_repository_path(repo_path):
+            return 0
+        head = git_service.get_head_sha()
+        with self._lock:
+            last_head = self.local_heads.get(repo_path)
+        if not head or head == last_head:
+            return 0
+        
+        repo = full_name or repo_path
+        try:
+            commits = list(git_service.iter_log(revision=f"{last_head}..{head}" if last_head else head))
+        except Exception:
+            if not last_head:
+                raise
+            commits = list(git_service.iter_log(revision=head))
+        
+        with self._lock:
+            for commit in commits:
+                date = datetime.fromtimestamp(commit['author_time'], timezone.utc).isoformat()
+                self._add_commit(repo, commit['sha'], commit['subject'], date=date, source='local')
+            self.local_heads[repo_path] = head
+            self._changes += 1
+        return len(commits)
+    
+    def lookup(self, issue_key: str) -> Dict[str, List[Dict]]:
+        """
+        Ramas y commits que mencionan una clave
+        
+        Returns:
+            Dict[str, List[Dict]]: branches y commits (los más recientes primero)
+        """
+        with self._lock:
+            refs = [dict(self.refs[ref_id]) for ref_id in self.postings.get(issue_key.upper(), ())]
+        refs.sort(key=lambda ref: ref.get('date') or '', reverse=True)
+        return {
+            'branches': [ref for ref in refs if ref['type'] == 'branch'],
+            'commits': [ref for ref in refs if ref['type'] == 'commit']
+        }
+    
+    def key_count(self) -> int:
+        """Cantidad de claves indexadas"""
+        return len(self.postings)
+
+
+class JiraGitIndexWorker(QThread):
+    """Worker para indexar el git log de los clones locales sin bloquear la UI"""
+    
+    index_updated = pyqtSignal(int)    # Commits nuevos revisados
+    error_occurred = pyqtSignal(str)   # Señal cuando ocurre un error
+    
+    def __init__(self, key_index: JiraGitIndex, repositories: Dict[str, List[str]]):
+        super().__init__()
+        self.key_index = key_index
+        self.repositories = repositories  # full_name -> rutas locales (índice de clones)
+    
+    def run(self):
+        """Recorre cada clon desde su último HEAD indexado"""
+        checked = 0
+        errors = []
+        for full_name, paths in self.repositories.items():
+            for path in paths:
+                try:
+                    checked += self.key_index.update_local_repository(path, full_name)
+                except Exception as e:
+                    errors.append(f"{path}: {e}")
+        if checked:
+            self.key_index.save_later()
+        if errors:
+            self.error_occurred.emit("; ".join(errors))
+        self.index_updated.emit(checked)
@@ -0,0 +1,447 @@
+"""
+Modelos Qt para las listas de issues de Jira
+Mantienen índices por clave y por campo para filtrar y actualizar sin recorrer la lista
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Optional, Tuple
+from PyQt6.QtCore import Qt, QAbstractListModel, QAbstractProxyModel, QModelIndex
+
+
+class JiraIssueListModel(QAbstractListModel):
+    """
+    Lista de issues con índice por clave y por faceta (estado, prioridad, tipo, proyecto)
+    
+    Puede mostrar una fila de estado al final ("🔄 Cargando...", "📭 Sin resultados")
+    que no tiene datos de issue.
+    """
+    
+    ISSUE_ROLE = Qt.ItemDataRole.UserRole
+    FACET_FIELDS = ('status', 'priority', 'issue_type', 'project')
+    
+    def __init__(self, formatter: Callable = None, parent=None):
+        super().__init__(parent)
+        self.formatter = formatter or (lambda issue: f"{issue.get('key')} - {issue.get('summary')}")
+        self._issues = []
+        self._rows = {}          # Clave del issue -> fila
+        self._row_facets = []    # Fila -> valores de faceta indexados (el issue puede mutar afuera)
+        self._facets = {field: {} for field in self.FACET_FIELDS}  # Campo -> valor -> filas
+        self._placeholder = None
+    
+    # --- Interfaz de QAbstractListModel ---
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._issues) + (1 if self._placeholder else 0)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if row >= len(self._issues):
+            return self._placeholder if role == Qt.ItemDataRole.DisplayRole else None
+        
+        issue = self._issues[row]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.formatter(issue)
+        if role == self.ISSUE_ROLE:
+            return issue
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return issue.get('summary')
+        return None
+    
+    # --- Carga de datos ---
+    
+    def set_issues(self, issues: List, placeholder: str = None):
+        """Reemplaza todos los issues (y la fila de estado)"""
+        self.beginResetModel()
+        self._issues = []
+        self._rows = {}
+        self._row_facets = []
+        self._facets = {field: {} for field in self.FACET_FIELDS}
+        self._placeholder = placeholder
+        for issue in issues:
+            if issue.get('key') not in self._rows:
+                self._index_issue(issue)
+        self.endResetModel()
+    
+    def clear(self, placeholder: str = None):
+        """Vacía la lista, opcionalmente mostrando una fila de estado"""
+        self.set_issues([], placeholder)
+    
+    def append_issues(self, issues: List) -> List:
+        """
+        Agrega issues al final, ignorando los que ya están
+        
+        Returns:
+            List: Issues efectivamente agregados
+        """
+        new_issues = []
+        seen = set()
+        for issue in issues:
+            key = issue.get('key')
+            if key not in self._rows and key not in seen:
+                seen.add(key)
+                new_issues.append(issue)
+        
+        # La fila de estado se quita con la llegada de datos
+        self.set_placeholder(None)
+        if not new_issues:
+            return new_issues
+        
+        first = len(self._issues)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_issues) - 1)
+        for issue in new_issues:
+            self._index_issue(issue)
+        self.endInsertRows()
+        return new_issues
+    
+    def set_placeholder(self, text: Optional[str]):
+        """Muestra, cambia o quita la fila de estado al final de la lista"""
+        row = len(self._issues)
+        if text == self._placeholder:
+            return
+        if self._placeholder and text:
+            self._placeholder = text
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+        elif text:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._placeholder = text
+            self.endInsertRows()
+        else:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._placeholder = None
+            self.endRemoveRows()
+    
+    def update_issue(self, issue_key: str, **changes) -> bool:
+        """
+        Modifica campos de un issue y emite un único dataChanged para su fila
+        
+        Returns:
+            bool: True si el issue está en la lista
+        """
+        row = self._rows.get(issue_key)
+        if row is None:
+            return False
+        
+        issue = self._issues[row]
+        for field, value in changes.items():
+            issue[field] = value
+        self._update_facets(row, issue)
+        
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+        return True
+    
+    def remove_issue(self, issue_key: str) -> bool:
+        """
+        Quita un issue de la lista
+        
+        Returns:
+            bool: True si el issue estaba en la lista
+        """
+        row = self._rows.get(issue_key)
+        if row is None:
+            return False
+        
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._issues[row]
+        self._reindex()
+        self.endRemoveRows()
+        return True
+    
+    def apply_diff(self, issues: List) -> Tuple[int, int, int]:
+        """
+        Reconcilia la lista con un resultado nuevo tocando solo las filas que cambiaron
+        
+        Compara por clave y por updated_at (y estado): quita las filas que ya no
+        están, reemplaza las modificadas en su lugar e inserta las nuevas junto al
+        issue que las precede en el resultado. Las filas sin cambios no se mueven,
+        así la vista conserva la selección y el scroll.
+        
+        Returns:
+            Tuple[int, int, int]: Issues agregados, actualizados y quitados
+        """
+        self.set_placeholder(None)
+        new_keys = [issue.get('key') for issue in issues]
+        new_key_set = set(new_keys)
+        
+        # Quitar de abajo hacia arriba por bloques contiguos
+        removed_rows = [row for row, issue in enumerate(self._issues) if issue.get('key') not in new_key_set]
+        for first, last in reversed(self._contiguous_blocks(removed_rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._issues[first:last + 1]
+            self._reindex()
+            self.endRemoveRows()
+        
+        # Reemplazar los modificados
+        updated = 0
+        for issue in issues:
+            row = self._rows.get(issue.get('key'))
+            if row is None:
+                continue
+            current = self._issues[row]
+            if (current.get('updated_at'), current.get('status')) != (issue.get('updated_at'), issue.get('status')):
+                self._issues[row] = issue
+                self._update_facets(row, issue)
+                index = self.index(row, 0)
+                self.dataChanged.emit(index, index)
+                updated += 1
+        
+        # Insertar los nuevos después del issue que los precede en el resultado
+        added = 0
+        previous_key = None
+        for key, issue in zip(new_keys, issues):
+            if key not in self._rows:
+                row = self._rows[previous_key] + 1 if previous_key is not None else 0
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._issues.insert(row, issue)
+                self._reindex()
+                self.endInsertRows()
+                added += 1
+            previous_key = key
+        
+        return added, updated, len(removed_rows)
+    
+    @staticmethod
+    def _contiguous_blocks(rows: List[int]) -> List[Tuple[int, int]]:
+        """Agrupa filas ordenadas en rangos (primera, última) contiguos"""
+        blocks = []
+        for row in rows:
+            if blocks and blocks[-1][1] == row - 1:
+                blocks[-1] = (blocks[-1][0], row)
+            else:
+                blocks.append((row, row))
+        return blocks
+    
+    def _update_facets(self, row: int, issue):
+        """Mueve una fila entre los índices de faceta según los valores actuales del issue"""
+        for field in self.FACET_FIELDS:
+            old_value = self._row_facets[row][field]
+            value = issue.get(field)
+            if old_value != value:
+                rows = self._facets[field].get(old_value)
+                if rows is not None:
+                    rows.discard(row)
+                    if not rows:
+                        del self._facets[field][old_value]
+                self._facets[field].setdefault(value, set()).add(row)
+                self._row_facets[row][field] = value
+    
+    def _reindex(self):
+        """Reconstruye los índices tras insertar o quitar filas en el medio"""
+        issues = self._issues
+        self._issues = []
+        self._rows = {}
+        self._row_facets = []
+        self._facets = {field: {} for field in self.FACET_FIELDS}
+        for issue in issues:
+            self._index_issue(issue)
+    
+    def _index_issue(self, issue):
+        """Agrega un issue al final actualizando los índices"""
+        row = len(self._issues)
+        self._issues.append(issue)
+        self._rows[issue.get('key')] = row
+        facets = {}
+        for field in self.FACET_FIELDS:
+            value = issue.get(field)
+            facets[field] = value
+            self._facets[field].setdefault(value, set()).add(row)
+        self._row_facets.append(facets)
+    
+    # --- Consultas ---
+    
+    def issues(self) -> List:
+        """Issues en el orden de la lista"""
+        return list(self._issues)
+    
+    def issue_count(self) -> int:
+        """Cantidad de issues (sin contar la fila de estado)"""
+        return len(self._issues)
+    
+    def has_placeholder(self) -> bool:
+        """Indica si se muestra la fila de estado"""
+        return self._placeholder is not None
+    
+    def row_of(self, issue_key: str) -> Optional[int]:
+        """Fila de un issue por su clave"""
+        return self._rows.get(issue_key)
+    
+    def facet_counts(self, field: str) -> Dict[str, int]:
+        """Cantidad de issues por valor de una faceta"""
+        return {value: len(rows) for value, rows in self._facets[field].items() if value}
+    
+    def rows_matching(self, filters: Dict[str, str]) -> List[int]:
+        """
+        Filas que cumplen todos los filtros, intersectando los índices de faceta
+        
+        Parte del conjunto más chico, así el costo depende de las coincidencias y
+        no del total de issues.
+        """
+        if not filters:
+            return list(range(len(self._issues)))
+        candidates = sorted((self._facets[field].get(value, set()) for field, value in filters.items()), key=len)
+        return sorted(candidates[0].intersection(*candidates[1:]))
+    
+    def row_matches(self, row: int, filters: Dict[str, str]) -> bool:
+        """Indica si una fila cumple los filtros"""
+        if row >= len(self._issues):
+            return True  # La fila de estado siempre se muestra
+        facets = self._row_facets[row]
+        return all(facets[field] == value for field, value in filters.items())
+
+
+class JiraIssueFilterProxyModel(QAbstractProxyModel):
+    """
+    Vista filtrada de un JiraIssueListModel
+    
+    Guarda solo las filas que coinciden; al cambiar los filtros las obtiene de los
+    índices del modelo y al actualizarse, agregarse o quitarse issues revisa
+    únicamente esas filas, sin reiniciar la vista.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filters = {}
+        self._source_rows = []   # Fila del proxy -> fila del modelo
+        self._proxy_rows = {}    # Fila del modelo -> fila del proxy
+        self._pending_removal = None  # Rango del proxy que el modelo está por quitar
+    
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(lambda: self.beginResetModel())
+        model.modelReset.connect(self._end_reset)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.dataChanged.connect(self._on_data_changed)
+        self._rebuild()
+        self.endResetModel()
+    
+    # --- Filtros ---
+    
+    def set_filter(self, field: str, value: Optional[str]):
+        """Filtra por un campo; None quita el filtro de ese campo"""
+        if value is None:
+            if field not in self._filters:
+                return
+            del self._filters[field]
+        else:
+            if self._filters.get(field) == value:
+                return
+            self._filters[field] = value
+        self.beginResetModel()
+        self._rebuild()
+        self.endResetModel()
+    
+    def filters(self) -> Dict[str, str]:
+        """Filtros activos"""
+        return dict(self._filters)
+    
+    def _rebuild(self):
+        """Recalcula las filas visibles desde los índices del modelo"""
+        model = self.sourceModel()
+        if model is None:
+            self._source_rows = []
+        else:
+            self._source_rows = model.rows_matching(self._filters)
+            if model.has_placeholder():
+                self._source_rows.append(model.issue_count())
+        self._update_proxy_rows()
+    
+    def _end_reset(self, *args):
+        self._rebuild()
+        self.endResetModel()
+    
+    def _on_rows_inserted(self, parent, first, last):
+        """Desplaza las filas posteriores e inserta en su lugar las nuevas que coinciden"""
+        model = self.sourceModel()
+        count = last - first + 1
+        start = bisect_left(self._source_rows, first)
+        for i in range(start, len(self._source_rows)):
+            self._source_rows[i] += count
+        
+        new_rows = [row for row in range(first, last + 1) if model.row_matches(row, self._filters)]
+        if new_rows:
+            self.beginInsertRows(QModelIndex(), start, start + len(new_rows) - 1)
+            self._source_rows[start:start] = new_rows
+            self._update_proxy_rows()
+            self.endInsertRows()
+        else:
+            self._update_proxy_rows()
+    
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        """Las filas del modelo en [first, last] son contiguas también en el proxy"""
+        start = bisect_left(self._source_rows, first)
+        end = bisect_right(self._source_rows, last)
+        self._pending_removal = (start, end)
+        if start < end:
+            self.beginRemoveRows(QModelIndex(), start, end - 1)
+    
+    def _on_rows_removed(self, parent, first, last):
+        """Quita las filas pendientes y desplaza las posteriores"""
+        start, end = self._pending_removal
+        self._pending_removal = None
+        count = last - first + 1
+        del self._source_rows[start:end]
+        for i in range(start, len(self._source_rows)):
+            self._source_rows[i] -= count
+        self._update_proxy_rows()
+        if start < end:
+            self.endRemoveRows()
+    
+    def _update_proxy_rows(self):
+        """Recalcula el mapa de fila del modelo a fila del proxy"""
+        self._proxy_rows = {source_row: proxy_row for proxy_row, source_row in enumerate(self._source_rows)}
+    
+    def _on_data_changed(self, top_left, bottom_right, roles=None):
+        """Reenvía el cambio o muestra/oculta la fila si dejó de cumplir los filtros"""
+        model = self.sourceModel()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            proxy_row = self._proxy_rows.get(row)
+            matches = model.row_matches(row, self._filters)
+            if proxy_row is not None and matches:
+                index = self.index(proxy_row, 0)
+                self.dataChanged.emit(index, index)
+            elif proxy_row is not None:
+                self.beginRemoveRows(QModelIndex(), proxy_row, proxy_row)
+                del self._source_rows[proxy_row]
+                self._update_proxy_rows()
+                self.endRemoveRows()
+            elif matches:
+                proxy_row = bisect_left(self._source_rows, row)
+                self.beginInsertRows(QModelIndex(), proxy_row, proxy_row)
+                self._source_rows.insert(proxy_row, row)
+                self._update_proxy_rows()
+                self.endInsertRows()
+    
+    # --- Interfaz de QAbstractProxyModel ---
+    
+    def index(self, row, column=0, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._source_rows)) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column)
+    
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._source_rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+    
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._source_rows):
+            return QModelIndex()
+        return self.sourceModel().index(self._source_rows[proxy_index.row()], 0)
+    
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        proxy_row = self._proxy_rows.get(source_index.row())
+        return QModelIndex() if proxy_row is None else self.index(proxy_row, 0)
@@ -0,0 +1,167 @@
+"""
+Almacén local de issues de Jira en SQLite
+Guarda los resultados de las consultas guardadas para mostrarlos al instante
+y sincronizarlos después de forma incremental
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Optional, Iterable
+from jira_models import JiraIssueRecord
+
+
+class JiraIssueStore:
+    """Caché persistente de issues y de la membresía de cada consulta guardada"""
+    
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path or Path.home() / ".qa_generator" / "jira_cache.db"
+        self.init_db()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Abre una conexión; se usa una por operación para poder llamarse desde workers"""
+        return sqlite3.connect(self.db_path, timeout=10)
+    
+    def init_db(self):
+        """Crea las tablas si no existen"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            # Datos de cada issue por servidor/usuario (scope)
+            c.execute('''CREATE TABLE IF NOT EXISTS issues (
+                scope TEXT,
+                key TEXT,
+                updated_at TEXT,
+                data TEXT,
+                PRIMARY KEY (scope, key)
+            )''')
+            # Issues que pertenecen a cada consulta guardada, en el orden del servidor
+            c.execute('''CREATE TABLE IF NOT EXISTS query_members (
+                scope TEXT,
+                query_id TEXT,
+                key TEXT,
+                position INTEGER,
+                PRIMARY KEY (scope, query_id, key)
+            )''')
+            # Última sincronización de cada consulta guardada
+            c.execute('''CREATE TABLE IF NOT EXISTS query_sync (
+                scope TEXT,
+                query_id TEXT,
+                jql TEXT,
+                last_sync REAL,
+                PRIMARY KEY (scope, query_id)
+            )''')
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def load_query(self, scope: str, query_id: str) -> List[JiraIssueRecord]:
+        """Obtiene los issues en caché de una consulta guardada"""
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            c.execute('''SELECT i.data FROM query_members m
+                         JOIN issues i ON i.scope = m.scope AND i.key = m.key
+                         WHERE m.scope = ? AND m.query_id = ?
+                         ORDER BY m.position ASC''', (scope, query_id))
+            return [JiraIssueRecord(**json.loads(row[0])) for row in c.fetchall()]
+        finally:
+            conn.close()
+    
+    def get_sync_state(self, scope: str, query_id: str) -> Optional[Dict]:
+        """Obtiene la JQL y la fecha (epoch) de la última sincronización"""
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            c.execute('SELECT jql, last_sync FROM query_sync WHERE scope = ? AND query_id = ?',
+                      (scope, query_id))
+            row = c.fetchone()
+            return {'jql': row[0], 'last_sync': row[1]} if row else None
+        finally:
+            conn.close()
+    
+    def set_sync_state(self, scope: str, query_id: str, jql: str, last_sync: float):
+        """Registra una sincronización completada"""
+        conn = self._connect()
+        try:
+            conn.execute('REPLACE INTO query_sync (scope, query_id, jql, last_sync) VALUES (?, ?, ?, ?)',
+                         (scope, query_id, jql, last_sync))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def get_stored_keys(self, scope: str, keys: Iterable[str]) -> set:
+        """Indica cuáles de las claves ya tienen datos en caché"""
+        keys = list(keys)
+        stored = set()
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            # SQLite limita la cantidad de parámetros por consulta
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                c.execute(f'SELECT key FROM issues WHERE scope = ? AND key IN ({placeholders})',
+                          [scope] + chunk)
+                stored.update(row[0] for row in c.fetchall())
+            return stored
+        finally:
+            conn.close()
+    
+    def upsert_issues(self, scope: str, issues: Iterable[JiraIssueRecord]):
+        """Inserta o actualiza issues"""
+        rows = [(scope, issue.key, issue.updated_at, json.dumps(issue.to_dict(), ensure_ascii=False))
+                for issue in issues]
+        if not rows:
+            return
+        conn = self._connect()
+        try:
+            conn.executemany('REPLACE INTO issues (scope, key, updated_at, data) VALUES (?, ?, ?, ?)', rows)
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def replace_members(self, scope: str, query_id: str, keys: List[str]):
+        """
+        Reemplaza los issues de una consulta y elimina los que salieron de ella
+        si ninguna otra los usa
+        
+        Solo se borran claves que eran de esta consulta: otras sincronizaciones
+        en curso pueden haber guardado issues que todavía no tienen membresía.
+        """
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            c.execute('BEGIN IMMEDIATE')
+            c.execute('SELECT key FROM query_members WHERE scope = ? AND query_id = ?', (scope, query_id))
+            dropped = list({row[0] for row in c.fetchall()} - set(keys))
+            c.execute('DELETE FROM query_members WHERE scope = ? AND query_id = ?', (scope, query_id))
+            c.executemany('INSERT OR IGNORE INTO query_members (scope, query_id, key, position) VALUES (?, ?, ?, ?)',
+                          [(scope, query_id, key, position) for position, key in enumerate(keys)])
+            # SQLite limita la cantidad de parámetros por consulta
+            for start in range(0, len(dropped), 500):
+                chunk = dropped[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                c.execute(f'''DELETE FROM issues WHERE scope = ? AND key IN ({placeholders}) AND key NOT IN
+                              (SELECT key FROM query_members WHERE scope = ?)''', [scope] + chunk + [scope])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def clear(self, scope: str = None):
+        """Limpia la caché de un scope o completa"""
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            for table in ('issues', 'query_members', 'query_sync'):
+                if scope is None:
+                    c.execute(f'DELETE FROM {table}')
+                else:
+                    c.execute(f'DELETE FROM {table} WHERE scope = ?', (scope,))
+            conn.commit()
+        finally:
+            conn.close()
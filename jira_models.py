@@ -0,0 +1,89 @@
+"""
+Modelos compactos para issues de Jira
+"""
+
+from typing import Dict, Any
+
+
+def _name(value, default: str) -> str:
+    """Obtiene el nombre de un objeto JSON de Jira (estado, prioridad, tipo...)"""
+    if not value:
+        return default
+    return value.get('name') or default
+
+
+def _display_name(user, default: str) -> str:
+    """Obtiene el nombre visible de un usuario JSON de Jira"""
+    if not user:
+        return default
+    return user.get('displayName') or default
+
+
+class JiraIssueRecord:
+    """
+    Registro liviano de un issue construido desde el JSON crudo de la búsqueda
+    
+    Usa __slots__ para no reservar un diccionario por instancia y expone una
+    interfaz de diccionario (issue['key'], issue.get('status')) para que la UI
+    existente lo use igual que antes.
+    """
+    
+    __slots__ = ('key', 'summary', 'description', 'status', 'priority', 'issue_type',
+                 'project', 'project_name', 'assignee', 'reporter', 'created',
+                 'updated', 'updated_at', 'url')
+    
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values.get(field, ''))
+    
+    @classmethod
+    def from_json(cls, raw: Dict[str, Any], server_url: str) -> 'JiraIssueRecord':
+        """Crea el registro desde un issue del JSON de /search"""
+        fields = raw.get('fields') or {}
+        project = fields.get('project') or {}
+        created = fields.get('created')
+        updated = fields.get('updated')
+        # En la API v3 la descripción llega como documento ADF; solo se usa texto plano
+        description = fields.get('description')
+        return cls(
+            key=raw['key'],
+            summary=fields.get('summary') or '',
+            description=description if isinstance(description, str) else '',
+            status=_name(fields.get('status'), 'N/A'),
+            priority=_name(fields.get('priority'), 'No Priority'),
+            issue_type=_name(fields.get('issuetype'), 'N/A'),
+            project=project.get('key', 'N/A'),
+            project_name=project.get('name', 'N/A'),
+            assignee=_display_name(fields.get('assignee'), 'Unassigned'),
+            reporter=_display_name(fields.get('reporter'), 'Unknown'),
+            created=created[:10] if created else 'N/A',
+            updated=updated[:10] if updated else 'N/A',
+            updated_at=updated or '',
+            url=f"{server_url}/browse/{raw['key']}"
+        )
+    
+    def __getitem__(self, field: str):
+        if field not in self.__slots__:
+            raise KeyError(field)
+        return getattr(self, field)
+    
+    def __setitem__(self, field: str, value):
+        if field not in self.__slots__:
+            raise KeyError(field)
+        setattr(self, field, value)
+    
+    def __contains__(self, field: str) -> bool:
+        return field in self.__slots__
+    
+    def get(self, field: str, default=None):
+        """Obtiene un campo como en un diccionario"""
+        if field not in self.__slots__:
+            return default
+        return getattr(self, field)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte el registro en diccionario"""
+        return {field: getattr(self, field) for field in self.__slots__}
+    
+    def __repr__(self):
+        return f"JiraIssueRecord({self.key}: {self.status})"
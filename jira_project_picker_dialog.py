@@ -0,0 +1,83 @@
+"""
+Diálogo para elegir varios proyectos de Jira
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                           QPushButton, QListWidget, QListWidgetItem, QLineEdit)
+from PyQt6.QtCore import Qt
+from styles import ThemeManager
+
+class JiraProjectPickerDialog(QDialog):
+    """Lista de proyectos con casillas para verlos juntos"""
+    
+    def __init__(self, parent, projects, selected_keys=None):
+        super().__init__(parent)
+        self.projects = projects
+        self.selected_keys = set(selected_keys or [])
+        
+        self.setWindowTitle("📚 Seleccionar Proyectos")
+        self.setModal(True)
+        self.resize(420, 480)
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Configura la interfaz del diálogo"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(20, 20, 20, 20)
+        
+        # Aplicar estilos
+        self.setStyleSheet(ThemeManager.get_theme_class().get_main_stylesheet())
+        
+        info_label = QLabel("📁 Marca los proyectos que quieres ver juntos:")
+        info_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(info_label)
+        
+        # Filtro por nombre o clave
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("🔍 Filtrar proyectos...")
+        self.filter_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.filter_input.textChanged.connect(self.filter_projects)
+        layout.addWidget(self.filter_input)
+        
+        self.projects_list = QListWidget()
+        self.projects_list.setStyleSheet(ThemeManager.get_theme_class().get_listwidget_style())
+        for project in self.projects:
+            item = QListWidgetItem(f"📁 {project.get('key')} - {project.get('name', '')}")
+            item.setData(Qt.ItemDataRole.UserRole, project.get('key'))
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            checked = project.get('key') in self.selected_keys
+            item.setCheckState(Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+            self.projects_list.addItem(item)
+        layout.addWidget(self.projects_list)
+        
+        # Botones
+        buttons_layout = QHBoxLayout()
+        
+        accept_btn = QPushButton("✅ Ver Proyectos")
+        accept_btn.clicked.connect(self.accept)
+        accept_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(accept_btn)
+        
+        cancel_btn = QPushButton("❌ Cancelar")
+        cancel_btn.clicked.connect(self.reject)
+        cancel_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        buttons_layout.addWidget(cancel_btn)
+        
+        layout.addLayout(buttons_layout)
+    
+    def filter_projects(self, text):
+        """Oculta los proyectos que no coinciden con el filtro"""
+        text = text.strip().lower()
+        for row in range(self.projects_list.count()):
+            item = self.projects_list.item(row)
+            item.setHidden(bool(text) and text not in item.text().lower())
+    
+    def get_selected_keys(self):
+        """Claves de los proyectos marcados, en el orden de la lista"""
+        keys = []
+        for row in range(self.projects_list.count()):
+            item = self.projects_list.item(row)
+            if item.checkState() == Qt.CheckState.Checked:
+                keys.append(item.data(Qt.ItemDataRole.UserRole))
+        return keys
@@ -0,0 +1,355 @@
+"""
+Métricas de ciclo de QA calculadas desde los changelogs de Jira
+Las transiciones de estado se guardan en una tabla por columnas (arrays
+compactos con los textos internados) y los agregados por issue y por QA se
+actualizan a medida que llegan entradas nuevas, sin recalcular la historia.
+"""
+
+import sqlite3
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class ChangelogTable:
+    """
+    Transiciones de estado en columnas paralelas
+    
+    Cada fila es (issue, id de la entrada, momento, estado origen, estado
+    destino, autor). Los textos se guardan una sola vez en values y las
+    columnas solo guardan su índice, así que una transición ocupa 32 bytes.
+    """
+    
+    COLUMNS = (('issue', 'I'), ('history_id', 'q'), ('at', 'd'),
+               ('from_status', 'I'), ('to_status', 'I'), ('author', 'I'))
+    
+    def __init__(self):
+        self.values = []      # Textos internados (claves, estados y autores)
+        self._index = {}      # Texto -> posición en values
+        self.columns = {name: array(typecode) for name, typecode in self.COLUMNS}
+        self.last_history_id = {}  # Clave del issue -> última entrada guardada
+    
+    def __len__(self) -> int:
+        return len(self.columns['history_id'])
+    
+    def intern(self, value: str) -> int:
+        """Posición del texto en values (lo agrega si es nuevo)"""
+        position = self._index.get(value)
+        if position is None:
+            position = len(self.values)
+            self.values.append(value)
+            self._index[value] = position
+        return position
+    
+    def append(self, issue_key: str, history_id: int, at: float,
+               from_status: str, to_status: str, author: str):
+        """Agrega una transición"""
+        columns = self.columns
+        columns['issue'].append(self.intern(issue_key))
+        columns['history_id'].append(history_id)
+        columns['at'].append(at)
+        columns['from_status'].append(self.intern(from_status))
+        columns['to_status'].append(self.intern(to_status))
+        columns['author'].append(self.intern(author))
+        if history_id > self.last_history_id.get(issue_key, -1):
+            self.last_history_id[issue_key] = history_id
+    
+    def rows(self) -> Iterator[Tuple[str, int, float, str, str, str]]:
+        """Recorre las transiciones en el orden en que se agregaron"""
+        values = self.values
+        columns = self.columns
+        for issue, history_id, at, from_status, to_status, author in zip(
+                columns['issue'], columns['history_id'], columns['at'],
+                columns['from_status'], columns['to_status'], columns['author']):
+            yield (values[issue], history_id, at, values[from_status], values[to_status], values[author])
+    
+    def to_blobs(self) -> Dict[str, bytes]:
+        """Columnas y textos serializados para guardarlos"""
+        blobs = {name: column.tobytes() for name, column in self.columns.items()}
+        blobs['values'] = '\0'.join(self.values).encode('utf-8')
+        return blobs
+    
+    @classmethod
+    def from_blobs(cls, blobs: Dict[str, bytes]) -> 'ChangelogTable':
+        """Reconstruye la tabla guardada con to_blobs"""
+        table = cls()
+        text = blobs.get('values', b'').decode('utf-8')
+        for value in text.split('\0') if text else []:
+            table.intern(value)
+        for name, typecode in cls.COLUMNS:
+            table.columns[name].frombytes(blobs.get(name, b''))
+        values = table.values
+        for issue, history_id in zip(table.columns['issue'], table.columns['history_id']):
+            key = values[issue]
+            if history_id > table.last_history_id.get(key, -1):
+                table.last_history_id[key] = history_id
+        return table
+
+
+class QACycleMetrics:
+    """
+    Agregados de QA por issue y por responsable, actualizados transición a transición
+    
+    Un período en QA empieza al entrar a un estado de QA_STATUSES y termina al
+    salir de él; su duración se atribuye a quien hizo la transición de salida.
+    Una reapertura es volver desde QA o desde un estado terminado a uno de
+    desarrollo, y se atribuye a quien la hizo.
+    """
+    
+    QA_STATUSES = ('in qa', 'qa', 'testing', 'in testing', 'en qa', 'en pruebas', 'qa review')
+    DONE_STATUSES = ('done', 'closed', 'resolved', 'cerrado', 'finalizado', 'listo', 'terminado')
+    
+    def __init__(self, qa_statuses: Iterable[str] = None, done_statuses: Iterable[str] = None):
+        self.qa_statuses = {status.lower() for status in (qa_statuses or self.QA_STATUSES)}
+        self.done_statuses = {status.lower() for status in (done_statuses or self.DONE_STATUSES)}
+        self.issues = {}     # Clave -> estado y acumulados del issue
+        self.engineers = {}  # Responsable -> acumulados
+    
+    def _engineer(self, name: str) -> Dict:
+        return self.engineers.setdefault(name, {'qa_seconds': 0.0, 'qa_cycles': 0,
+                                                'reopens': 0, 'issues': set()})
+    
+    def add(self, issue_key: str, at: float, from_status: str, to_status: str, author: str):
+        """Aplica una transición; las de cada issue deben llegar en orden"""
+        issue = self.issues.setdefault(issue_key, {'status': from_status, 'qa_since': None,
+                                                   'qa_seconds': 0.0, 'qa_cycles': 0,
+                                                   'reopens': 0, 'engineers': set()})
+        was_qa = from_status.lower() in self.qa_statuses
+        is_qa = to_status.lower() in self.qa_statuses
+        was_closed = was_qa or from_status.lower() in self.done_statuses
+        is_closed = is_qa or to_status.lower() in self.done_statuses
+        
+        if was_qa and not is_qa and issue['qa_since'] is not None:
+            seconds = max(0.0, at - issue['qa_since'])
+            issue['qa_seconds'] += seconds
+            issue['qa_cycles'] += 1
+            issue['qa_since'] = None
+            issue['engineers'].add(author)
+            engineer = self._engineer(author)
+            engineer['qa_seconds'] += seconds
+            engineer['qa_cycles'] += 1
+            engineer['issues'].add(issue_key)
+        if is_qa and not was_qa:
+            issue['qa_since'] = at
+        if was_closed and not is_closed:
+            issue['reopens'] += 1
+            engineer = self._engineer(author)
+            engineer['reopens'] += 1
+            engineer['issues'].add(issue_key)
+        issue['status'] = to_status
+    
+    def issue_summary(self, now: float = None) -> List[Dict]:
+        """Tiempo en QA (incluye el período abierto) y reaperturas de cada issue"""
+        now = now or time.time()
+        summary = []
+        for key, issue in self.issues.items():
+            open_seconds = now - issue['qa_since'] if issue['qa_since'] is not None else 0.0
+            summary.append({
+                'key': key,
+                'status': issue['status'],
+                'qa_hours': round((issue['qa_seconds'] + open_seconds) / 3600, 2),
+                'qa_cycles': issue['qa_cycles'],
+                'reopens': issue['reopens'],
+                'in_qa': issue['qa_since'] is not None,
+                'engineers': sorted(issue['engineers'])
+            })
+        return sorted(summary, key=lambda item: item['qa_hours'], reverse=True)
+    
+    def engineer_summary(self) -> List[Dict]:
+        """Tiempo total y promedio por ciclo de QA, y reaperturas, de cada responsable"""
+        summary = []
+        for name, engineer in self.engineers.items():
+            cycles = engineer['qa_cycles']
+            summary.append({
+                'engineer': name,
+                'qa_hours': round(engineer['qa_seconds'] / 3600, 2),
+                'avg_cycle_hours': round(engineer['qa_seconds'] / cycles / 3600, 2) if cycles else 0.0,
+                'qa_cycles': cycles,
+                'reopens': engineer['reopens'],
+                'issues': len(engineer['issues'])
+            })
+        return sorted(summary, key=lambda item: item['qa_cycles'], reverse=True)
+
+
+class QAMetricsStore:
+    """Guarda la tabla de transiciones de cada scope en la base local de Jira"""
+    
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path or Path.home() / ".qa_generator" / "jira_cache.db"
+        self.init_db()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Abre una conexión; se usa una por operación para poder llamarse desde workers"""
+        return sqlite3.connect(self.db_path, timeout=10)
+    
+    def init_db(self):
+        """Crea las tablas si no existen"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            # Una fila por columna de la tabla de transiciones
+            c.execute('''CREATE TABLE IF NOT EXISTS changelog_columns (
+                scope TEXT,
+                name TEXT,
+                data BLOB,
+                PRIMARY KEY (scope, name)
+            )''')
+            # Última descarga de changelogs de cada scope
+            c.execute('''CREATE TABLE IF NOT EXISTS changelog_sync (
+                scope TEXT PRIMARY KEY,
+                jql TEXT,
+                last_sync REAL
+            )''')
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def load(self, scope: str) -> Tuple[ChangelogTable, Optional[Dict]]:
+        """Tabla guardada y estado de la última descarga (None si nunca se descargó)"""
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            c.execute('SELECT name, data FROM changelog_columns WHERE scope = ?', (scope,))
+            table = ChangelogTable.from_blobs({name: bytes(data) for name, data in c.fetchall()})
+            c.execute('SELECT jql, last_sync FROM changelog_sync WHERE scope = ?', (scope,))
+            row = c.fetchone()
+            return table, ({'jql': row[0], 'last_sync': row[1]} if row else None)
+        finally:
+            conn.close()
+    
+    def save(self, scope: str, table: ChangelogTable, jql: str, last_sync: float):
+        """Reemplaza la tabla guardada y registra la descarga"""
+        conn = self._connect()
+        try:
+            c = conn.cursor()
+            c.executemany('REPLACE INTO changelog_columns (scope, name, data) VALUES (?, ?, ?)',
+                          [(scope, name, data) for name, data in table.to_blobs().items()])
+            c.execute('REPLACE INTO changelog_sync (scope, jql, last_sync) VALUES (?, ?, ?)',
+                      (scope, jql, last_sync))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def clear(self, scope: str):
+        """Elimina las transiciones guardadas de un scope"""
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM changelog_columns WHERE scope = ?', (scope,))
+            conn.execute('DELETE FROM changelog_sync WHERE scope = ?', (scope,))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class QAMetricsService:
+    """
+    Descarga los changelogs de una JQL y mantiene las métricas de QA al día
+    
+    La primera sincronización (o si cambió la JQL) descarga toda la historia;
+    las siguientes solo los issues actualizados desde la anterior, y de ellos
+    solo las entradas con id mayor al último guardado.
+    """
+    
+    def __init__(self, jira_service, store: QAMetricsStore = None,
+                 qa_statuses: Iterable[str] = None, done_statuses: Iterable[str] = None):
+        self.jira_service = jira_service
+        self.store = store or QAMetricsStore()
+        self.qa_statuses = qa_statuses
+        self.done_statuses = done_statuses
+        self.table = ChangelogTable()
+        self.metrics = QACycleMetrics(qa_statuses, done_statuses)
+        self._scope = None
+        self._state = None
+    
+    @staticmethod
+    def parse_timestamp(value: str) -> float:
+        """Epoch de una fecha del changelog de Jira"""
+        try:
+            return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z').timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+    
+    def load(self) -> Optional[Dict]:
+        """
+        Carga las transiciones guardadas del scope actual y recalcula los agregados
+        
+        Solo se recorre la tabla al cambiar de servidor/usuario; después los
+        agregados se mantienen con cada transición nueva.
+        
+        Returns:
+            Optional[Dict]: JQL y fecha de la última descarga, o None
+        """
+        scope = self.jira_service.get_store_scope()
+        if scope == self._scope:
+            return self._state
+        self._scope = scope
+        self.table, self._state = self.store.load(scope)
+        self.metrics = QACycleMetrics(self.qa_statuses, self.done_statuses)
+        for issue_key, _, at, from_status, to_status, author in self.table.rows():
+            self.metrics.add(issue_key, at, from_status, to_status, author)
+        return self._state
+    
+    def sync(self, jql: str, on_page: Callable[[int, int], None] = None) -> Dict:
+        """
+        Descarga las transiciones nuevas de los issues de la JQL
+        
+        Args:
+            jql: Query JQL de los issues a medir
+            on_page: Recibe (issues revisados, transiciones nuevas) tras cada página
+        
+        Returns:
+            Dict: issues revisados y transiciones nuevas
+        """
+        if not self.jira_service.is_connected:
+            raise Exception("No conectado a Jira")
+        
+        try:
+            state = self.load()
+            if state is None or state['jql'] != jql:
+                self.table = ChangelogTable()
+                self.metrics = QACycleMetrics(self.qa_statuses, self.done_statuses)
+                fetch_jql = jql
+            else:
+                base_jql, order_by = self.jira_service.split_order_by(jql)
+                since = self.jira_service.format_jql_datetime(
+                    state['last_sync'] - self.jira_service.SYNC_OVERLAP_SECONDS)
+                fetch_jql = f'({base_jql}) AND updated >= "{since}" {order_by}'.strip()
+            
+            sync_started = time.time()
+            checked = 0
+            added = 0
+            for page in self.jira_service.iter_changelog_pages(fetch_jql):
+                for issue_key, histories in page:
+                    checked += 1
+                    added += self.add_histories(issue_key, histories)
+                if on_page:
+                    on_page(checked, added)
+            
+            self.store.save(self._scope, self.table, jql, sync_started)
+            self._state = {'jql': jql, 'last_sync': sync_started}
+            return {'checked': checked, 'added': added}
+        except Exception as e:
+            raise Exception(f"Error sincronizando métricas de QA: {e}")
+    
+    def add_histories(self, issue_key: str, histories: List[Dict]) -> int:
+        """Agrega las transiciones de estado aún no vistas de un issue (en orden de id)"""
+        last_id = self.table.last_history_id.get(issue_key, -1)
+        added = 0
+        for history in histories:
+            history_id = int(history['id'])
+            if history_id <= last_id:
+                continue
+            at = self.parse_timestamp(history.get('created'))
+            author = (history.get('author') or {}).get('displayName') or 'Unknown'
+            for item in history.get('items') or []:
+                if item.get('field') != 'status':
+                    continue
+                from_status = item.get('fromString') or ''
+                to_status = item.get('toString') or ''
+                self.table.append(issue_key, history_id, at, from_status, to_status, author)
+                self.metrics.add(issue_key, at, from_status, to_status, author)
+                added += 1
+        return added
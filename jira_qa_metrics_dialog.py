@@ -0,0 +1,174 @@
+"""
+Diálogo con las métricas de ciclo de QA (tiempo en QA y reaperturas)
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                           QPushButton, QLineEdit, QTabWidget, QTreeWidget,
+                           QTreeWidgetItem, QMessageBox)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from styles import ThemeManager
+
+class QAMetricsSyncWorker(QThread):
+    """Worker para descargar los changelogs nuevos en background"""
+    page_loaded = pyqtSignal(int, int)  # issues revisados, transiciones nuevas
+    sync_completed = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, metrics_service, jql):
+        super().__init__()
+        self.metrics_service = metrics_service
+        self.jql = jql
+    
+    def run(self):
+        try:
+            result = self.metrics_service.sync(self.jql, on_page=self.page_loaded.emit)
+            self.sync_completed.emit(result)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+class JiraQAMetricsDialog(QDialog):
+    """Tiempo en QA y reaperturas por issue y por responsable de QA"""
+    
+    ISSUE_COLUMNS = ["Issue", "Estado", "Horas en QA", "Ciclos", "Reaperturas", "QA"]
+    ENGINEER_COLUMNS = ["Responsable", "Horas en QA", "Promedio por ciclo", "Ciclos", "Reaperturas", "Issues"]
+    
+    def __init__(self, parent, metrics_service, jql=""):
+        super().__init__(parent)
+        self.metrics_service = metrics_service
+        self.worker = None
+        
+        self.setWindowTitle("📊 Métricas de QA")
+        self.setModal(True)
+        self.resize(760, 560)
+        self.setup_ui(jql)
+        try:
+            self.metrics_service.load()
+        except Exception as e:
+            self.status_label.setText(f"❌ Error cargando métricas guardadas: {e}")
+        self.show_metrics()
+    
+    def setup_ui(self, jql):
+        """Configura la interfaz del diálogo"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(20, 20, 20, 20)
+        
+        # Aplicar estilos
+        self.setStyleSheet(ThemeManager.get_theme_class().get_main_stylesheet())
+        
+        jql_label = QLabel("🔍 Issues a medir (JQL):")
+        jql_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(jql_label)
+        
+        jql_layout = QHBoxLayout()
+        self.jql_input = QLineEdit(jql)
+        self.jql_input.setPlaceholderText('Ejemplo: project = "PROJ" AND updated >= -90d')
+        self.jql_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.jql_input.returnPressed.connect(self.sync_metrics)
+        jql_layout.addWidget(self.jql_input)
+        
+        self.sync_btn = QPushButton("🔄 Actualizar")
+        self.sync_btn.clicked.connect(self.sync_metrics)
+        self.sync_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        jql_layout.addWidget(self.sync_btn)
+        layout.addLayout(jql_layout)
+        
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        
+        # Tablas por issue y por responsable
+        tabs = QTabWidget()
+        self.issues_tree = self.create_tree(self.ISSUE_COLUMNS)
+        tabs.addTab(self.issues_tree, "📋 Por Issue")
+        self.engineers_tree = self.create_tree(self.ENGINEER_COLUMNS)
+        tabs.addTab(self.engineers_tree, "👤 Por QA")
+        layout.addWidget(tabs)
+        
+        close_btn = QPushButton("✅ Cerrar")
+        close_btn.clicked.connect(self.reject)
+        close_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        layout.addWidget(close_btn)
+    
+    def create_tree(self, columns):
+        """Tabla sin jerarquía ordenable por cualquier columna"""
+        tree = QTreeWidget()
+        tree.setHeaderLabels(columns)
+        tree.setRootIsDecorated(False)
+        tree.setSortingEnabled(True)
+        return tree
+    
+    def sync_metrics(self):
+        """Descarga en background las transiciones nuevas de la JQL"""
+        jql = self.jql_input.text().strip()
+        if not jql:
+            QMessageBox.warning(self, "⚠️ Advertencia", "Escribe la JQL de los issues a medir")
+            return
+        if self.worker and self.worker.isRunning():
+            return
+        
+        self.sync_btn.setEnabled(False)
+        self.status_label.setText("🔄 Descargando changelogs...")
+        self.worker = QAMetricsSyncWorker(self.metrics_service, jql)
+        self.worker.page_loaded.connect(self.on_page_loaded)
+        self.worker.sync_completed.connect(self.on_sync_completed)
+        self.worker.error_occurred.connect(self.on_sync_error)
+        self.worker.start()
+    
+    def on_page_loaded(self, checked, added):
+        """Muestra el avance de la descarga"""
+        self.status_label.setText(f"🔄 {checked} issues revisados, {added} transiciones nuevas...")
+    
+    def on_sync_completed(self, result):
+        """Muestra las métricas actualizadas"""
+        self.sync_btn.setEnabled(True)
+        self.status_label.setText(f"✅ {result['checked']} issues revisados, "
+                                  f"{result['added']} transiciones nuevas")
+        self.show_metrics()
+    
+    def on_sync_error(self, message):
+        """Informa el error; las métricas anteriores siguen visibles"""
+        self.sync_btn.setEnabled(True)
+        self.status_label.setText(f"❌ {message}")
+    
+    def show_metrics(self):
+        """Llena las tablas con los agregados actuales"""
+        metrics = self.metrics_service.metrics
+        
+        self.issues_tree.setSortingEnabled(False)
+        self.issues_tree.clear()
+        for issue in metrics.issue_summary():
+            status = f"🧪 {issue['status']}" if issue['in_qa'] else issue['status']
+            item = QTreeWidgetItem([issue['key'], status, "", "", "", ", ".join(issue['engineers'])])
+            self.set_number(item, 2, issue['qa_hours'])
+            self.set_number(item, 3, issue['qa_cycles'])
+            self.set_number(item, 4, issue['reopens'])
+            self.issues_tree.addTopLevelItem(item)
+        self.issues_tree.setSortingEnabled(True)
+        
+        self.engineers_tree.setSortingEnabled(False)
+        self.engineers_tree.clear()
+        for engineer in metrics.engineer_summary():
+            item = QTreeWidgetItem([engineer['engineer']])
+            self.set_number(item, 1, engineer['qa_hours'])
+            self.set_number(item, 2, engineer['avg_cycle_hours'])
+            self.set_number(item, 3, engineer['qa_cycles'])
+            self.set_number(item, 4, engineer['reopens'])
+            self.set_number(item, 5, engineer['issues'])
+            self.engineers_tree.addTopLevelItem(item)
+        self.engineers_tree.setSortingEnabled(True)
+        
+        for tree in (self.issues_tree, self.engineers_tree):
+            for column in range(tree.columnCount()):
+                tree.resizeColumnToContents(column)
+    
+    @staticmethod
+    def set_number(item, column, value):
+        """Guarda el número como dato para que la columna ordene numéricamente"""
+        item.setData(column, Qt.ItemDataRole.DisplayRole, value)
+    
+    def reject(self):
+        """No se cierra mientras descarga para no abandonar el worker"""
+        if self.worker and self.worker.isRunning():
+            self.status_label.setText("⏳ Espera a que termine la descarga...")
+            return
+        super().reject()
@@ -0,0 +1,122 @@
+"""
+Caché con vencimiento de resultados de búsquedas JQL
+Indexa qué consultas contienen cada issue para invalidar o corregir solo esas
+cuando se modifica un issue
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from jira_models import JiraIssueRecord
+
+
+class JiraQueryCache:
+    """Resultados por (JQL normalizada, campos, límite) que vencen a los ttl segundos"""
+    
+    def __init__(self, ttl: float = 120, max_entries: int = 50):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # Clave -> (momento de guardado, páginas de issues)
+        self._issue_queries = {}       # Clave del issue -> claves de las consultas que lo contienen
+        # Los workers guardan resultados mientras la UI modifica issues
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def normalize_jql(jql: str) -> str:
+        """Colapsa los espacios fuera de las comillas para que la misma consulta comparta entrada"""
+        parts = re.split(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')', jql.strip())
+        return ''.join(part if i % 2 else re.sub(r'\s+', ' ', part) for i, part in enumerate(parts))
+    
+    @classmethod
+    def make_key(cls, jql: str, fields: Iterable[str], max_results: Optional[int] = None) -> Tuple:
+        """Clave de una búsqueda: JQL normalizada, conjunto de campos y límite"""
+        return (cls.normalize_jql(jql), tuple(sorted(fields)), max_results)
+    
+    def get(self, key: Tuple) -> Optional[List[List[JiraIssueRecord]]]:
+        """Copia de las páginas guardadas, o None si no hay entrada vigente"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, pages = entry
+            if time.monotonic() - stored_at > self.ttl:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            # Copias: la UI modifica los issues que recibe
+            return [[JiraIssueRecord(**issue.to_dict()) for issue in page] for page in pages]
+    
+    def put(self, key: Tuple, pages: List[List[JiraIssueRecord]]):
+        """Guarda una copia de las páginas de una búsqueda completa"""
+        if self.ttl <= 0:
+            return
+        pages = [[JiraIssueRecord(**issue.to_dict()) for issue in page] for page in pages]
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic(), pages)
+            for page in pages:
+                for issue in page:
+                    self._issue_queries.setdefault(issue.key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+    
+    def update_issue(self, issue_key: str, filter_fields: Tuple[str, ...] = (),
+                     changes: Optional[Dict] = None) -> int:
+        """
+        Refleja la modificación de un issue en las consultas guardadas
+        
+        Las consultas que contienen el issue se corrigen con changes ({} si los
+        campos de la lista no cambiaron); con changes=None, o si su JQL filtra por
+        alguno de filter_fields (el issue pudo salir de ellas), se descartan. Las
+        que no lo contienen pero filtran por esos campos también se descartan,
+        porque el issue pudo entrar.
+        
+        Returns:
+            int: Cantidad de consultas descartadas
+        """
+        pattern = None
+        if filter_fields:
+            pattern = re.compile(r'\b(' + '|'.join(re.escape(field) for field in filter_fields) + r')\b',
+                                 re.IGNORECASE)
+        
+        with self._lock:
+            containing = set(self._issue_queries.get(issue_key, ()))
+            discarded = set()
+            for key in self._entries:
+                # ORDER BY no cambia qué issues trae la consulta
+                where = re.split(r'\border\s+by\b', key[0], flags=re.IGNORECASE)[0]
+                if pattern and pattern.search(where):
+                    discarded.add(key)
+                elif key in containing and changes is None:
+                    discarded.add(key)
+            
+            for key in discarded:
+                self._remove(key)
+            for key in containing - discarded:
+                for page in self._entries[key][1]:
+                    for issue in page:
+                        if issue.key == issue_key:
+                            for field, value in (changes or {}).items():
+                                issue[field] = value
+            return len(discarded)
+    
+    def clear(self):
+        """Limpia la caché"""
+        with self._lock:
+            self._entries.clear()
+            self._issue_queries.clear()
+    
+    def _remove(self, key: Tuple):
+        """Elimina una entrada y sus referencias en el índice por issue (con el lock tomado)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for page in entry[1]:
+            for issue in page:
+                queries = self._issue_queries.get(issue.key)
+                if queries is not None:
+                    queries.discard(key)
+                    if not queries:
+                        del self._issue_queries[issue.key]
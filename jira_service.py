@@ -2,15 +2,100 @@
 Servicio para integración con Jira
 """
 
+import heapq
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from jira import JIRA
-from typing import List, Dict, Optional
+from client_pool import ThreadLocalClient, limit_session_pool
+from typing import List, Dict, Optional, Iterator, Callable, Tuple
+from jira_models import JiraIssueRecord
+from jira_query_cache import JiraQueryCache
+from lru_cache import LRUCache
 
 class JiraService:
+    # Campos que necesitan las listas; description y campos personalizados quedan fuera
+    LIST_FIELDS = ['summary', 'status', 'priority', 'issuetype', 'project',
+                   'assignee', 'reporter', 'created', 'updated']
+    
+    # Campos que solo se piden al seleccionar un issue
+    DETAIL_FIELDS = ['description', 'comment', 'issuelinks', 'attachment']
+    
+    # Consultas guardadas que se sincronizan con el almacén local
+    ASSIGNED_JQL = 'assignee = currentUser() AND resolution = Unresolved ORDER BY updated DESC'
+    PROJECT_JQL = 'project = "{project_key}" ORDER BY updated DESC'
+    
+    # Margen hacia atrás de cada sincronización incremental (reloj y precisión de minutos de JQL)
+    SYNC_OVERLAP_SECONDS = 300
+    
+    # Reintentos de la sesión de python-jira ante 429/503 (única capa de reintentos)
+    MAX_RETRIES = 3
+    MAX_RETRY_DELAY = 30  # Segundos máximos entre reintentos
+    
+    # Operaciones masivas: peticiones simultáneas
+    BULK_MAX_WORKERS = 4
+    
+    # Conteos por faceta: consultas simultáneas, máximo de valores por faceta y
+    # máximo de consultas de conteo por llamada
+    COUNT_MAX_WORKERS = 8
+    COUNT_MAX_FACET_VALUES = 60
+    COUNT_MAX_QUERIES = 30
+    
+    # Proyectos que se cargan a la vez al ver varios proyectos juntos
+    PROJECT_MAX_WORKERS = 6
+    
+    # Segundos que se reutiliza el resultado de una búsqueda JQL (0 para no guardar)
+    QUERY_CACHE_TTL = 120
+    # Campos JQL afectados por una transición: las consultas que filtran por ellos se descartan
+    TRANSITION_FILTER_FIELDS = ('status', 'statusCategory', 'resolution', 'resolved', 'updated')
+    # Campos JQL afectados por un comentario
+    COMMENT_FILTER_FIELDS = ('comment', 'updated')
+    # Webhooks: eventos de comentarios y nombres del changelog que difieren del campo JQL
+    WEBHOOK_COMMENT_EVENTS = ('comment_created', 'comment_updated', 'comment_deleted')
+    WEBHOOK_JQL_FIELDS = {'Fix Version': 'fixVersion', 'fixVersions': 'fixVersion',
+                          'Component': 'component', 'components': 'component',
+                          'Sprint': 'sprint', 'Key': 'key'}
+    
+    # Autocompletado de la tarea QA: campos de usuario (por nombre) de cada rol de QA
+    QA_ROLE_FIELDS = {
+        'qa_usabilidad': ('QA Usabilidad', 'QA UX', 'UX Reviewer'),
+        'qa_codigo': ('QA Código', 'QA Codigo', 'Code Reviewer', 'Reviewers'),
+    }
+    # Ambientes reconocidos en los campos del issue (labels, componentes, Environment...)
+    ENVIRONMENT_KEYWORDS = (
+        ('dev', r'dev|develop|development|desarrollo'),
+        ('qa', r'qa|testing'),
+        ('staging', r'staging|stage|stg|uat|pre-?prod'),
+        ('prod', r'prod|production|producci[oó]n'),
+    )
+    # Ambiente al que despliega la rama destino de un PR
+    BRANCH_ENVIRONMENTS = {
+        'develop': 'dev', 'development': 'dev', 'dev': 'dev',
+        'qa': 'qa', 'test': 'qa',
+        'staging': 'staging', 'stage': 'staging', 'release': 'staging',
+        'main': 'prod', 'master': 'prod', 'production': 'prod',
+    }
+    GITHUB_PR_URL = re.compile(r'https://github\.com/[^/\s]+/[^/\s]+/pull/\d+')
+    # Issues por página al descargar changelogs (cada uno trae hasta 100 entradas)
+    CHANGELOG_PAGE_SIZE = 50
+    # Usuarios que se guardan para autocompletar JQL
+    JQL_MAX_USERS = 1000
+    
     def __init__(self):
         self.jira = None
         self.server_url = None
         self.username = None
         self.is_connected = False
+        self.user_timezone = None
+        self.user_info = None    # Identidad obtenida con myself() al conectar
+        self.server_info = None  # Tipo de despliegue y versión del servidor
+        self.detail_cache = LRUCache(max_entries=100)  # issue_key -> detalle
+        # (proyecto, tipo de issue, estado) -> transiciones del workflow
+        self.transition_cache = LRUCache(max_entries=200)
+        self.issue_workflow_keys = LRUCache(max_entries=500)  # issue_key -> clave de transition_cache
+        self.metadata_cache = LRUCache(max_entries=16)  # faceta -> valores (estados, prioridades...)
+        self.query_cache = JiraQueryCache(ttl=self.QUERY_CACHE_TTL)  # búsqueda JQL -> páginas
         
     def connect(self, server_url: str, username: str, api_token: str) -> bool:
         """
@@ -25,69 +110,241 @@ class JiraService:
             bool: True si la conexión fue exitosa
         """
         try:
-            # Limpiar URL si tiene barra al final
-            if server_url.endswith('/'):
-                server_url = server_url[:-1]
-                
-            self.jira = JIRA(
-                server=server_url,
-                basic_auth=(username, api_token)
-            )
-            
-            # Verificar conexión obteniendo info del usuario
-            user = self.jira.myself()
-            self.server_url = server_url
-            self.username = username
-            self.is_connected = True
+            self.prepare_connection(server_url, username, api_token)
+            self.verify_connection()
             return True
             
         except Exception as e:
             print(f"Error conectando a Jira: {e}")
+            self.jira = None
             self.is_connected = False
             return False
     
-    def get_assigned_issues(self, max_results: int = 50) -> List[Dict]:
+    def prepare_connection(self, server_url: str, username: str, api_token: str,
+                           identity: Optional[Dict] = None):
+        """
+        Crea los clientes de Jira sin verificar las credenciales
+        
+        Con la identidad guardada de una conexión anterior (ver get_identity) no
+        hace ninguna petición: toma de ella los datos del servidor y del usuario y
+        deja el servicio conectado de forma optimista hasta que verify_connection
+        confirme las credenciales.
+        
+        Args:
+            server_url: URL del servidor Jira
+            username: Tu email de Jira
+            api_token: Token de API de Jira
+            identity: Identidad guardada del mismo servidor y usuario
+        """
+        # Limpiar URL si tiene barra al final
+        if server_url.endswith('/'):
+            server_url = server_url[:-1]
+        
+        server_info = (identity or {}).get('server_info')
+        client = JIRA(
+            server=server_url,
+            basic_auth=(username, api_token),
+            get_server_info=not server_info,
+            max_retries=self.MAX_RETRIES
+        )
+        client._session.max_retry_delay = self.MAX_RETRY_DELAY
+        if server_info:
+            client.deploymentType = server_info.get('deployment_type')
+            client._version = tuple(server_info.get('version') or (0, 0, 0))
+        limit_session_pool(client._session)
+        
+        def create_thread_client():
+            # Mismas credenciales y datos del servidor, sin volver a pedir /serverInfo
+            thread_client = JIRA(
+                server=server_url,
+                basic_auth=(username, api_token),
+                get_server_info=False,
+                max_retries=self.MAX_RETRIES
+            )
+            thread_client._session.max_retry_delay = self.MAX_RETRY_DELAY
+            thread_client.deploymentType = client.deploymentType
+            thread_client._version = client._version
+            # Mapa nombre -> id de campos; sin él, la primera búsqueda con fields= pide /field
+            thread_client._fields_cache_value = dict(client._fields_cache_value)
+            limit_session_pool(thread_client._session)
+            return thread_client
+        
+        # Cada worker usa su propio cliente: la sesión HTTP no es segura entre hilos
+        self.jira = ThreadLocalClient(create_thread_client, primary=client)
+        self.server_url = server_url
+        self.username = username
+        self.server_info = {'deployment_type': client.deploymentType, 'version': list(client._version)}
+        
+        if identity and identity.get('user_info'):
+            self.user_info = identity['user_info']
+            self.user_timezone = identity.get('timezone')
+            self.is_connected = True
+    
+    def verify_connection(self) -> Dict:
+        """
+        Verifica las credenciales con una única llamada a myself() y guarda la identidad
+        
+        Returns:
+            Dict: Información del usuario
+        """
+        client = self.jira
+        try:
+            user = client.myself()
+        except Exception:
+            if self.jira is client:
+                self.is_connected = False
+            raise
+        
+        # Si se desconectó o reconectó mientras tanto, el resultado ya no aplica
+        if self.jira is not client:
+            raise Exception("La conexión cambió durante la verificación")
+        
+        # Las fechas en JQL se interpretan en la zona horaria del perfil
+        self.user_timezone = user.get('timeZone')
+        self.user_info = {
+            'name': user.get('displayName'),
+            'email': user.get('emailAddress'),
+            'account_id': user.get('accountId'),
+            'active': user.get('active'),
+            'timezone': user.get('timeZone', 'Unknown')
+        }
+        self.is_connected = True
+        return self.user_info
+    
+    def get_identity(self) -> Optional[Dict]:
+        """
+        Identidad de la conexión actual para guardarla y reconectar sin esperar al servidor
+        
+        No incluye el token.
+        """
+        if not self.user_info:
+            return None
+        return {
+            'server_url': self.server_url,
+            'username': self.username,
+            'server_info': self.server_info,
+            'user_info': self.user_info,
+            'timezone': self.user_timezone
+        }
+    
+    def get_assigned_issues(self, max_results: int = 50) -> List[JiraIssueRecord]:
         """
         Obtiene las tareas asignadas al usuario actual
         
         Args:
-            max_results: Número máximo de resultados
+            max_results: Número máximo de resultados (None para todas)
             
         Returns:
-            List[Dict]: Lista de issues asignadas
+            List[JiraIssueRecord]: Lista de issues asignadas
+        """
+        try:
+            return [issue for page in self.iter_assigned_issue_pages(max_results=max_results) for issue in page]
+        except Exception as e:
+            raise Exception(f"Error obteniendo issues: {e}")
+    
+    def iter_assigned_issue_pages(self, page_size: int = 100, max_results: int = None,
+                                  use_cache: bool = True) -> Iterator[List[JiraIssueRecord]]:
+        """Entrega por páginas las tareas asignadas al usuario actual"""
+        return self.iter_search_pages(self.ASSIGNED_JQL, page_size, max_results, use_cache=use_cache)
+    
+    def iter_search_pages(self, jql: str, page_size: int = 100, max_results: int = None,
+                          fields: List[str] = None, use_cache: bool = True) -> Iterator[List[JiraIssueRecord]]:
+        """
+        Ejecuta una búsqueda JQL y entrega cada página apenas llega
+        
+        Solo pide los campos que usa la UI (fields=) y recibe el JSON crudo, que se
+        convierte en registros compactos sin pasar por los Resource de python-jira.
+        En Jira Cloud pagina con nextPageToken (el endpoint con startAt está
+        deprecado); en Jira Server/Data Center pagina con startAt.
+        
+        Las búsquedas completas se guardan en query_cache durante QUERY_CACHE_TTL
+        segundos y repetirlas no hace peticiones.
+        
+        Args:
+            jql: Query JQL
+            page_size: Issues por petición
+            max_results: Límite total de resultados (None para todos)
+            fields: Campos a pedir (por defecto LIST_FIELDS)
+            use_cache: Reutilizar y guardar el resultado en query_cache
+        
+        Yields:
+            List[JiraIssueRecord]: Issues de cada página
         """
         if not self.is_connected:
             raise Exception("No conectado a Jira")
         
-        try:
-            # JQL para obtener issues asignadas al usuario actual
-            jql = f'assignee = currentUser() AND resolution = Unresolved ORDER BY updated DESC'
+        fields = fields or self.LIST_FIELDS
+        cache_key = self.query_cache.make_key(jql, fields, max_results)
+        if use_cache:
+            cached_pages = self.query_cache.get(cache_key)
+            if cached_pages is not None:
+                yield from cached_pages
+                return
+        
+        pages = []
+        for raw_issues in self.iter_raw_search_pages(jql, page_size, max_results, fields):
+            page = [JiraIssueRecord.from_json(raw, self.server_url) for raw in raw_issues]
+            pages.append(page)
+            yield page
+        
+        # Solo se guarda la búsqueda completa (no si se dejó de iterar a mitad)
+        if use_cache:
+            self.query_cache.put(cache_key, pages)
+    
+    def iter_raw_search_pages(self, jql: str, page_size: int = 100, max_results: int = None,
+                              fields: List[str] = None, expand: str = None) -> Iterator[List[Dict]]:
+        """
+        Pagina una búsqueda JQL entregando el JSON crudo de cada página
+        
+        En Jira Cloud pagina con nextPageToken y en Jira Server/Data Center con
+        startAt. No usa query_cache.
+        
+        Args:
+            jql: Query JQL
+            page_size: Issues por petición
+            max_results: Límite total de resultados (None para todos)
+            fields: Campos a pedir (por defecto LIST_FIELDS)
+            expand: Expansiones del issue (ej: 'changelog')
+        
+        Yields:
+            List[Dict]: Issues crudos de cada página (nunca vacía)
+        """
+        if not self.is_connected:
+            raise Exception("No conectado a Jira")
+        
+        fields = list(fields or self.LIST_FIELDS)
+        is_cloud = getattr(self.jira, '_is_cloud', False)
+        next_page_token = None
+        start_at = 0
+        delivered = 0
             
-            issues = self.jira.search_issues(jql, maxResults=max_results)
+        while max_results is None or delivered < max_results:
+            batch_size = page_size if max_results is None else min(page_size, max_results - delivered)
             
-            result = []
-            for issue in issues:
-                issue_data = {
-                    'key': issue.key,
-                    'summary': issue.fields.summary,
-                    'description': getattr(issue.fields, 'description', '') or '',
-                    'status': issue.fields.status.name,
-                    'priority': getattr(issue.fields.priority, 'name', 'No Priority') if hasattr(issue.fields, 'priority') and issue.fields.priority else 'No Priority',
-                    'issue_type': issue.fields.issuetype.name,
-                    'project': issue.fields.project.key,
-                    'project_name': issue.fields.project.name,
-                    'assignee': getattr(issue.fields.assignee, 'displayName', 'Unassigned') if issue.fields.assignee else 'Unassigned',
-                    'reporter': getattr(issue.fields.reporter, 'displayName', 'Unknown') if issue.fields.reporter else 'Unknown',
-                    'created': str(issue.fields.created)[:10] if issue.fields.created else 'N/A',
-                    'updated': str(issue.fields.updated)[:10] if issue.fields.updated else 'N/A',
-                    'url': f"{self.server_url}/browse/{issue.key}"
-                }
-                result.append(issue_data)
+            # python-jira traduce los nombres de campos sobre la lista recibida
+            if is_cloud:
+                response = self.jira.enhanced_search_issues(
+                    jql, nextPageToken=next_page_token, maxResults=batch_size,
+                    fields=fields, expand=expand, json_result=True
+                )
+                raw_issues = response.get('issues', [])
+                next_page_token = response.get('nextPageToken')
+                is_last = response.get('isLast', not next_page_token) or not next_page_token
+            else:
+                response = self.jira.search_issues(
+                    jql, startAt=start_at, maxResults=batch_size,
+                    fields=fields, expand=expand, json_result=True
+                )
+                raw_issues = response.get('issues', [])
+                start_at += len(raw_issues)
+                is_last = len(raw_issues) < batch_size or start_at >= response.get('total', 0)
                 
-            return result
+            delivered += len(raw_issues)
+            if raw_issues:
+                yield raw_issues
             
-        except Exception as e:
-            raise Exception(f"Error obteniendo issues: {e}")
+            if is_last or not raw_issues:
+                break
     
     def get_projects(self) -> List[Dict]:
         """
@@ -119,115 +376,528 @@ class JiraService:
         except Exception as e:
             raise Exception(f"Error obteniendo proyectos: {e}")
     
-    def get_issues_by_project(self, project_key: str, max_results: int = 30) -> List[Dict]:
+    def get_issues_by_project(self, project_key: str, max_results: int = 30) -> List[JiraIssueRecord]:
         """
         Obtiene issues de un proyecto específico
         
         Args:
             project_key: Clave del proyecto
-            max_results: Número máximo de resultados
+            max_results: Número máximo de resultados (None para todos)
             
         Returns:
-            List[Dict]: Lista de issues del proyecto
+            List[JiraIssueRecord]: Lista de issues del proyecto
+        """
+        try:
+            return [issue for page in self.iter_project_issue_pages(project_key, max_results=max_results) for issue in page]
+        except Exception as e:
+            raise Exception(f"Error obteniendo issues del proyecto: {e}")
+    
+    def iter_project_issue_pages(self, project_key: str, page_size: int = 100, max_results: int = None,
+                                 use_cache: bool = True) -> Iterator[List[JiraIssueRecord]]:
+        """Entrega por páginas los issues de un proyecto"""
+        return self.iter_search_pages(self.PROJECT_JQL.format(project_key=project_key), page_size, max_results,
+                                      use_cache=use_cache)
+    
+    @staticmethod
+    def updated_sort_key(issue) -> float:
+        """Fecha de actualización de un issue como epoch para ordenar"""
+        updated_at = issue.get('updated_at') or ''
+        try:
+            return datetime.strptime(updated_at, '%Y-%m-%dT%H:%M:%S.%f%z').timestamp()
+        except ValueError:
+            return 0.0
+    
+    @classmethod
+    def merge_by_updated(cls, issue_lists) -> List[JiraIssueRecord]:
+        """Une listas ya ordenadas por updated DESC en una sola lista ordenada"""
+        return list(heapq.merge(*issue_lists, key=cls.updated_sort_key, reverse=True))
+    
+    def load_projects_issues(self, project_keys: List[str], store=None,
+                             on_progress: Callable[[str, int], None] = None,
+                             on_project_loaded: Callable[[str, List[JiraIssueRecord], str], None] = None,
+                             should_stop: Callable[[], bool] = None) -> List[JiraIssueRecord]:
+        """
+        Carga los issues de varios proyectos en paralelo y los une por fecha de actualización
+        
+        Con un almacén local cada proyecto se sincroniza con la misma consulta
+        guardada que la vista de un solo proyecto, así ambas comparten la caché.
+        
+        Args:
+            project_keys: Claves de los proyectos
+            store: JiraIssueStore opcional para sincronizar incrementalmente
+            on_progress: Callback (proyecto, issues recibidos en la página)
+            on_project_loaded: Callback (proyecto, issues, error) al terminar cada proyecto
+            should_stop: Callback que indica si se canceló la carga
+        
+        Returns:
+            List[JiraIssueRecord]: Issues de todos los proyectos, del más reciente al más antiguo
         """
         if not self.is_connected:
             raise Exception("No conectado a Jira")
+        if not project_keys:
+            return []
+        
+        def load_project(project_key):
+            report = (lambda page: on_progress(project_key, len(page))) if on_progress else None
+            if store is not None:
+                return self.sync_saved_query(store, f"project:{project_key}",
+                                             self.PROJECT_JQL.format(project_key=project_key),
+                                             on_page=report)
+            issues = []
+            for page in self.iter_project_issue_pages(project_key):
+                if should_stop and should_stop():
+                    break
+                issues.extend(page)
+                if report:
+                    report(page)
+            return issues
         
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=min(self.PROJECT_MAX_WORKERS, len(project_keys)))
+        futures = {executor.submit(load_project, project_key): project_key for project_key in project_keys}
         try:
-            jql = f'project = "{project_key}" ORDER BY updated DESC'
-            
-            issues = self.jira.search_issues(jql, maxResults=max_results)
+            for future in as_completed(futures):
+                if should_stop and should_stop():
+                    break
+                project_key = futures[future]
+                try:
+                    results[project_key] = future.result()
+                    error = ''
+                except Exception as e:
+                    results[project_key] = []
+                    error = str(e)
+                if on_project_loaded:
+                    on_project_loaded(project_key, results[project_key], error)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return self.merge_by_updated(results[key] for key in project_keys if key in results)
+    
+    def search_issues(self, jql: str, max_results: int = 50) -> List[JiraIssueRecord]:
+        """
+        Busca issues usando JQL personalizado
+        
+        Args:
+            jql: Query JQL
+            max_results: Número máximo de resultados (None para todos)
             
-            result = []
+        Returns:
+            List[JiraIssueRecord]: Lista de issues encontradas
+        """
+        try:
+            return [issue for page in self.iter_search_pages(jql, max_results=max_results) for issue in page]
+        except Exception as e:
+            raise Exception(f"Error en búsqueda JQL: {e}")
+    
+    def get_store_scope(self) -> str:
+        """Identifica al servidor y usuario actuales dentro del almacén local"""
+        return f"{self.server_url}|{self.username}"
+    
+    def format_jql_datetime(self, timestamp: float) -> str:
+        """Formatea un epoch como fecha JQL en la zona horaria del usuario de Jira"""
+        tz = None
+        if self.user_timezone:
+            try:
+                from zoneinfo import ZoneInfo
+                tz = ZoneInfo(self.user_timezone)
+            except Exception:
+                tz = None
+        moment = datetime.fromtimestamp(timestamp, tz) if tz else datetime.fromtimestamp(timestamp)
+        return moment.strftime('%Y/%m/%d %H:%M')
+    
+    @staticmethod
+    def split_order_by(jql: str) -> Tuple[str, str]:
+        """Separa la cláusula ORDER BY para poder agregar condiciones a la JQL"""
+        match = re.search(r'\s+ORDER\s+BY\s+.*$', jql, re.IGNORECASE | re.DOTALL)
+        if not match:
+            return jql.strip(), ''
+        return jql[:match.start()].strip(), match.group(0).strip()
+    
+    def count_issues(self, jql: str) -> int:
+        """
+        Cuenta los issues de una JQL sin descargarlos
+        
+        En Jira Cloud usa el endpoint de conteo aproximado; en Jira Server una
+        búsqueda con maxResults=0, que solo devuelve el total.
+        """
+        if not self.is_connected:
+            raise Exception("No conectado a Jira")
+        
+        try:
+            if getattr(self.jira, '_is_cloud', False):
+                return int(self.jira.approximate_issue_count(jql) or 0)
+            response = self.jira.search_issues(jql, maxResults=0, fields='key', json_result=True)
+            return int(response.get('total', 0))
+        except Exception as e:
+            raise Exception(f"Error contando issues: {e}")
+    
+    def get_facet_values(self, facet: str) -> List[str]:
+        """Obtiene (y guarda en caché) los valores posibles de una faceta"""
+        cached = self.metadata_cache.get(facet)
+        if cached is not None:
+            return cached
+        
+        if facet == 'status':
+            values = sorted({status.name for status in self.jira.statuses()})
+        elif facet == 'priority':
+            values = [priority.name for priority in self.jira.priorities()]
+        elif facet == 'project':
+            values = [project.key for project in self.jira.projects()]
+        elif facet == 'issuetype':
+            values = sorted({issue_type.name for issue_type in self.jira.issue_types()})
+        else:
+            raise ValueError(f"Faceta no soportada: {facet}")
+        
+        self.metadata_cache.put(facet, values)
+        return values
+    
+    def count_loaded_facets(self, issues: List, facets: Tuple[str, ...] = ('status', 'priority', 'project')) -> Dict:
+        """Conteos por faceta calculados con issues ya descargados (mismo formato que get_facet_counts)"""
+        counts = {'total': len(issues)}
+        for facet in facets:
+            facet_counts = {}
             for issue in issues:
-                issue_data = {
-                    'key': issue.key,
-                    'summary': issue.fields.summary,
-                    'status': issue.fields.status.name,
-                    'priority': getattr(issue.fields.priority, 'name', 'No Priority') if hasattr(issue.fields, 'priority') and issue.fields.priority else 'No Priority',
-                    'issue_type': issue.fields.issuetype.name,
-                    'assignee': getattr(issue.fields.assignee, 'displayName', 'Unassigned') if issue.fields.assignee else 'Unassigned',
-                    'updated': str(issue.fields.updated)[:10] if issue.fields.updated else 'N/A',
-                    'url': f"{self.server_url}/browse/{issue.key}"
-                }
-                result.append(issue_data)
-                
-            return result
+                value = issue.get(facet)
+                if value:
+                    facet_counts[value] = facet_counts.get(value, 0) + 1
+            # Orden de Jira si los valores ya están en caché (p. ej. prioridades)
+            order = self.metadata_cache.get(facet) or sorted(facet_counts)
+            counts[facet] = {value: facet_counts[value] for value in order if value in facet_counts}
+            counts[facet].update((value, count) for value, count in facet_counts.items() if value not in counts[facet])
+        return counts
+    
+    def get_facet_counts(self, jql: str, facets: Tuple[str, ...] = ('status', 'priority', 'project'),
+                         loaded: List = None) -> Dict:
+        """
+        Cuenta los issues de una JQL por estado, prioridad y proyecto
+        
+        Si se pasan los issues ya descargados de la misma JQL, se pide solo el
+        total y, cuando la lista está completa, los conteos se calculan con
+        ella. Si no (o la lista está truncada), se lanza una consulta de conteo
+        por valor de cada faceta en paralelo, sin descargar issues, con un
+        máximo de COUNT_MAX_QUERIES consultas: las facetas que no entran, o que
+        tienen más de COUNT_MAX_FACET_VALUES valores, se omiten.
+        
+        Args:
+            jql: Query JQL base
+            facets: Facetas a contar
+            loaded: Issues ya descargados de la JQL
+        
+        Returns:
+            Dict: {'total': int, faceta: {valor: cantidad}} solo con valores > 0
+        """
+        if not self.is_connected:
+            raise Exception("No conectado a Jira")
+        
+        try:
+            base_jql, _ = self.split_order_by(jql)
+            queries = {('total', None): base_jql}
+            counts = {'total': 0}
+            if loaded is not None:
+                counts['total'] = self.count_issues(base_jql)
+                if len(loaded) >= counts['total']:
+                    return self.count_loaded_facets(loaded, facets)
+                del queries[('total', None)]
+            facet_values = {}
+            for facet in facets:
+                values = self.get_facet_values(facet)
+                if len(values) > self.COUNT_MAX_FACET_VALUES or len(queries) + len(values) > self.COUNT_MAX_QUERIES:
+                    print(f"Conteo por {facet} omitido: {len(values)} valores")
+                    continue
+                counts[facet] = {}
+                facet_values[facet] = values
+                for value in values:
+                    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+                    queries[(facet, value)] = f'({base_jql}) AND {facet} = "{escaped}"'
             
+            with ThreadPoolExecutor(max_workers=max(1, min(self.COUNT_MAX_WORKERS, len(queries)))) as executor:
+                futures = {executor.submit(self.count_issues, query): target
+                           for target, query in queries.items()}
+                for future in as_completed(futures):
+                    facet, value = futures[future]
+                    try:
+                        count = future.result()
+                    except Exception as e:
+                        print(f"Error contando {facet} = {value}: {e}")
+                        continue
+                    if facet == 'total':
+                        counts['total'] = count
+                    elif count:
+                        counts[facet][value] = count
+            
+            # Respetar el orden de Jira (p. ej. prioridades de mayor a menor)
+            for facet, values in facet_values.items():
+                counts[facet] = {value: counts[facet][value] for value in values if value in counts[facet]}
+            return counts
+        
         except Exception as e:
-            raise Exception(f"Error obteniendo issues del proyecto: {e}")
+            raise Exception(f"Error obteniendo conteos: {e}")
     
-    def search_issues(self, jql: str, max_results: int = 50) -> List[Dict]:
+    def sync_saved_query(self, store, query_id: str, jql: str,
+                         on_page: Callable[[List[JiraIssueRecord]], None] = None,
+                         use_cache: bool = True) -> List[JiraIssueRecord]:
         """
-        Busca issues usando JQL personalizado
+        Sincroniza una consulta guardada con el almacén local
+        
+        La primera vez (o si cambió la JQL) descarga todo y entrega cada página a
+        on_page. Después solo pide los issues con updated >= última sincronización,
+        una lista liviana de claves para detectar los que salieron de la consulta y
+        los datos de los que entraron sin haber cambiado.
         
         Args:
+            store: JiraIssueStore donde se guardan los resultados
+            query_id: Identificador de la consulta guardada
             jql: Query JQL
-            max_results: Número máximo de resultados
-            
+            on_page: Callback opcional para cada página de una descarga completa
+            use_cache: Omitir la sincronización si la consulta se sincronizó hace
+                menos de QUERY_CACHE_TTL segundos y ningún cambio la invalidó
+        
         Returns:
-            List[Dict]: Lista de issues encontradas
+            List[JiraIssueRecord]: Issues de la consulta ya reconciliados
         """
         if not self.is_connected:
             raise Exception("No conectado a Jira")
         
+        # Entrada de query_cache que marca la consulta como recién sincronizada
+        cache_key = self.query_cache.make_key(jql, ('sync', query_id))
+        if use_cache:
+            cached_pages = self.query_cache.get(cache_key)
+            if cached_pages is not None:
+                return [issue for page in cached_pages for issue in page]
+        
         try:
-            issues = self.jira.search_issues(jql, maxResults=max_results)
+            scope = self.get_store_scope()
+            state = store.get_sync_state(scope, query_id)
+            sync_started = time.time()
             
-            result = []
-            for issue in issues:
-                issue_data = {
-                    'key': issue.key,
-                    'summary': issue.fields.summary,
-                    'status': issue.fields.status.name,
-                    'priority': getattr(issue.fields.priority, 'name', 'No Priority') if hasattr(issue.fields, 'priority') and issue.fields.priority else 'No Priority',
-                    'issue_type': issue.fields.issuetype.name,
-                    'assignee': getattr(issue.fields.assignee, 'displayName', 'Unassigned') if issue.fields.assignee else 'Unassigned',
-                    'url': f"{self.server_url}/browse/{issue.key}"
-                }
-                result.append(issue_data)
+            if state is None or state['jql'] != jql:
+                keys = []
+                for page in self.iter_search_pages(jql, use_cache=False):
+                    store.upsert_issues(scope, page)
+                    keys.extend(issue.key for issue in page)
+                    if on_page:
+                        on_page(page)
+                store.replace_members(scope, query_id, keys)
+            else:
+                base_jql, order_by = self.split_order_by(jql)
+                since = self.format_jql_datetime(state['last_sync'] - self.SYNC_OVERLAP_SECONDS)
+                delta_jql = f'({base_jql}) AND updated >= "{since}" {order_by}'.strip()
+                for page in self.iter_search_pages(delta_jql, use_cache=False):
+                    store.upsert_issues(scope, page)
                 
-            return result
+                # Membresía actual con solo la clave de cada issue
+                key_pages = self.iter_search_pages(jql, page_size=500, fields=['key'], use_cache=False)
+                current_keys = [issue.key for page in key_pages for issue in page]
+                
+                stored_keys = store.get_stored_keys(scope, current_keys)
+                missing_keys = [key for key in current_keys if key not in stored_keys]
+                for start in range(0, len(missing_keys), 100):
+                    chunk = missing_keys[start:start + 100]
+                    for page in self.iter_search_pages(f'key in ({",".join(chunk)})', use_cache=False):
+                        store.upsert_issues(scope, page)
+                
+                store.replace_members(scope, query_id, current_keys)
             
+            store.set_sync_state(scope, query_id, jql, sync_started)
+            issues = store.load_query(scope, query_id)
+            self.query_cache.put(cache_key, [issues])
+            return issues
+        
         except Exception as e:
-            raise Exception(f"Error en búsqueda JQL: {e}")
+            raise Exception(f"Error sincronizando issues: {e}")
     
-    def get_user_info(self) -> Dict:
+    def get_issue_detail(self, issue_key: str, use_cache: bool = True) -> Dict:
         """
-        Obtiene información del usuario actual
+        Obtiene el detalle de un issue (descripción, comentarios, enlaces y adjuntos)
+        
+        Args:
+            issue_key: Clave del issue
+            use_cache: Usar el detalle en caché si existe
         
         Returns:
-            Dict: Información del usuario
+            Dict: Detalle del issue
         """
         if not self.is_connected:
             raise Exception("No conectado a Jira")
         
+        if use_cache:
+            cached = self.detail_cache.get(issue_key)
+            if cached is not None:
+                return cached
+        
         try:
-            user = self.jira.myself()
-            return {
-                'name': user['displayName'],
-                'email': user['emailAddress'],
-                'account_id': user['accountId'],
-                'active': user['active'],
-                'timezone': user.get('timeZone', 'Unknown')
-            }
+            issue = self.jira.issue(issue_key, fields=','.join(self.DETAIL_FIELDS))
+            fields = issue.raw.get('fields') or {}
+            
+            description = fields.get('description')
+            comments = []
+            for comment in (fields.get('comment') or {}).get('comments', []):
+                body = comment.get('body')
+                comments.append({
+                    'author': (comment.get('author') or {}).get('displayName', 'Unknown'),
+                    'created': (comment.get('created') or '')[:16].replace('T', ' '),
+                    'body': body if isinstance(body, str) else ''
+                })
             
+            links = []
+            for link in fields.get('issuelinks') or []:
+                link_type = link.get('type') or {}
+                if 'outwardIssue' in link:
+                    linked, relation = link['outwardIssue'], link_type.get('outward', '')
+                else:
+                    linked, relation = link.get('inwardIssue') or {}, link_type.get('inward', '')
+                linked_fields = linked.get('fields') or {}
+                links.append({
+                    'relation': relation,
+                    'key': linked.get('key', 'N/A'),
+                    'summary': linked_fields.get('summary', ''),
+                    'status': (linked_fields.get('status') or {}).get('name', 'N/A')
+                })
+            
+            attachments = []
+            for attachment in fields.get('attachment') or []:
+                attachments.append({
+                    'filename': attachment.get('filename', ''),
+                    'size': attachment.get('size', 0),
+                    'author': (attachment.get('author') or {}).get('displayName', 'Unknown'),
+                    'url': attachment.get('content', '')
+                })
+            
+            detail = {
+                'key': issue_key,
+                'description': description if isinstance(description, str) else '',
+                'comments': comments,
+                'links': links,
+                'attachments': attachments
+            }
+            self.detail_cache.put(issue_key, detail)
+            return detail
+        
         except Exception as e:
-            raise Exception(f"Error obteniendo info del usuario: {e}")
+            raise Exception(f"Error obteniendo detalle del issue: {e}")
+    
+    def apply_webhook_event(self, event: str, payload: Dict) -> Optional[Dict]:
+        """
+        Aplica a las cachés un evento de webhook de issues o comentarios
+        
+        Las búsquedas en caché se corrigen como en una transición: se descartan
+        las que filtran por algún campo que cambió y se actualizan en el lugar
+        las que solo contienen el issue.
+        
+        Args:
+            event: webhookEvent del payload (jira:issue_updated, comment_created...)
+            payload: JSON del webhook
+        
+        Returns:
+            Optional[Dict]: key, action (created, updated, deleted o commented),
+                record (JiraIssueRecord o None) y fields (campos JQL que cambiaron);
+                None si el evento no corresponde a la conexión actual
+        """
+        issue = payload.get('issue') or {}
+        issue_key = issue.get('key')
+        if not self.is_connected or not issue_key:
+            return None
+        # Un receptor puede recibir eventos de otro sitio de Jira
+        if issue.get('self') and not issue['self'].startswith(f"{self.server_url}/"):
+            return None
+        
+        self.detail_cache.discard(issue_key)
+        if event == 'jira:issue_deleted':
+            self.invalidate_transitions(issue_key)
+            self.query_cache.update_issue(issue_key, changes=None)
+            return {'key': issue_key, 'action': 'deleted', 'record': None, 'fields': set()}
+        
+        if event in self.WEBHOOK_COMMENT_EVENTS:
+            self.query_cache.update_issue(issue_key, self.COMMENT_FILTER_FIELDS, changes={})
+            return {'key': issue_key, 'action': 'commented', 'record': None, 'fields': {'comment'}}
+        
+        if event not in ('jira:issue_created', 'jira:issue_updated'):
+            return None
+        
+        record = JiraIssueRecord.from_json(issue, self.server_url)
+        if event == 'jira:issue_created':
+            # Un issue nuevo puede entrar en cualquier búsqueda
+            self.query_cache.clear()
+            return {'key': issue_key, 'action': 'created', 'record': record, 'fields': set()}
+        
+        fields = {'updated'}
+        for item in (payload.get('changelog') or {}).get('items', []):
+            for name in (item.get('field'), item.get('fieldId')):
+                if name:
+                    fields.add(self.WEBHOOK_JQL_FIELDS.get(name, name))
+        if 'status' in fields:
+            fields.add('statusCategory')
+            self.issue_workflow_keys.discard(issue_key)
+        if 'resolution' in fields:
+            fields.add('resolved')
+        if 'issuetype' in fields:
+            self.issue_workflow_keys.discard(issue_key)
+        
+        # Las listas no guardan la descripción
+        changes = {field: value for field, value in record.to_dict().items()
+                   if field not in ('key', 'description')}
+        self.query_cache.update_issue(issue_key, tuple(sorted(fields)), changes)
+        return {'key': issue_key, 'action': 'updated', 'record': record, 'fields': fields}
+    
+    def get_user_info(self) -> Dict:
+        """
+        Obtiene información del usuario actual (guardada al conectar, sin peticiones)
+        
+        Returns:
+            Dict: Información del usuario
+        """
+        if not self.is_connected or not self.user_info:
+            raise Exception("No conectado a Jira")
+        return dict(self.user_info)
     
     def disconnect(self):
         """Desconecta de Jira"""
+        if isinstance(self.jira, ThreadLocalClient):
+            self.jira.close_all()
         self.jira = None
         self.server_url = None
         self.username = None
         self.is_connected = False
+        self.user_timezone = None
+        self.user_info = None
+        self.server_info = None
+        self.detail_cache.clear()
+        self.transition_cache.clear()
+        self.issue_workflow_keys.clear()
+        self.metadata_cache.clear()
+        self.query_cache.clear()
+    
+    @staticmethod
+    def get_workflow_key(issue_data) -> Optional[Tuple[str, str, str]]:
+        """Clave (proyecto, tipo de issue, estado) que determina las transiciones de un issue"""
+        if not issue_data:
+            return None
+        workflow_key = (issue_data.get('project'), issue_data.get('issue_type'), issue_data.get('status'))
+        if not all(workflow_key) or 'N/A' in workflow_key:
+            return None
+        return workflow_key
     
-    def get_issue_transitions(self, issue_key: str) -> List[Dict]:
+    @staticmethod
+    def _parse_transitions(transitions) -> List[Dict]:
+        """Convierte las transiciones del JSON de Jira al formato de la UI"""
+        return [{
+            'id': transition['id'],
+            'name': transition['name'],
+            'to_status': transition['to']['name']
+        } for transition in transitions]
+    
+    def get_issue_transitions(self, issue_key: str, issue_data: Dict = None) -> List[Dict]:
         """
         Obtiene las transiciones disponibles para un issue
         
+        Las transiciones se guardan por (proyecto, tipo de issue, estado): con los
+        datos del issue de la lista no hace falta ninguna petición si ya se
+        consultó ese workflow. Sin ellos se pide el issue con sus transiciones en
+        una sola petición.
+        
         Args:
             issue_key: Clave del issue (ej: PROJ-123)
+            issue_data: Datos del issue ya cargados (proyecto, tipo y estado)
             
         Returns:
             List[Dict]: Lista de transiciones disponibles
@@ -235,25 +905,39 @@ class JiraService:
         if not self.is_connected:
             raise Exception("No conectado a Jira")
         
+        workflow_key = self.get_workflow_key(issue_data)
+        if workflow_key:
+            cached = self.transition_cache.get(workflow_key)
+            if cached is not None:
+                self.issue_workflow_keys.put(issue_key, workflow_key)
+                return cached
+        
         try:
-            issue = self.jira.issue(issue_key)
-            transitions = self.jira.transitions(issue)
+            if workflow_key:
+                transitions = self.jira.transitions(issue_key)
+            else:
+                raw = self.jira.issue(issue_key, fields='project,issuetype,status', expand='transitions').raw
+                workflow_key = self.get_workflow_key(JiraIssueRecord.from_json(raw, self.server_url))
+                transitions = raw.get('transitions', [])
             
-            result = []
-            for transition in transitions:
-                transition_data = {
-                    'id': transition['id'],
-                    'name': transition['name'],
-                    'to_status': transition['to']['name']
-                }
-                result.append(transition_data)
-                
+            result = self._parse_transitions(transitions)
+            if workflow_key:
+                self.transition_cache.put(workflow_key, result)
+                self.issue_workflow_keys.put(issue_key, workflow_key)
             return result
             
         except Exception as e:
             raise Exception(f"Error obteniendo transiciones: {e}")
     
-    def transition_issue(self, issue_key: str, transition_id: str, comment: str = None) -> bool:
+    def invalidate_transitions(self, issue_key: str):
+        """Descarta las transiciones en caché del workflow de un issue"""
+        workflow_key = self.issue_workflow_keys.get(issue_key)
+        if workflow_key:
+            self.transition_cache.discard(workflow_key)
+        self.issue_workflow_keys.discard(issue_key)
+    
+    def transition_issue(self, issue_key: str, transition_id: str, comment: str = None,
+                         to_status: str = None) -> bool:
         """
         Realiza una transición de estado en un issue
         
@@ -261,6 +945,7 @@ class JiraService:
             issue_key: Clave del issue (ej: PROJ-123)
             transition_id: ID de la transición a realizar
             comment: Comentario opcional para la transición
+            to_status: Estado destino, si se conoce, para corregir las búsquedas en caché
             
         Returns:
             bool: True si la transición fue exitosa
@@ -269,21 +954,20 @@ class JiraService:
             raise Exception("No conectado a Jira")
         
         try:
-            issue = self.jira.issue(issue_key)
-            
-            # Preparar datos de la transición
-            transition_data = {}
-            
-            # Agregar comentario si se proporciona
-            if comment:
-                transition_data['comment'] = [{'body': comment}]
-            
-            # Realizar la transición
-            self.jira.transition_issue(issue, transition_id, **transition_data)
-            return True
-            
+            # Se transiciona por clave y con el ID numérico: una sola petición
+            self.jira.transition_issue(issue_key, transition_id, comment=comment or None)
         except Exception as e:
+            # El workflow pudo cambiar; la próxima consulta pide las transiciones de nuevo
+            self.invalidate_transitions(issue_key)
             raise Exception(f"Error realizando transición: {e}")
+            
+        self.detail_cache.discard(issue_key)
+        # El issue cambió de estado y con ello su clave de workflow
+        self.issue_workflow_keys.discard(issue_key)
+        # Solo se tocan las búsquedas en caché que contienen el issue o filtran por estado
+        changes = {'status': to_status} if to_status else None
+        self.query_cache.update_issue(issue_key, self.TRANSITION_FILTER_FIELDS, changes)
+        return True
     
     def add_comment_to_issue(self, issue_key: str, comment: str) -> bool:
         """
@@ -300,14 +984,44 @@ class JiraService:
             raise Exception("No conectado a Jira")
         
         try:
-            issue = self.jira.issue(issue_key)
-            self.jira.add_comment(issue, comment)
+            self.jira.add_comment(issue_key, comment)
+            self.detail_cache.discard(issue_key)
+            # Un comentario no cambia los campos de la lista: se conservan las búsquedas que lo contienen
+            self.query_cache.update_issue(issue_key, self.COMMENT_FILTER_FIELDS, changes={})
             return True
             
         except Exception as e:
             raise Exception(f"Error agregando comentario: {e}")
     
-    def update_issue_status_by_name(self, issue_key: str, target_status: str, comment: str = None) -> bool:
+    def add_attachment(self, issue_key: str, file_obj, filename: str) -> Dict:
+        """
+        Adjunta un archivo a un issue
+        
+        El archivo se envía como multipart en streaming (se lee por partes
+        desde file_obj, que debe poder volver al inicio para los reintentos).
+        
+        Args:
+            issue_key: Clave del issue
+            file_obj: Objeto tipo archivo abierto en modo binario
+            filename: Nombre con el que se adjunta
+            
+        Returns:
+            Dict: id, filename y size del adjunto creado
+        """
+        if not self.is_connected:
+            raise Exception("No conectado a Jira")
+        
+        try:
+            attachment = self.jira.add_attachment(issue_key, attachment=file_obj, filename=filename)
+        except Exception as e:
+            raise Exception(f"Error adjuntando archivo: {e}")
+        
+        # El detalle en caché ya no incluye todos los adjuntos
+        self.detail_cache.discard(issue_key)
+        return {'id': str(attachment.id), 'filename': attachment.filename, 'size': attachment.size}
+    
+    def update_issue_status_by_name(self, issue_key: str, target_status: str, comment: str = None,
+                                    issue_data: Dict = None) -> bool:
         """
         Cambia el estado de un issue usando el nombre del estado
         
@@ -315,6 +1029,7 @@ class JiraService:
             issue_key: Clave del issue
             target_status: Nombre del estado objetivo (ej: "Done", "In Progress")
             comment: Comentario opcional
+            issue_data: Datos del issue ya cargados para usar las transiciones en caché
             
         Returns:
             bool: True si el cambio fue exitoso
@@ -324,7 +1039,7 @@ class JiraService:
         
         try:
             # Obtener transiciones disponibles
-            transitions = self.get_issue_transitions(issue_key)
+            transitions = self.get_issue_transitions(issue_key, issue_data)
             
             # Buscar la transición que lleva al estado objetivo
             target_transition = None
@@ -334,10 +1049,335 @@ class JiraService:
                     break
             
             if not target_transition:
+                # Las transiciones en caché pueden estar desactualizadas
+                self.invalidate_transitions(issue_key)
                 raise Exception(f"No se encontró transición al estado '{target_status}'. Estados disponibles: {[t['to_status'] for t in transitions]}")
             
             # Realizar la transición
-            return self.transition_issue(issue_key, target_transition['id'], comment)
+            return self.transition_issue(issue_key, target_transition['id'], comment,
+                                         to_status=target_transition['to_status'])
             
         except Exception as e:
             raise Exception(f"Error cambiando estado: {e}")
+
+    def _run_bulk(self, issue_keys: List[str], operation: Callable[[str], bool],
+                  should_stop: Callable[[], bool] = None) -> Iterator[Dict]:
+        """
+        Ejecuta una operación sobre varios issues en un pool acotado
+        
+        Yields:
+            Dict: Resultado de cada issue (key, success, error) a medida que termina
+        """
+        if not self.is_connected:
+            raise Exception("No conectado a Jira")
+        if not issue_keys:
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=min(self.BULK_MAX_WORKERS, len(issue_keys)))
+        futures = {executor.submit(operation, key): key for key in issue_keys}
+        try:
+            for future in as_completed(futures):
+                issue_key = futures[future]
+                try:
+                    future.result()
+                    yield {'key': issue_key, 'success': True, 'error': None}
+                except Exception as e:
+                    yield {'key': issue_key, 'success': False, 'error': str(e)}
+                if should_stop and should_stop():
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def bulk_transition_issues(self, issues: List[Dict], target_status: str, comment: str = None,
+                               should_stop: Callable[[], bool] = None) -> Iterator[Dict]:
+        """
+        Cambia el estado de varios issues en paralelo
+        
+        Antes de lanzar el pool se consultan las transiciones de un issue por
+        workflow, así el resto las toma de la caché.
+        
+        Args:
+            issues: Issues a transicionar (con proyecto, tipo y estado)
+            target_status: Nombre del estado objetivo
+            comment: Comentario opcional para cada transición
+            should_stop: Callback que indica si se canceló la operación
+        
+        Yields:
+            Dict: Resultado de cada issue (key, success, error) a medida que termina
+        """
+        issues_by_key = {issue['key']: issue for issue in issues}
+        warmed = set()
+        for issue in issues_by_key.values():
+            workflow_key = self.get_workflow_key(issue)
+            if workflow_key and workflow_key not in warmed:
+                warmed.add(workflow_key)
+                try:
+                    self.get_issue_transitions(issue['key'], issue)
+                except Exception as e:
+                    print(f"Error precargando transiciones de {issue['key']}: {e}")
+        
+        def transition(issue_key):
+            return self.update_issue_status_by_name(issue_key, target_status, comment,
+                                                    issue_data=issues_by_key[issue_key])
+        
+        return self._run_bulk(list(issues_by_key), transition, should_stop)
+    
+    def bulk_add_comment(self, issue_keys: List[str], comment: str,
+                         should_stop: Callable[[], bool] = None) -> Iterator[Dict]:
+        """
+        Agrega el mismo comentario a varios issues en paralelo
+        
+        Yields:
+            Dict: Resultado de cada issue (key, success, error) a medida que termina
+        """
+        return self._run_bulk(list(dict.fromkeys(issue_keys)),
+                              lambda issue_key: self.add_comment_to_issue(issue_key, comment),
+                              should_stop)
+
+    def get_qa_autofill(self, issue_key: str, role_fields: Dict[str, List[str]] = None) -> Dict:
+        """
+        Reúne en paralelo los datos para autocompletar una tarea QA desde un issue
+        
+        El issue (con expand=names para reconocer los campos personalizados por su
+        nombre) y sus remote links se piden a la vez; los PRs del panel de
+        desarrollo se piden en el mismo hilo apenas se conoce el id del issue. Si
+        falla una fuente secundaria el resto igual se entrega.
+        
+        Args:
+            issue_key: Clave del issue (ej: PROJ-123)
+            role_fields: Rol de QA -> nombres de campos de usuario (por defecto QA_ROLE_FIELDS)
+        
+        Returns:
+            Dict: key, summary, url, prs, environments, qa_roles y errors
+        """
+        if not self.is_connected:
+            raise Exception("No conectado a Jira")
+        
+        role_fields = role_fields or self.QA_ROLE_FIELDS
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Cada llamada resuelve self.jira dentro del hilo del pool
+            issue_future = executor.submit(self._fetch_issue_with_dev_prs, issue_key)
+            links_future = executor.submit(lambda: self.jira.remote_links(issue_key))
+            
+            try:
+                raw, dev_prs, errors = issue_future.result()
+            except Exception as e:
+                raise Exception(f"Error obteniendo issue para autocompletar: {e}")
+            try:
+                remote_links = [link.raw for link in links_future.result()]
+            except Exception as e:
+                remote_links = []
+                errors.append(f"Remote links: {e}")
+        
+        fields = raw.get('fields') or {}
+        names = raw.get('names') or {}
+        environments = self._find_environments(fields, names)
+        
+        # PRs del panel de desarrollo (con rama destino) y luego los de remote links
+        prs = []
+        seen_urls = set()
+        for pr in dev_prs + self._parse_remote_link_prs(remote_links):
+            if pr['url'] and pr['url'] not in seen_urls:
+                seen_urls.add(pr['url'])
+                branch = (pr.get('destination') or '').split('/')[0].lower()
+                pr['environment'] = self.BRANCH_ENVIRONMENTS.get(branch)
+                prs.append(pr)
+        
+        return {
+            'key': raw.get('key', issue_key),
+            'summary': fields.get('summary') or '',
+            'url': f"{self.server_url}/browse/{raw.get('key', issue_key)}",
+            'prs': prs,
+            'environments': environments,
+            'qa_roles': self._find_qa_roles(fields, names, role_fields),
+            'errors': errors
+        }
+    
+    def _fetch_issue_with_dev_prs(self, issue_key: str) -> Tuple[Dict, List[Dict], List[str]]:
+        """Pide el issue con los nombres de sus campos y después sus PRs del panel de desarrollo"""
+        raw = self.jira.issue(issue_key, expand='names').raw
+        errors = []
+        try:
+            dev_prs = self.get_dev_status_pull_requests(raw['id'])
+        except Exception as e:
+            dev_prs = []
+            errors.append(f"Panel de desarrollo: {e}")
+        return raw, dev_prs, errors
+    
+    def get_dev_status_pull_requests(self, issue_id: str) -> List[Dict]:
+        """
+        PRs de GitHub vinculados al issue en el panel de desarrollo
+        
+        Usa la API dev-status, disponible solo con la integración de GitHub instalada.
+        """
+        response = self.jira._session.get(
+            f"{self.server_url}/rest/dev-status/latest/issue/detail",
+            params={'issueId': issue_id, 'applicationType': 'GitHub', 'dataType': 'pullrequest'}
+        )
+        prs = []
+        for detail in response.json().get('detail', []):
+            for pr in detail.get('pullRequests', []):
+                prs.append({
+                    'url': pr.get('url'),
+                    'name': pr.get('name', ''),
+                    'status': pr.get('status', ''),
+                    'branch': (pr.get('source') or {}).get('branch', ''),
+                    'destination': (pr.get('destination') or {}).get('branch', '')
+                })
+        return prs
+    
+    def _parse_remote_link_prs(self, remote_links: List[Dict]) -> List[Dict]:
+        """PRs de GitHub entre los remote links del issue"""
+        prs = []
+        for link in remote_links:
+            link_object = link.get('object') or {}
+            url = link_object.get('url') or ''
+            if self.GITHUB_PR_URL.match(url):
+                prs.append({'url': url, 'name': link_object.get('title', ''), 'status': '',
+                            'branch': '', 'destination': ''})
+        return prs
+    
+    @staticmethod
+    def _field_text(value) -> str:
+        """Texto de un campo de Jira (texto, opción, versión, usuario o lista de ellos)"""
+        if not value:
+            return ''
+        if isinstance(value, list):
+            return ' '.join(JiraService._field_text(item) for item in value)
+        if isinstance(value, dict):
+            return value.get('name') or value.get('value') or value.get('displayName') or ''
+        return str(value)
+    
+    def _find_environments(self, fields: Dict, names: Dict) -> List[str]:
+        """Ambientes mencionados en Environment, labels, componentes, versiones y campos 'Ambiente'"""
+        texts = [self._field_text(fields.get(field)) for field in
+                 ('environment', 'labels', 'components', 'fixVersions')]
+        texts += [self._field_text(fields.get(field_id)) for field_id, name in names.items()
+                  if field_id.startswith('customfield_') and re.search(r'ambiente|environment', name or '', re.I)]
+        text = ' '.join(texts)
+        
+        # En el orden en que aparecen
+        found = []
+        for environment, keywords in self.ENVIRONMENT_KEYWORDS:
+            match = re.search(rf'\b({keywords})\b', text, re.IGNORECASE)
+            if match:
+                found.append((match.start(), environment))
+        return [environment for _, environment in sorted(found)]
+    
+    def _find_qa_roles(self, fields: Dict, names: Dict, role_fields: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Nombres de las personas en los campos de usuario de cada rol de QA"""
+        role_by_name = {name.lower(): role for role, field_names in role_fields.items() for name in field_names}
+        qa_roles = {role: [] for role in role_fields}
+        for field_id, name in names.items():
+            role = role_by_name.get((name or '').lower())
+            value = fields.get(field_id)
+            if not role or not value:
+                continue
+            for user in value if isinstance(value, list) else [value]:
+                display_name = user.get('displayName') if isinstance(user, dict) else str(user)
+                if display_name and display_name not in qa_roles[role]:
+                    qa_roles[role].append(display_name)
+        return qa_roles
+
+    def iter_changelog_pages(self, jql: str, page_size: int = CHANGELOG_PAGE_SIZE) -> Iterator[List[Tuple[str, List[Dict]]]]:
+        """
+        Descarga los changelogs de los issues de una JQL por páginas (expand=changelog)
+        
+        La búsqueda trae como máximo las 100 entradas más recientes de cada issue;
+        solo los issues con más historia piden el resto por separado.
+        
+        Yields:
+            List[Tuple[str, List[Dict]]]: (clave, entradas del changelog ordenadas por id)
+        """
+        try:
+            for raw_issues in self.iter_raw_search_pages(jql, page_size, fields=['status'], expand='changelog'):
+                page = []
+                for raw in raw_issues:
+                    changelog = raw.get('changelog') or {}
+                    histories = changelog.get('histories') or []
+                    if changelog.get('total', 0) > len(histories):
+                        histories = self.get_full_changelog(raw['key'])
+                    page.append((raw['key'], sorted(histories, key=lambda history: int(history['id']))))
+                yield page
+        except Exception as e:
+            raise Exception(f"Error descargando changelogs: {e}")
+    
+    def get_full_changelog(self, issue_key: str) -> List[Dict]:
+        """Changelog completo de un issue (paginado en Jira Cloud)"""
+        if not getattr(self.jira, '_is_cloud', False):
+            raw = self.jira._get_json(f'issue/{issue_key}', params={'expand': 'changelog', 'fields': 'status'})
+            return (raw.get('changelog') or {}).get('histories') or []
+        
+        histories = []
+        while True:
+            response = self.jira._get_json(f'issue/{issue_key}/changelog',
+                                           params={'startAt': len(histories), 'maxResults': 100})
+            values = response.get('values') or []
+            histories.extend(values)
+            if response.get('isLast', True) or not values:
+                return histories
+
+    def get_jql_autocomplete_data(self) -> Dict:
+        """
+        Reúne en paralelo los datos para autocompletar JQL sin conexión
+        
+        Campos, operadores y funciones vienen de jql/autocompletedata; los valores
+        de estado, proyecto, prioridad, tipo y usuario se guardan como
+        [texto visible, texto a insertar] (en Cloud los usuarios se insertan por
+        accountId). Si falla una fuente secundaria, el resto igual se entrega.
+        
+        Returns:
+            Dict: fields, functions, reserved y values (faceta -> pares)
+        """
+        if not self.is_connected:
+            raise Exception("No conectado a Jira")
+        
+        sources = {facet: (lambda facet=facet: self.get_facet_values(facet))
+                   for facet in ('status', 'project', 'priority', 'issuetype')}
+        sources['user'] = self.get_jql_users
+        
+        try:
+            with ThreadPoolExecutor(max_workers=len(sources) + 1) as executor:
+                # Cada llamada resuelve self.jira dentro del hilo del pool
+                autocomplete_future = executor.submit(lambda: self.jira._get_json('jql/autocompletedata'))
+                futures = {executor.submit(source): facet for facet, source in sources.items()}
+                values = {}
+                for future in as_completed(futures):
+                    facet = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Error obteniendo valores de {facet} para autocompletar: {e}")
+                        continue
+                    values[facet] = result if facet == 'user' else [[value, value] for value in result]
+                autocomplete = autocomplete_future.result()
+        except Exception as e:
+            raise Exception(f"Error obteniendo datos de autocompletado JQL: {e}")
+        
+        return {
+            'fields': [{'value': field.get('value', ''), 'name': field.get('displayName', ''),
+                        'operators': field.get('operators') or [], 'types': field.get('types') or [],
+                        'orderable': field.get('orderable') == 'true'}
+                       for field in autocomplete.get('visibleFieldNames') or [] if field.get('value')],
+            'functions': [{'value': function.get('value', ''), 'types': function.get('types') or []}
+                          for function in autocomplete.get('visibleFunctionNames') or [] if function.get('value')],
+            'reserved': autocomplete.get('jqlReservedWords') or [],
+            'values': values
+        }
+    
+    def get_jql_users(self) -> List[List[str]]:
+        """Usuarios activos como [nombre visible, valor para JQL]"""
+        users = []
+        if getattr(self.jira, '_is_cloud', False):
+            while len(users) < self.JQL_MAX_USERS:
+                page = self.jira._get_json('users/search', params={'startAt': len(users), 'maxResults': 200})
+                users.extend(page)
+                if len(page) < 200:
+                    break
+            return [[user.get('displayName', ''), user['accountId']] for user in users
+                    if user.get('accountType') == 'atlassian' and user.get('active', True) and user.get('accountId')]
+        
+        # En Server "." coincide con todos los usuarios
+        users = self.jira._get_json('user/search', params={'username': '.', 'maxResults': self.JQL_MAX_USERS})
+        return [[user.get('displayName', ''), user['name']] for user in users
+                if user.get('active', True) and user.get('name')]
@@ -31,6 +31,23 @@ class TransitionWorker(QThread):
         except Exception as e:
             self.transition_completed.emit(False, str(e))
 
+class TransitionsLoadWorker(QThread):
+    """Worker para cargar las transiciones disponibles en background"""
+    transitions_loaded = pyqtSignal(list)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, jira_service, issue_data):
+        super().__init__()
+        self.jira_service = jira_service
+        self.issue_data = issue_data
+    
+    def run(self):
+        try:
+            transitions = self.jira_service.get_issue_transitions(self.issue_data['key'], self.issue_data)
+            self.transitions_loaded.emit(transitions)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
 class JiraStatusDialog(QDialog):
     """Diálogo para cambiar el estado de un issue"""
     
@@ -42,6 +59,7 @@ class JiraStatusDialog(QDialog):
         self.issue_data = issue_data
         self.transitions = []
         self.worker = None
+        self.load_worker = None
         
         self.setWindowTitle(f"🔄 Cambiar Estado - {issue_data['key']}")
         self.setModal(True)
@@ -79,6 +97,7 @@ class JiraStatusDialog(QDialog):
         self.status_combo = QComboBox()
         self.status_combo.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
         self.status_combo.addItem("🔄 Cargando estados disponibles...")
+        self.status_combo.currentIndexChanged.connect(self.on_status_selected)
         layout.addWidget(self.status_combo)
         
         # Comentario
@@ -127,26 +146,31 @@ class JiraStatusDialog(QDialog):
         layout.addLayout(buttons_layout)
         
     def load_transitions(self):
-        """Carga las transiciones disponibles para el issue"""
-        try:
-            self.transitions = self.jira_service.get_issue_transitions(self.issue_data['key'])
+        """Carga las transiciones disponibles para el issue sin bloquear la UI"""
+        self.load_worker = TransitionsLoadWorker(self.jira_service, self.issue_data)
+        self.load_worker.transitions_loaded.connect(self.on_transitions_loaded)
+        self.load_worker.error_occurred.connect(self.on_transitions_error)
+        self.load_worker.start()
             
-            self.status_combo.clear()
-            if not self.transitions:
-                self.status_combo.addItem("❌ No hay transiciones disponibles")
-                return
+    def on_transitions_loaded(self, transitions):
+        """Muestra las transiciones disponibles"""
+        self.transitions = transitions
             
-            self.status_combo.addItem("Selecciona un nuevo estado...")
-            for transition in self.transitions:
-                self.status_combo.addItem(f"➡️ {transition['to_status']}")
-                self.status_combo.setItemData(self.status_combo.count() - 1, transition)
+        self.status_combo.clear()
+        if not self.transitions:
+            self.status_combo.addItem("❌ No hay transiciones disponibles")
+            return
             
-            self.status_combo.currentIndexChanged.connect(self.on_status_selected)
+        self.status_combo.addItem("Selecciona un nuevo estado...")
+        for transition in self.transitions:
+            self.status_combo.addItem(f"➡️ {transition['to_status']}")
+            self.status_combo.setItemData(self.status_combo.count() - 1, transition)
             
-        except Exception as e:
-            self.status_combo.clear()
-            self.status_combo.addItem(f"❌ Error: {str(e)}")
-            QMessageBox.critical(self, "Error", f"No se pudieron cargar los estados disponibles:\n{str(e)}")
+    def on_transitions_error(self, message):
+        """Maneja el error al cargar las transiciones"""
+        self.status_combo.clear()
+        self.status_combo.addItem(f"❌ Error: {message}")
+        QMessageBox.critical(self, "Error", f"No se pudieron cargar los estados disponibles:\n{message}")
     
     def on_status_selected(self, index):
         """Maneja la selección de un nuevo estado"""
@@ -208,3 +232,8 @@ class JiraStatusDialog(QDialog):
             self.accept()
         else:
             QMessageBox.critical(self, "❌ Error", f"Error al cambiar estado:\n{message}")
+            # El servicio descartó las transiciones en caché; recargar las vigentes
+            self.change_btn.setEnabled(False)
+            self.status_combo.clear()
+            self.status_combo.addItem("🔄 Cargando estados disponibles...")
+            self.load_transitions()
@@ -2,21 +2,36 @@
 Widget de Jira para la aplicación QA Generator
 """
 
+import time
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QLineEdit, QPushButton, QListWidget, QTextEdit,
-                           QMessageBox, QFrame, QScrollArea, QListWidgetItem,
+                           QLineEdit, QPushButton, QTextEdit,
+                           QMessageBox, QFrame, QScrollArea,
                            QTabWidget, QComboBox, QSplitter, QTreeWidget,
-                           QTreeWidgetItem, QProgressBar, QMenu)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QFont, QAction
+                           QTreeWidgetItem, QProgressBar, QMenu, QAbstractItemView,
+                           QListView, QCheckBox, QApplication, QCompleter)
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal, QModelIndex
+from PyQt6.QtGui import QFont, QAction, QStandardItemModel, QStandardItem
 from jira_service import JiraService
+from jira_issue_store import JiraIssueStore
+from jira_qa_metrics import QAMetricsService
+from jira_qa_metrics_dialog import JiraQAMetricsDialog
+from jira_issue_model import JiraIssueListModel, JiraIssueFilterProxyModel
 from jira_status_dialog import JiraStatusDialog
+from jira_bulk_dialog import JiraBulkDialog
+from jira_project_picker_dialog import JiraProjectPickerDialog
+from jql_autocomplete import JQLAutocompleteIndex, JQLMetadataCache
+from config import app_config
 from styles import ThemeManager
 
 class JiraWorker(QThread):
     """Worker thread para operaciones de Jira"""
-    issues_loaded = pyqtSignal(list)
+    issues_loaded = pyqtSignal(list)        # Todos los issues al terminar
+    issues_page_loaded = pyqtSignal(list)   # Cada página de issues apenas llega
     projects_loaded = pyqtSignal(list)
+    counts_loaded = pyqtSignal(dict)        # Conteos por faceta sin descargar issues
+    metadata_loaded = pyqtSignal(dict)      # Datos para autocompletar JQL
+    project_progress = pyqtSignal(str, int)       # Proyecto, issues recibidos en una página
+    project_loaded = pyqtSignal(str, list, str)   # Proyecto, issues, error
     error_occurred = pyqtSignal(str)
     
     def __init__(self, service, operation, **kwargs):
@@ -24,35 +39,217 @@ class JiraWorker(QThread):
         self.service = service
         self.operation = operation
         self.kwargs = kwargs
+        self._stop_requested = False
+    
+    def stop(self):
+        """Solicita cancelar la operación; se detiene antes de pedir la siguiente página"""
+        self._stop_requested = True
+    
+    def is_stopped(self):
+        """Indica si la operación fue cancelada"""
+        return self._stop_requested
         
     def run(self):
         try:
             if self.operation == "assigned_issues":
-                issues = self.service.get_assigned_issues(self.kwargs.get('max_results', 50))
-                self.issues_loaded.emit(issues)
+                self.emit_pages(self.service.iter_assigned_issue_pages(
+                    max_results=self.kwargs.get('max_results'),
+                    use_cache=self.kwargs.get('use_cache', True)
+                ))
             elif self.operation == "projects":
                 projects = self.service.get_projects()
                 self.projects_loaded.emit(projects)
             elif self.operation == "project_issues":
-                issues = self.service.get_issues_by_project(
+                self.emit_pages(self.service.iter_project_issue_pages(
                     self.kwargs.get('project_key'), 
-                    self.kwargs.get('max_results', 30)
-                )
-                self.issues_loaded.emit(issues)
+                    max_results=self.kwargs.get('max_results'),
+                    use_cache=self.kwargs.get('use_cache', True)
+                ))
             elif self.operation == "search":
-                issues = self.service.search_issues(
+                self.emit_pages(self.service.iter_search_pages(
                     self.kwargs.get('jql'), 
-                    self.kwargs.get('max_results', 50)
+                    max_results=self.kwargs.get('max_results')
+                ))
+            elif self.operation == "projects_issues":
+                issues = self.service.load_projects_issues(
+                    self.kwargs.get('project_keys'),
+                    store=self.kwargs.get('store'),
+                    on_progress=self.emit_project_progress,
+                    on_project_loaded=self.emit_project_loaded,
+                    should_stop=self.is_stopped
+                )
+                if not self._stop_requested:
+                    self.issues_loaded.emit(issues)
+            elif self.operation == "facet_counts":
+                counts = self.service.get_facet_counts(self.kwargs.get('jql'), loaded=self.kwargs.get('loaded'))
+                if not self._stop_requested:
+                    self.counts_loaded.emit(counts)
+            elif self.operation == "jql_metadata":
+                metadata = self.service.get_jql_autocomplete_data()
+                if not self._stop_requested:
+                    self.metadata_loaded.emit(metadata)
+            elif self.operation == "sync_query":
+                issues = self.service.sync_saved_query(
+                    self.kwargs.get('store'),
+                    self.kwargs.get('query_id'),
+                    self.kwargs.get('jql'),
+                    on_page=self.emit_page,
+                    use_cache=self.kwargs.get('use_cache', True)
                 )
-                self.issues_loaded.emit(issues)
+                if not self._stop_requested:
+                    self.issues_loaded.emit(issues)
+        except Exception as e:
+            if not self._stop_requested:
+                self.error_occurred.emit(str(e))
+    
+    def emit_project_progress(self, project_key, count):
+        """Informa el avance de un proyecto si la operación sigue vigente"""
+        if not self._stop_requested:
+            self.project_progress.emit(project_key, count)
+    
+    def emit_project_loaded(self, project_key, issues, error):
+        """Entrega los issues de un proyecto terminado si la operación sigue vigente"""
+        if not self._stop_requested:
+            self.project_loaded.emit(project_key, issues, error)
+    
+    def emit_page(self, page):
+        """Emite una página si la operación sigue vigente"""
+        if not self._stop_requested:
+            self.issues_page_loaded.emit(page)
+    
+    def emit_pages(self, pages):
+        """Emite cada página a medida que llega y la lista completa al final"""
+        issues = []
+        for page in pages:
+            if self._stop_requested:
+                return
+            issues.extend(page)
+            self.issues_page_loaded.emit(page)
+        if not self._stop_requested:
+            self.issues_loaded.emit(issues)
+
+class JiraDetailWorker(QThread):
+    """Worker que carga el detalle del issue seleccionado y precarga sus vecinos"""
+    detail_loaded = pyqtSignal(str, dict)   # Clave del issue y su detalle
+    error_occurred = pyqtSignal(str, str)   # Clave del issue y mensaje de error
+    
+    def __init__(self, service, issue_keys):
+        super().__init__()
+        self.service = service
+        self.issue_keys = issue_keys  # El seleccionado primero, luego los vecinos
+        self._stop_requested = False
+    
+    def stop(self):
+        """Detiene la precarga antes de pedir el siguiente issue"""
+        self._stop_requested = True
+    
+    def is_stopped(self):
+        """Indica si la carga fue cancelada"""
+        return self._stop_requested
+    
+    def run(self):
+        for index, issue_key in enumerate(self.issue_keys):
+            if self._stop_requested:
+                return
+            try:
+                detail = self.service.get_issue_detail(issue_key)
+                self.detail_loaded.emit(issue_key, detail)
+            except Exception as e:
+                # Solo el issue seleccionado reporta errores; la precarga falla en silencio
+                if index == 0:
+                    self.error_occurred.emit(issue_key, str(e))
+
+class JiraConnectWorker(QThread):
+    """Worker que conecta con Jira y verifica las credenciales sin bloquear la UI"""
+    connected = pyqtSignal(dict)          # Información del usuario
+    connection_failed = pyqtSignal(str)
+    
+    def __init__(self, service, server_url, username, api_token, prepared=False):
+        super().__init__()
+        self.service = service
+        self.server_url = server_url
+        self.username = username
+        self.api_token = api_token
+        self.prepared = prepared  # Los clientes ya se crearon con la identidad guardada
+    
+    def stop(self):
+        """La verificación es una sola petición: se deja terminar y se ignora su resultado"""
+    
+    def run(self):
+        try:
+            if not self.prepared:
+                self.service.prepare_connection(self.server_url, self.username, self.api_token)
+            user_info = self.service.verify_connection()
+            self.connected.emit(user_info)
+        except Exception as e:
+            self.connection_failed.emit(str(e))
+
+class JiraAutofillWorker(QThread):
+    """Worker que reúne los datos de un issue para autocompletar la tarea QA"""
+    autofill_ready = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, service, issue_key, role_fields=None):
+        super().__init__()
+        self.service = service
+        self.issue_key = issue_key
+        self.role_fields = role_fields
+    
+    def run(self):
+        try:
+            self.autofill_ready.emit(self.service.get_qa_autofill(self.issue_key, self.role_fields))
         except Exception as e:
             self.error_occurred.emit(str(e))
 
 class JiraWidget(QWidget):
+    # Issues vecinos (arriba y abajo) cuyo detalle se precarga al seleccionar uno
+    PREFETCH_NEIGHBORS = 2
+    
+    # Actualización automática de mis tareas (segundos): intervalo inicial, máximo al que
+    # crece mientras no hay cambios y mínimo con la ventana activa
+    AUTO_REFRESH_INTERVAL = 60
+    AUTO_REFRESH_MAX_INTERVAL = 900
+    AUTO_REFRESH_FOCUSED_INTERVAL = 30
+    
     def __init__(self):
         super().__init__()
         self.jira_service = JiraService()
+        self.jira_service.query_cache.ttl = app_config.get("jira_query_cache_ttl", JiraService.QUERY_CACHE_TTL)
         self.worker = None
+        self.project_worker = None
+        self.search_worker = None
+        self.detail_worker = None
+        self.counts_worker = None
+        self.connect_worker = None
+        self.auto_refresh_worker = None
+        self.status_counts = None     # Conteo por estado del servidor (None hasta recibirlo)
+        self.detail_targets = {}     # Área de detalles -> issue mostrado
+        self.selected_project_keys = []  # Proyectos mostrados en la pestaña de proyectos
+        self.project_results = {}    # Proyecto -> issues (vista de varios proyectos)
+        self.project_progress = {}   # Proyecto -> (icono de estado, issues recibidos)
+        
+        # Caché local de consultas guardadas; sin ella se consulta siempre al servidor
+        try:
+            self.issue_store = JiraIssueStore()
+        except Exception as e:
+            print(f"Error abriendo caché local de Jira: {e}")
+            self.issue_store = None
+        self.qa_metrics_service = None  # Se crea al abrir las métricas de QA
+        
+        # Autocompletado de JQL: índice en memoria sobre metadatos guardados en disco
+        self.jql_metadata_cache = JQLMetadataCache(ttl=app_config.get("jira_jql_metadata_ttl", 3600))
+        self.jql_index = JQLAutocompleteIndex()
+        self.jql_metadata_fetched_at = 0.0
+        self.jql_metadata_worker = None
+        self.jql_completion_start = 0
+        self.cancelled_workers = []  # Workers cancelados que aún no terminan su petición
+        
+        # Actualización automática opcional de mis tareas
+        self.auto_refresh_interval = self.AUTO_REFRESH_INTERVAL  # Crece mientras no haya cambios
+        self.auto_refresh_timer = QTimer(self)
+        self.auto_refresh_timer.setSingleShot(True)
+        self.auto_refresh_timer.timeout.connect(self.auto_refresh_my_issues)
+        QApplication.instance().applicationStateChanged.connect(self.on_application_state_changed)
         
         # Registrar para cambios de tema
         ThemeManager.register_theme_changed_callback(self.on_theme_changed)
@@ -189,6 +386,7 @@ Ejemplo de URL del servidor:
         self.server_input = QLineEdit()
         self.server_input.setPlaceholderText("https://tuempresa.atlassian.net")
         self.server_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.server_input.setText(app_config.get("jira_server") or "")
         layout.addWidget(self.server_input)
         
         # Campo de usuario
@@ -199,6 +397,7 @@ Ejemplo de URL del servidor:
         self.user_input = QLineEdit()
         self.user_input.setPlaceholderText("tu.email@empresa.com")
         self.user_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.user_input.setText(app_config.get("jira_username") or "")
         layout.addWidget(self.user_input)
         
         # Campo de token
@@ -286,10 +485,17 @@ Ejemplo de URL del servidor:
         
         # Botón para cargar mis issues
         refresh_btn = QPushButton("🔄 Cargar Mis Tareas Asignadas")
-        refresh_btn.clicked.connect(self.load_my_issues)
+        refresh_btn.clicked.connect(lambda: self.load_my_issues(force=True))
         refresh_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
         layout.addWidget(refresh_btn)
         
+        # Actualización automática en background
+        self.auto_refresh_check = QCheckBox("⏱️ Actualizar automáticamente")
+        self.auto_refresh_check.setStyleSheet("color: #3D3D3D;")
+        self.auto_refresh_check.setChecked(bool(app_config.get("jira_auto_refresh", False)))
+        self.auto_refresh_check.toggled.connect(self.on_auto_refresh_toggled)
+        layout.addWidget(self.auto_refresh_check)
+        
         # Filtro por estado
         filter_layout = QHBoxLayout()
         
@@ -321,10 +527,17 @@ Ejemplo de URL del servidor:
         filter_layout.addStretch()  # Empujar hacia la izquierda
         layout.addLayout(filter_layout)
         
-        # Lista de mis issues
-        self.my_issues_list = QListWidget()
-        self.my_issues_list.setStyleSheet(ThemeManager.get_theme_class().get_listwidget_style())
-        self.my_issues_list.itemClicked.connect(self.on_issue_selected)
+        # Contadores por prioridad y proyecto (consultas de conteo, sin descargar issues)
+        self.my_issues_badges = QLabel("")
+        self.my_issues_badges.setWordWrap(True)
+        self.my_issues_badges.setStyleSheet("color: #3D3D3D; padding: 2px;")
+        layout.addWidget(self.my_issues_badges)
+        
+        # Lista de mis issues (modelo indexado; el filtro de estado usa el proxy)
+        self.my_issues_list = self.create_issue_list(self.format_my_issue_item)
+        self.my_issues_model = self.get_issue_model(self.my_issues_list)
+        self.my_issues_proxy = self.my_issues_list.model()
+        self.my_issues_list.clicked.connect(self.on_issue_selected)
         self.my_issues_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.my_issues_list.customContextMenuRequested.connect(self.show_issue_context_menu)
         layout.addWidget(self.my_issues_list)
@@ -356,15 +569,30 @@ Ejemplo de URL del servidor:
         project_label.setStyleSheet("color: #3D3D3D; font-weight: bold;")
         layout.addWidget(project_label)
         
+        project_layout = QHBoxLayout()
+        
         self.project_combo = QComboBox()
         self.project_combo.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
         self.project_combo.currentTextChanged.connect(self.on_project_selected)
-        layout.addWidget(self.project_combo)
+        project_layout.addWidget(self.project_combo, 1)
+        
+        # Ver varios proyectos juntos
+        multi_project_btn = QPushButton("📚 Varios Proyectos")
+        multi_project_btn.clicked.connect(self.select_multiple_projects)
+        multi_project_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        project_layout.addWidget(multi_project_btn)
+        layout.addLayout(project_layout)
+        
+        # Avance de carga por proyecto
+        self.project_progress_label = QLabel("")
+        self.project_progress_label.setWordWrap(True)
+        self.project_progress_label.setStyleSheet("color: #3D3D3D; padding: 2px;")
+        layout.addWidget(self.project_progress_label)
         
         # Lista de issues del proyecto
-        self.project_issues_list = QListWidget()
-        self.project_issues_list.setStyleSheet(ThemeManager.get_theme_class().get_listwidget_style())
-        self.project_issues_list.itemClicked.connect(self.on_project_issue_selected)
+        self.project_issues_list = self.create_issue_list(self.format_issue_item)
+        self.project_issues_model = self.get_issue_model(self.project_issues_list)
+        self.project_issues_list.clicked.connect(self.on_project_issue_selected)
         self.project_issues_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.project_issues_list.customContextMenuRequested.connect(self.show_project_issue_context_menu)
         layout.addWidget(self.project_issues_list)
@@ -393,18 +621,36 @@ Ejemplo de URL del servidor:
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText('Ejemplo: project = "PROJ" AND status = "In Progress"')
         self.search_input.setStyleSheet(ThemeManager.get_theme_class().get_lineedit_style())
+        self.search_input.textChanged.connect(self.on_search_query_changed)
+        self.search_input.returnPressed.connect(self.search_issues)
         layout.addWidget(self.search_input)
         
+        # Sugerencias según el cursor; el completer no filtra, solo muestra el modelo
+        self.jql_completer_model = QStandardItemModel(self)
+        self.jql_completer = QCompleter(self.jql_completer_model, self)
+        self.jql_completer.setWidget(self.search_input)
+        self.jql_completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.jql_completer.setMaxVisibleItems(12)
+        self.jql_completer.activated[QModelIndex].connect(self.insert_jql_suggestion)
+        self.search_input.textEdited.connect(self.update_jql_suggestions)
+        
         # Botón de búsqueda
         search_btn = QPushButton("🔍 Buscar")
         search_btn.clicked.connect(self.search_issues)
         search_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
         layout.addWidget(search_btn)
         
+        # Métricas de ciclo de QA de los issues de una JQL
+        metrics_btn = QPushButton("📊 Métricas QA")
+        metrics_btn.setToolTip("Tiempo en QA y reaperturas por issue y por responsable")
+        metrics_btn.clicked.connect(self.open_qa_metrics)
+        metrics_btn.setStyleSheet(ThemeManager.get_theme_class().get_button_style())
+        layout.addWidget(metrics_btn)
+        
         # Lista de resultados de búsqueda
-        self.search_results_list = QListWidget()
-        self.search_results_list.setStyleSheet(ThemeManager.get_theme_class().get_listwidget_style())
-        self.search_results_list.itemClicked.connect(self.on_search_result_selected)
+        self.search_results_list = self.create_issue_list(self.format_issue_item)
+        self.search_results_model = self.get_issue_model(self.search_results_list)
+        self.search_results_list.clicked.connect(self.on_search_result_selected)
         layout.addWidget(self.search_results_list)
         
         # Área de detalles del resultado
@@ -418,7 +664,7 @@ Ejemplo de URL del servidor:
         return tab
     
     def connect_to_jira(self):
-        """Intenta conectar con Jira"""
+        """Conecta con Jira en background; con una identidad guardada muestra los datos al instante"""
         server_url = self.server_input.text().strip()
         username = self.user_input.text().strip()
         api_token = self.token_input.text().strip()
@@ -431,45 +677,202 @@ Ejemplo de URL del servidor:
         self.login_btn.setText("🔄 Conectando...")
         self.login_btn.setEnabled(False)
         
-        try:
-            if self.jira_service.connect(server_url, username, api_token):
-                user_info = self.jira_service.get_user_info()
+        # Identidad guardada de una conexión anterior al mismo servidor con el mismo usuario
+        identity = app_config.get("jira_identity")
+        if not identity or identity.get('server_url') != server_url.rstrip('/') or identity.get('username') != username:
+            identity = None
                 
-                self.connection_status.setText(f"✅ Conectado como: {user_info.get('name', 'Usuario')}")
-                self.connection_status.setStyleSheet("color: #50fa7b; padding: 10px;")
+        if identity:
+            try:
+                # Conexión optimista: la verificación de las credenciales sigue en background
+                self.jira_service.prepare_connection(server_url, username, api_token, identity)
+                self.show_connected(identity['user_info'], verifying=True)
+            except Exception as e:
+                print(f"Error usando la identidad guardada de Jira: {e}")
+                identity = None
                 
-                # Ocultar login y mostrar issues
-                self.login_frame.hide()
-                self.issues_frame.show()
+        self.connect_worker = JiraConnectWorker(self.jira_service, server_url, username, api_token,
+                                                prepared=identity is not None)
+        self.connect_worker.connected.connect(self.on_jira_connected)
+        self.connect_worker.connection_failed.connect(self.on_jira_connection_failed)
+        self.connect_worker.start()
                 
-                # Cargar datos iniciales
-                self.load_my_issues()
-                self.load_projects()
+    def show_connected(self, user_info, verifying=False):
+        """Muestra el estado conectado y carga los datos iniciales la primera vez"""
+        status = f"✅ Conectado como: {user_info.get('name') or 'Usuario'}"
+        if verifying:
+            status += " (verificando...)"
+        self.connection_status.setText(status)
+        self.connection_status.setStyleSheet("color: #50fa7b; padding: 10px;")
                 
-            else:
-                QMessageBox.critical(self, "❌ Error de Conexión", 
-                                   "No se pudo conectar a Jira. Verifica tus credenciales.")
+        if self.issues_frame.isHidden():
+            # Ocultar login y mostrar issues
+            self.login_frame.hide()
+            self.issues_frame.show()
                 
-        except Exception as e:
-            QMessageBox.critical(self, "❌ Error de Conexión", 
-                               f"Error al conectar con Jira:\n{str(e)}")
-        finally:
-            self.login_btn.setText("🔑 Conectar")
-            self.login_btn.setEnabled(True)
+            # Cargar datos iniciales
+            self.load_my_issues()
+            self.load_projects()
+            self.load_jql_metadata()
+            self.schedule_auto_refresh()
     
-    def load_my_issues(self):
-        """Carga las issues asignadas al usuario"""
-        if self.worker and self.worker.isRunning():
+    def on_jira_connected(self, user_info):
+        """Credenciales verificadas: guarda la identidad para la próxima conexión"""
+        if self.sender() is not self.connect_worker:
             return
-            
-        self.my_issues_list.clear()
-        self.my_issues_list.addItem("🔄 Cargando tareas asignadas...")
+        self.login_btn.setText("🔑 Conectar")
+        self.login_btn.setEnabled(True)
+        
+        app_config.set("jira_server", self.jira_service.server_url)
+        app_config.set("jira_username", self.jira_service.username)
+        app_config.set("jira_identity", self.jira_service.get_identity())
+        self.show_connected(user_info)
+    
+    def on_jira_connection_failed(self, error_msg):
+        """Credenciales rechazadas o servidor inaccesible: vuelve al login"""
+        if self.sender() is not self.connect_worker:
+            return
+        self.login_btn.setText("🔑 Conectar")
+        self.login_btn.setEnabled(True)
+        self.reset_session()
+        QMessageBox.critical(self, "❌ Error de Conexión", 
+                           f"No se pudo conectar a Jira. Verifica tus credenciales.\n\n{error_msg}")
+    
+    def cancel_worker(self, worker):
+        """Cancela un worker de issues; sus páginas pendientes se descartan"""
+        if not worker or not worker.isRunning():
+            return
+        worker.stop()
+        # Mantener la referencia hasta que termine la petición en curso
+        self.cancelled_workers.append(worker)
+        worker.finished.connect(lambda: self.cancelled_workers.remove(worker) if worker in self.cancelled_workers else None)
+    
+    def create_issue_list(self, formatter):
+        """Crea una vista de issues con su modelo indexado y su proxy de filtros"""
+        model = JiraIssueListModel(formatter, self)
+        proxy = JiraIssueFilterProxyModel(self)
+        proxy.setSourceModel(model)
+        
+        view = QListView()
+        view.setModel(proxy)
+        view.setStyleSheet(ThemeManager.get_theme_class().get_listwidget_style())
+        view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        view.setUniformItemSizes(True)
+        return view
+    
+    @staticmethod
+    def get_issue_model(view):
+        """Obtiene el modelo de issues detrás del proxy de una vista"""
+        return view.model().sourceModel()
+    
+    def load_cached_query(self, query_id):
+        """Obtiene los issues en caché de una consulta guardada"""
+        if not self.issue_store:
+            return []
+        try:
+            return self.issue_store.load_query(self.jira_service.get_store_scope(), query_id)
+        except Exception as e:
+            print(f"Error leyendo caché local de Jira: {e}")
+            return []
+    
+    def create_query_worker(self, query_id, jql, fallback_operation, force=False, **kwargs):
+        """
+        Crea el worker que sincroniza una consulta guardada (o la descarga sin caché)
+        
+        Con force se sincroniza aunque la consulta se haya sincronizado hace poco.
+        """
+        if not self.issue_store:
+            return JiraWorker(self.jira_service, fallback_operation, use_cache=not force, **kwargs)
+        return JiraWorker(self.jira_service, "sync_query", use_cache=not force,
+                          store=self.issue_store, query_id=query_id, jql=jql)
+    
+    @staticmethod
+    def issues_signature(issues):
+        """Resume una lista de issues para saber si cambió tras sincronizar"""
+        return [(issue.get('key'), issue.get('updated_at'), issue.get('status')) for issue in issues]
+    
+    def load_my_issues(self, force=False):
+        """Muestra las issues asignadas en caché y las sincroniza con el servidor"""
+        self.cancel_worker(self.worker)
+        self.cancel_worker(self.auto_refresh_worker)
+        self.status_counts = None
+        
+        cached = self.load_cached_query('assigned')
+        if cached:
+            self.my_issues_model.set_issues(cached)
+            self.update_status_filter_options(self.my_issues_model.facet_counts('status'))
+        else:
+            self.my_issues_model.clear("🔄 Cargando tareas asignadas...")
         
-        self.worker = JiraWorker(self.jira_service, "assigned_issues")
+        self.worker = self.create_query_worker('assigned', JiraService.ASSIGNED_JQL, "assigned_issues", force=force)
+        self.worker.issues_page_loaded.connect(self.on_my_issues_page_loaded)
         self.worker.issues_loaded.connect(self.on_my_issues_loaded)
         self.worker.error_occurred.connect(self.on_error)
         self.worker.start()
     
+    def on_auto_refresh_toggled(self, enabled):
+        """Activa o desactiva la actualización automática de mis tareas"""
+        app_config.set("jira_auto_refresh", enabled)
+        self.auto_refresh_interval = self.AUTO_REFRESH_INTERVAL
+        self.schedule_auto_refresh()
+    
+    def get_auto_refresh_delay(self):
+        """Segundos hasta la próxima actualización; con la ventana activa se consulta más seguido"""
+        if self.window().isActiveWindow():
+            return max(self.AUTO_REFRESH_FOCUSED_INTERVAL, self.auto_refresh_interval // 4)
+        return self.auto_refresh_interval
+    
+    def schedule_auto_refresh(self):
+        """Programa la próxima actualización si está activada y hay conexión"""
+        if not self.auto_refresh_check.isChecked() or not self.jira_service.is_connected:
+            self.auto_refresh_timer.stop()
+            return
+        self.auto_refresh_timer.start(self.get_auto_refresh_delay() * 1000)
+    
+    def on_application_state_changed(self, state):
+        """Al volver a la ventana adelanta la próxima actualización si faltaba mucho"""
+        if state != Qt.ApplicationState.ApplicationActive or not self.auto_refresh_timer.isActive():
+            return
+        if self.auto_refresh_timer.remainingTime() > self.get_auto_refresh_delay() * 1000:
+            self.schedule_auto_refresh()
+    
+    def auto_refresh_my_issues(self):
+        """Consulta mis tareas en background sin tocar la lista hasta tener el resultado"""
+        busy = any(worker and worker.isRunning() for worker in (self.worker, self.auto_refresh_worker))
+        if busy or not self.jira_service.is_connected:
+            self.schedule_auto_refresh()
+            return
+        
+        self.auto_refresh_worker = self.create_query_worker('assigned', JiraService.ASSIGNED_JQL,
+                                                            "assigned_issues", force=True)
+        self.auto_refresh_worker.issues_loaded.connect(self.on_auto_refresh_loaded)
+        self.auto_refresh_worker.error_occurred.connect(self.on_auto_refresh_error)
+        self.auto_refresh_worker.start()
+    
+    def on_auto_refresh_loaded(self, issues):
+        """Aplica solo las diferencias y ajusta el intervalo según hubo cambios o no"""
+        if self.sender() is not self.auto_refresh_worker:
+            return
+        
+        added, updated, removed = self.my_issues_model.apply_diff(issues)
+        if added or updated or removed:
+            print(f"Mis tareas actualizadas: +{added} ~{updated} -{removed}")
+            if not issues:
+                self.my_issues_model.set_placeholder("📭 No tienes tareas asignadas")
+            self.auto_refresh_interval = self.AUTO_REFRESH_INTERVAL
+            self.load_issue_counts(issues)
+        else:
+            self.auto_refresh_interval = min(self.auto_refresh_interval * 2, self.AUTO_REFRESH_MAX_INTERVAL)
+        self.schedule_auto_refresh()
+    
+    def on_auto_refresh_error(self, error_msg):
+        """Un fallo de la actualización automática no interrumpe al usuario"""
+        if self.sender() is not self.auto_refresh_worker:
+            return
+        print(f"Error actualizando mis tareas: {error_msg}")
+        self.auto_refresh_interval = min(self.auto_refresh_interval * 2, self.AUTO_REFRESH_MAX_INTERVAL)
+        self.schedule_auto_refresh()
+    
     def load_projects(self):
         """Carga los proyectos disponibles"""
         self.project_combo.clear()
@@ -480,36 +883,91 @@ Ejemplo de URL del servidor:
         self.projects_worker.error_occurred.connect(self.on_error)
         self.projects_worker.start()
     
+    def on_my_issues_page_loaded(self, issues):
+        """Agrega una página de mis issues apenas llega"""
+        if self.sender() is not self.worker:
+            return  # Página de una carga cancelada
+        
+        # El modelo descarta los issues que ya se mostraban y el proxy aplica el filtro
+        self.my_issues_model.append_issues(issues)
+    
     def on_my_issues_loaded(self, issues):
-        """Maneja la carga exitosa de mis issues"""
-        self.my_issues_list.clear()
+        """Maneja el fin de la carga de mis issues"""
+        if self.sender() is not self.worker:
+            return
         
+        self.load_issue_counts(issues)
         if not issues:
-            self.my_issues_list.addItem("📭 No tienes tareas asignadas")
-            self.all_issues = []
+            self.my_issues_model.clear("📭 No tienes tareas asignadas")
             return
         
-        # Guardar todos los issues para el filtrado
-        self.all_issues = issues
+        # Reconciliar con lo que ya se mostraba (caché o páginas recibidas)
+        if self.issues_signature(issues) != self.issues_signature(self.my_issues_model.issues()):
+            self.my_issues_model.set_issues(issues)
         
+        # Hasta recibir los conteos se muestran los calculados localmente
+        if self.status_counts is None:
+            self.update_status_filter_options(self.my_issues_model.facet_counts('status'))
+    
+    def load_issue_counts(self, issues=None):
+        """
+        Pide en background los conteos por estado, prioridad y proyecto de mis tareas
+        
+        Con la lista ya cargada solo se consulta el total: si está completa, los
+        conteos se calculan con ella en lugar de una consulta por valor.
+        """
+        self.cancel_worker(self.counts_worker)
+        self.status_counts = None
+        
+        self.counts_worker = JiraWorker(self.jira_service, "facet_counts", jql=JiraService.ASSIGNED_JQL,
+                                        loaded=list(issues) if issues is not None else None)
+        self.counts_worker.counts_loaded.connect(self.on_issue_counts_loaded)
+        self.counts_worker.error_occurred.connect(lambda error: print(f"Error cargando conteos: {error}"))
+        self.counts_worker.start()
+    
+    def on_issue_counts_loaded(self, counts):
+        """Actualiza el filtro de estados y los contadores con los conteos del servidor"""
+        if self.sender() is not self.counts_worker:
+            return
+        
+        if 'status' in counts:
+            self.status_counts = counts['status']
+            self.update_status_filter_options(self.status_counts)
+        
+        badges = [f"📊 Total: {counts.get('total', 0)}"]
+        if counts.get('priority'):
+            badges.append("  ".join(f"{self.get_priority_icon(priority)} {priority}: {count}"
+                                    for priority, count in counts['priority'].items()))
+        if counts.get('project'):
+            badges.append("  ".join(f"📁 {project}: {count}"
+                                    for project, count in sorted(counts['project'].items())))
+        self.my_issues_badges.setText("  |  ".join(badges))
+    
+    def update_status_filter_options(self, status_counts):
+        """Actualiza las opciones del filtro con los estados y su cantidad de issues"""
         # Actualizar opciones de filtro con estados únicos encontrados
         if hasattr(self, 'status_filter'):
             current_text = self.status_filter.currentText()
+            current_status = self.status_filter.currentData()
+            self.status_filter.blockSignals(True)
             self.status_filter.clear()
             self.status_filter.addItem("Todos los estados")
             
-            # Obtener estados únicos
-            unique_statuses = set(issue.get('status', '') for issue in issues if issue.get('status'))
-            for status in sorted(unique_statuses):
-                self.status_filter.addItem(status)
+            # El texto muestra la cantidad; el estado se guarda como dato del item
+            for status in sorted(status_counts):
+                self.status_filter.addItem(f"{status} ({status_counts[status]})", status)
             
             # Restaurar selección anterior si existe
-            index = self.status_filter.findText(current_text)
+            index = self.status_filter.findData(current_status) if current_status else -1
+            if index < 0:
+                index = self.status_filter.findText(current_text)
             if index >= 0:
                 self.status_filter.setCurrentIndex(index)
+            self.status_filter.blockSignals(False)
         
-        # Aplicar filtro actual
-        self.filter_issues_by_status()
+            # La lista ya muestra las páginas; solo refiltrar si cambió la selección
+            if self.status_filter.currentData() != current_status and not current_text.endswith("Todos los estados"):
+                self.filter_issues_by_status()
     
     def on_projects_loaded(self, projects):
         """Maneja la carga exitosa de proyectos"""
@@ -543,41 +1001,151 @@ Ejemplo de URL del servidor:
             self.load_project_issues(project_key)
     
     def load_project_issues(self, project_key):
-        """Carga issues de un proyecto específico"""
-        self.project_issues_list.clear()
-        self.project_issues_list.addItem(f"🔄 Cargando issues de {project_key}...")
+        """Muestra los issues en caché de un proyecto y los sincroniza con el servidor"""
+        # Cambiar de proyecto cancela la carga anterior
+        self.cancel_worker(self.project_worker)
+        self.selected_project_keys = [project_key]
+        self.project_progress_label.clear()
+        
+        query_id = f"project:{project_key}"
+        cached = self.load_cached_query(query_id)
+        if cached:
+            self.project_issues_model.set_issues(cached)
+        else:
+            self.project_issues_model.clear(f"🔄 Cargando issues de {project_key}...")
         
-        self.project_worker = JiraWorker(self.jira_service, "project_issues", project_key=project_key)
+        self.project_worker = self.create_query_worker(
+            query_id, JiraService.PROJECT_JQL.format(project_key=project_key),
+            "project_issues", project_key=project_key
+        )
+        self.project_worker.issues_page_loaded.connect(self.on_project_issues_page_loaded)
         self.project_worker.issues_loaded.connect(self.on_project_issues_loaded)
         self.project_worker.error_occurred.connect(self.on_error)
         self.project_worker.start()
     
+    def on_project_issues_page_loaded(self, issues):
+        """Agrega una página de issues del proyecto apenas llega"""
+        if self.sender() is not self.project_worker:
+            return
+        
+        self.project_issues_model.append_issues(issues)
+    
     def on_project_issues_loaded(self, issues):
-        """Maneja la carga exitosa de issues del proyecto"""
-        self.project_issues_list.clear()
+        """Maneja el fin de la carga de issues del proyecto"""
+        if self.sender() is not self.project_worker:
+            return
         
         if not issues:
-            self.project_issues_list.addItem("📭 No hay issues en este proyecto")
+            self.project_issues_model.clear("📭 No hay issues en este proyecto")
             return
+        
+        # Reconciliar con lo que ya se mostraba (caché o páginas recibidas)
+        if self.issues_signature(issues) != self.issues_signature(self.project_issues_model.issues()):
+            self.project_issues_model.set_issues(issues)
+    
+    def select_multiple_projects(self):
+        """Abre el selector de proyectos para ver varios juntos"""
+        projects = [self.project_combo.itemData(index) for index in range(self.project_combo.count())]
+        projects = [project for project in projects if project]
+        if not projects:
+            QMessageBox.warning(self, "⚠️ Sin Proyectos", "Primero carga los proyectos disponibles")
+            return
+        
+        selected_keys = self.selected_project_keys if len(self.selected_project_keys) > 1 \
+            else app_config.get("jira_watched_projects") or []
+        dialog = JiraProjectPickerDialog(self, projects, selected_keys)
+        if dialog.exec() != JiraProjectPickerDialog.DialogCode.Accepted:
+            return
+        
+        project_keys = dialog.get_selected_keys()
+        if not project_keys:
+            return
+        app_config.set("jira_watched_projects", project_keys)
+        if len(project_keys) == 1:
+            self.load_project_issues(project_keys[0])
+        else:
+            self.load_multi_project_issues(project_keys)
+    
+    def load_multi_project_issues(self, project_keys):
+        """Muestra los issues en caché de varios proyectos y los carga en paralelo"""
+        self.cancel_worker(self.project_worker)
+        self.selected_project_keys = list(project_keys)
+        
+        # Lo que hay en caché se muestra ya unido por fecha de actualización
+        self.project_results = {key: self.load_cached_query(f"project:{key}") for key in project_keys}
+        self.project_progress = {key: ("🔄", 0) for key in project_keys}
+        self.update_project_progress_label()
+        
+        merged = JiraService.merge_by_updated(self.project_results[key] for key in project_keys)
+        if merged:
+            self.project_issues_model.set_issues(merged)
+        else:
+            self.project_issues_model.clear(f"🔄 Cargando issues de {len(project_keys)} proyectos...")
+        
+        self.project_worker = JiraWorker(self.jira_service, "projects_issues",
+                                         project_keys=list(project_keys), store=self.issue_store)
+        self.project_worker.project_progress.connect(self.on_project_progress)
+        self.project_worker.project_loaded.connect(self.on_project_loaded)
+        self.project_worker.issues_loaded.connect(self.on_multi_project_issues_loaded)
+        self.project_worker.error_occurred.connect(self.on_error)
+        self.project_worker.start()
+    
+    def update_project_progress_label(self):
+        """Muestra el avance de cada proyecto"""
+        self.project_progress_label.setText("  |  ".join(
+            f"{icon} {key}: {count}" for key, (icon, count) in self.project_progress.items()
+        ))
+    
+    def on_project_progress(self, project_key, count):
+        """Suma los issues recibidos de un proyecto"""
+        if self.sender() is not self.project_worker or project_key not in self.project_progress:
+            return
+        icon, loaded = self.project_progress[project_key]
+        self.project_progress[project_key] = (icon, loaded + count)
+        self.update_project_progress_label()
+    
+    def on_project_loaded(self, project_key, issues, error):
+        """Une los issues de un proyecto terminado con los del resto"""
+        if self.sender() is not self.project_worker or project_key not in self.project_progress:
+            return
+        
+        if error:
+            print(f"Error cargando issues de {project_key}: {error}")
+            self.project_progress[project_key] = ("❌", len(self.project_results.get(project_key, [])))
+        else:
+            self.project_results[project_key] = issues
+            self.project_progress[project_key] = ("✅", len(issues))
+        self.update_project_progress_label()
+        
+        merged = JiraService.merge_by_updated(self.project_results[key] for key in self.selected_project_keys)
+        if merged and self.issues_signature(merged) != self.issues_signature(self.project_issues_model.issues()):
+            self.project_issues_model.set_issues(merged)
+    
+    def on_multi_project_issues_loaded(self, issues):
+        """Maneja el fin de la carga de varios proyectos"""
+        if self.sender() is not self.project_worker:
+            return
+        
+        if not issues:
+            self.project_issues_model.clear("📭 No hay issues en estos proyectos")
+        elif self.issues_signature(issues) != self.issues_signature(self.project_issues_model.issues()):
+            self.project_issues_model.set_issues(issues)
             
-        for issue in issues:
-            item = QListWidgetItem()
-            
-            # Información del issue
-            key = issue.get('key', 'N/A')
-            summary = issue.get('summary', 'Sin título')
-            status = issue.get('status', 'N/A')
-            assignee = issue.get('assignee', 'Sin asignar')
-            
-            # Texto del item
-            item_text = f"🔧 {key} - {summary}\n📊 {status} | 👤 {assignee}"
-            item.setText(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, issue)
+    def format_issue_item(self, issue):
+        """Texto de un issue en las listas de proyecto o búsqueda"""
+        # Información del issue
+        key = issue.get('key', 'N/A')
+        summary = issue.get('summary', 'Sin título')
+        status = issue.get('status', 'N/A')
+        assignee = issue.get('assignee', 'Sin asignar')
             
-            self.project_issues_list.addItem(item)
+        return f"🔧 {key} - {summary}\n📊 {status} | 👤 {assignee}"
     
     def search_issues(self):
         """Busca issues usando JQL"""
+        # Enter con sugerencias abiertas elige la sugerencia, no busca
+        if self.jql_completer.popup().isVisible():
+            return
         jql = self.search_input.text().strip()
         
         if not jql:
@@ -585,58 +1153,164 @@ Ejemplo de URL del servidor:
                               "Por favor ingresa una consulta JQL")
             return
         
-        self.search_results_list.clear()
-        self.search_results_list.addItem("🔄 Buscando...")
+        # Una búsqueda nueva cancela la anterior
+        self.cancel_worker(self.search_worker)
+        
+        self.search_results_model.clear("🔄 Buscando...")
         
         self.search_worker = JiraWorker(self.jira_service, "search", jql=jql)
+        self.search_worker.issues_page_loaded.connect(self.on_search_page_loaded)
         self.search_worker.issues_loaded.connect(self.on_search_results_loaded)
         self.search_worker.error_occurred.connect(self.on_error)
         self.search_worker.start()
     
+    def load_jql_metadata(self):
+        """Arma el índice con los metadatos guardados y los actualiza en background si vencieron"""
+        metadata, self.jql_metadata_fetched_at = self.jql_metadata_cache.load(self.jira_service.get_store_scope())
+        self.jql_index = JQLAutocompleteIndex(metadata)
+        self.refresh_jql_metadata_if_stale()
+    
+    def refresh_jql_metadata_if_stale(self):
+        """Pide los metadatos de autocompletado si vencieron y no hay una descarga en curso"""
+        if not self.jira_service.is_connected or not self.jql_metadata_cache.is_stale(self.jql_metadata_fetched_at):
+            return
+        if self.jql_metadata_worker and self.jql_metadata_worker.isRunning():
+            return
+        self.jql_metadata_worker = JiraWorker(self.jira_service, "jql_metadata")
+        self.jql_metadata_worker.metadata_loaded.connect(self.on_jql_metadata_loaded)
+        self.jql_metadata_worker.error_occurred.connect(self.on_jql_metadata_error)
+        self.jql_metadata_worker.start()
+    
+    def on_jql_metadata_loaded(self, metadata):
+        """Guarda los metadatos nuevos y reemplaza el índice"""
+        if self.sender() is not self.jql_metadata_worker or self.jql_metadata_worker.is_stopped():
+            return
+        try:
+            self.jql_metadata_cache.save(self.jira_service.get_store_scope(), metadata)
+        except Exception as e:
+            print(f"Error guardando metadatos de JQL: {e}")
+        self.jql_metadata_fetched_at = time.time()
+        self.jql_index = JQLAutocompleteIndex(metadata)
+    
+    def on_jql_metadata_error(self, error_msg):
+        """Sigue con los metadatos que hay; se reintenta cuando vuelvan a vencer"""
+        if self.sender() is not self.jql_metadata_worker:
+            return
+        print(f"Error actualizando metadatos de JQL: {error_msg}")
+        self.jql_metadata_fetched_at = time.time()
+    
+    def update_jql_suggestions(self, text):
+        """Muestra las sugerencias para la posición del cursor (sin peticiones)"""
+        self.jql_completion_start, suggestions = self.jql_index.suggest(text, self.search_input.cursorPosition())
+        self.jql_completer_model.clear()
+        for display, insert in suggestions:
+            item = QStandardItem(display)
+            item.setData(insert, Qt.ItemDataRole.UserRole)
+            self.jql_completer_model.appendRow(item)
+        if suggestions:
+            self.jql_completer.complete()
+        else:
+            self.jql_completer.popup().hide()
+        self.refresh_jql_metadata_if_stale()
+    
+    def insert_jql_suggestion(self, index):
+        """Reemplaza el texto a medio escribir por la sugerencia elegida"""
+        insert = index.data(Qt.ItemDataRole.UserRole)
+        text = self.search_input.text()
+        cursor = self.search_input.cursorPosition()
+        start = min(self.jql_completion_start, cursor)
+        self.search_input.setText(f"{text[:start]}{insert} {text[cursor:].lstrip()}")
+        self.search_input.setCursorPosition(start + len(insert) + 1)
+    
+    def on_search_query_changed(self, text):
+        """Cancela la búsqueda en curso si la consulta ya no es la misma"""
+        worker = self.search_worker
+        if not worker or not worker.isRunning() or worker.is_stopped():
+            return
+        if text.strip() != worker.kwargs.get('jql'):
+            self.cancel_worker(worker)
+            self.search_results_model.set_placeholder("⏹️ Búsqueda cancelada: la consulta cambió")
+    
+    def on_search_page_loaded(self, issues):
+        """Agrega una página de resultados apenas llega"""
+        if self.sender() is not self.search_worker or self.search_worker.is_stopped():
+            return
+        
+        self.search_results_model.append_issues(issues)
+    
     def on_search_results_loaded(self, issues):
-        """Maneja los resultados de búsqueda"""
-        self.search_results_list.clear()
+        """Maneja el fin de la búsqueda"""
+        if self.sender() is not self.search_worker or self.search_worker.is_stopped():
+            return
         
         if not issues:
-            self.search_results_list.addItem("📭 No se encontraron resultados")
-            return
-            
-        for issue in issues:
-            item = QListWidgetItem()
-            
-            # Información del issue
-            key = issue.get('key', 'N/A')
-            summary = issue.get('summary', 'Sin título')
-            status = issue.get('status', 'N/A')
-            assignee = issue.get('assignee', 'Sin asignar')
-            
-            # Texto del item
-            item_text = f"🔧 {key} - {summary}\n📊 {status} | 👤 {assignee}"
-            item.setText(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, issue)
-            
-            self.search_results_list.addItem(item)
+            self.search_results_model.clear("📭 No se encontraron resultados")
     
-    def on_issue_selected(self, item):
+    def on_issue_selected(self, index):
         """Maneja la selección de un issue en mis tareas"""
-        self.show_issue_details(item, self.my_issue_details)
+        self.show_issue_details(index, self.my_issue_details)
     
-    def on_project_issue_selected(self, item):
+    def on_project_issue_selected(self, index):
         """Maneja la selección de un issue en proyectos"""
-        self.show_issue_details(item, self.project_issue_details)
+        self.show_issue_details(index, self.project_issue_details)
     
-    def on_search_result_selected(self, item):
+    def on_search_result_selected(self, index):
         """Maneja la selección de un resultado de búsqueda"""
-        self.show_issue_details(item, self.search_result_details)
+        self.show_issue_details(index, self.search_result_details)
     
-    def show_issue_details(self, item, details_widget):
-        """Muestra los detalles de un issue"""
-        issue_data = item.data(Qt.ItemDataRole.UserRole)
+    def show_issue_details(self, index, details_widget):
+        """Muestra los datos de la lista de inmediato y carga el detalle completo aparte"""
+        issue_data = index.data(JiraIssueListModel.ISSUE_ROLE)
         
         if not issue_data:
             return
             
-        # Mostrar detalles completos del issue
+        issue_key = issue_data.get('key')
+        self.detail_targets[details_widget] = issue_data
+        
+        cached = self.jira_service.detail_cache.get(issue_key)
+        details_widget.setText(self.format_issue_details(issue_data, cached))
+        
+        # Cargar el detalle faltante y precargar los vecinos de la selección
+        model = index.model()
+        keys = [] if cached is not None else [issue_key]
+        row = index.row()
+        for offset in range(1, self.PREFETCH_NEIGHBORS + 1):
+            for neighbor_row in (row + offset, row - offset):
+                if 0 <= neighbor_row < model.rowCount():
+                    neighbor = model.index(neighbor_row, 0).data(JiraIssueListModel.ISSUE_ROLE)
+                    if neighbor and neighbor.get('key') not in self.jira_service.detail_cache:
+                        keys.append(neighbor.get('key'))
+        
+        if not keys:
+            return
+        
+        self.cancel_worker(self.detail_worker)
+        self.detail_worker = JiraDetailWorker(self.jira_service, keys)
+        self.detail_worker.detail_loaded.connect(self.on_issue_detail_loaded)
+        self.detail_worker.error_occurred.connect(self.on_issue_detail_error)
+        self.detail_worker.start()
+    
+    def on_issue_detail_loaded(self, issue_key, detail):
+        """Actualiza las áreas de detalles que muestran este issue"""
+        for details_widget, issue_data in self.detail_targets.items():
+            if issue_data.get('key') == issue_key:
+                details_widget.setText(self.format_issue_details(issue_data, detail))
+    
+    def on_issue_detail_error(self, issue_key, error_msg):
+        """Muestra el error en el área de detalles del issue"""
+        for details_widget, issue_data in self.detail_targets.items():
+            if issue_data.get('key') == issue_key:
+                details_widget.append(f"\n❌ No se pudo cargar el detalle: {error_msg}")
+    
+    def format_issue_details(self, issue_data, detail=None):
+        """Construye el texto de detalles; sin detalle muestra solo los datos de la lista"""
+        if detail is None:
+            description = "🔄 Cargando detalle..."
+        else:
+            description = detail.get('description') or 'Sin descripción'
+            description = f"{description[:200]}{'...' if len(description) > 200 else ''}"
+        
         details = f"""🔧 {issue_data.get('key', 'N/A')} - {issue_data.get('issue_type', 'N/A')}
 🔗 {issue_data.get('url', 'N/A')}
 
@@ -644,7 +1318,7 @@ Ejemplo de URL del servidor:
 {issue_data.get('summary', 'Sin título')}
 
 📄 Descripción:
-{issue_data.get('description', 'Sin descripción')[:200]}{'...' if len(issue_data.get('description', '')) > 200 else ''}
+{description}
 
 📊 Estado: {issue_data.get('status', 'N/A')}
 ⚡ Prioridad: {issue_data.get('priority', 'N/A')}
@@ -654,12 +1328,55 @@ Ejemplo de URL del servidor:
 📅 Creado: {issue_data.get('created', 'N/A')}
 🔄 Actualizado: {issue_data.get('updated', 'N/A')}"""
 
-        details_widget.setText(details)
+        if detail is None:
+            return details
+        
+        if detail.get('links'):
+            details += "\n\n🔗 Enlaces:"
+            for link in detail['links']:
+                details += f"\n• {link['relation']} {link['key']} - {link['summary']} ({link['status']})"
+        
+        if detail.get('attachments'):
+            details += "\n\n📎 Adjuntos:"
+            for attachment in detail['attachments']:
+                details += f"\n• {attachment['filename']} ({attachment['size'] // 1024} KB) - {attachment['author']}"
+        
+        comments = detail.get('comments') or []
+        details += f"\n\n💬 Comentarios ({len(comments)}):"
+        for comment in comments[-5:]:  # Los más recientes
+            details += f"\n• {comment['author']} ({comment['created']}):\n  {comment['body'][:200]}"
+        
+        return details
     
     def on_error(self, error_msg):
         """Maneja errores generales"""
+        if not self.jira_service.is_connected or (self.connect_worker and self.connect_worker.isRunning()):
+            # Mientras se verifica la conexión (o si falló) el error lo informa el login
+            print(f"Error en Jira: {error_msg}")
+            return
         QMessageBox.critical(self, "❌ Error", f"Error en Jira:\n{error_msg}")
     
+    def cleanup_threads(self):
+        """Cancela y cierra todos los threads activos"""
+        self.auto_refresh_timer.stop()
+        threads_to_cleanup = [self.worker, self.project_worker, self.search_worker, self.detail_worker,
+                              self.counts_worker, self.connect_worker, self.auto_refresh_worker,
+                              self.jql_metadata_worker,
+                              getattr(self, 'projects_worker', None)] + self.cancelled_workers
+        
+        for thread in threads_to_cleanup:
+            if thread and thread.isRunning():
+                thread.stop()
+                thread.quit()
+                if not thread.wait(3000):  # Esperar máximo 3 segundos
+                    thread.terminate()
+                    thread.wait()
+    
+    def closeEvent(self, event):
+        """Maneja el evento de cierre del widget"""
+        self.cleanup_threads()
+        super().closeEvent(event)
+    
     def clear_fields(self):
         """Limpia los campos de entrada"""
         self.server_input.clear()
@@ -668,6 +1385,28 @@ Ejemplo de URL del servidor:
     
     def disconnect(self):
         """Desconecta de Jira"""
+        self.reset_session()
+        self.clear_fields()
+        
+        QMessageBox.information(self, "🚪 Desconectado", 
+                              "Te has desconectado de Jira exitosamente.")
+    
+    def reset_session(self):
+        """Cancela los workers, cierra la conexión y vuelve a la pantalla de login"""
+        for worker in (self.worker, self.project_worker, self.search_worker, self.detail_worker,
+                       self.counts_worker, self.connect_worker, self.auto_refresh_worker,
+                       self.jql_metadata_worker):
+            self.cancel_worker(worker)
+        self.connect_worker = None
+        self.jql_metadata_worker = None
+        self.jql_index = JQLAutocompleteIndex()
+        self.jql_metadata_fetched_at = 0.0
+        self.auto_refresh_timer.stop()
+        self.auto_refresh_interval = self.AUTO_REFRESH_INTERVAL
+        self.detail_targets.clear()
+        self.selected_project_keys = []
+        self.project_results = {}
+        self.project_progress = {}
         self.jira_service.disconnect()
         
         # Resetear UI
@@ -678,40 +1417,48 @@ Ejemplo de URL del servidor:
         self.login_frame.show()
         
         # Limpiar todos los widgets
-        self.clear_fields()
-        if hasattr(self, 'my_issues_list'):
-            self.my_issues_list.clear()
+        if hasattr(self, 'my_issues_model'):
+            self.my_issues_model.clear()
+        if hasattr(self, 'my_issues_badges'):
+            self.my_issues_badges.clear()
         if hasattr(self, 'my_issue_details'):
             self.my_issue_details.clear()
         if hasattr(self, 'project_combo'):
             self.project_combo.clear()
-        if hasattr(self, 'project_issues_list'):
-            self.project_issues_list.clear()
+        if hasattr(self, 'project_issues_model'):
+            self.project_issues_model.clear()
+        if hasattr(self, 'project_progress_label'):
+            self.project_progress_label.clear()
         if hasattr(self, 'project_issue_details'):
             self.project_issue_details.clear()
         if hasattr(self, 'search_input'):
             self.search_input.clear()
-        if hasattr(self, 'search_results_list'):
-            self.search_results_list.clear()
+        if hasattr(self, 'search_results_model'):
+            self.search_results_model.clear()
         if hasattr(self, 'search_result_details'):
             self.search_result_details.clear()
-        
-        QMessageBox.information(self, "🚪 Desconectado", 
-                              "Te has desconectado de Jira exitosamente.")
     
     def show_issue_context_menu(self, position):
         """Muestra el menú contextual para los issues asignados"""
-        item = self.my_issues_list.itemAt(position)
-        if not item:
+        index = self.my_issues_list.indexAt(position)
+        if not index.isValid():
             return
             
-        issue_data = item.data(Qt.ItemDataRole.UserRole)
+        issue_data = index.data(JiraIssueListModel.ISSUE_ROLE)
         if not issue_data:
             return
         
         menu = QMenu(self)
         menu.setStyleSheet(ThemeManager.get_theme_class().get_frame_style())
         
+        # Acción masiva sobre la selección múltiple
+        selected_issues = self.get_selected_issues(self.my_issues_list)
+        if len(selected_issues) > 1:
+            bulk_action = QAction(f"📦 Acción masiva ({len(selected_issues)} issues)", self)
+            bulk_action.triggered.connect(lambda: self.bulk_update_issues(selected_issues))
+            menu.addAction(bulk_action)
+            menu.addSeparator()
+        
         # Acción para cambiar estado
         change_status_action = QAction("🔄 Cambiar Estado", self)
         change_status_action.triggered.connect(lambda: self.change_issue_status(issue_data))
@@ -730,24 +1477,32 @@ Ejemplo de URL del servidor:
         # Acción para refrescar
         menu.addSeparator()
         refresh_action = QAction("🔄 Refrescar", self)
-        refresh_action.triggered.connect(self.load_my_issues)
+        refresh_action.triggered.connect(lambda: self.load_my_issues(force=True))
         menu.addAction(refresh_action)
         
         menu.exec(self.my_issues_list.mapToGlobal(position))
     
     def show_project_issue_context_menu(self, position):
         """Muestra el menú contextual para los issues de proyecto"""
-        item = self.project_issues_list.itemAt(position)
-        if not item:
+        index = self.project_issues_list.indexAt(position)
+        if not index.isValid():
             return
             
-        issue_data = item.data(Qt.ItemDataRole.UserRole)
+        issue_data = index.data(JiraIssueListModel.ISSUE_ROLE)
         if not issue_data:
             return
         
         menu = QMenu(self)
         menu.setStyleSheet(ThemeManager.get_theme_class().get_frame_style())
         
+        # Acción masiva sobre la selección múltiple
+        selected_issues = self.get_selected_issues(self.project_issues_list)
+        if len(selected_issues) > 1:
+            bulk_action = QAction(f"📦 Acción masiva ({len(selected_issues)} issues)", self)
+            bulk_action.triggered.connect(lambda: self.bulk_update_issues(selected_issues))
+            menu.addAction(bulk_action)
+            menu.addSeparator()
+        
         # Acción para cambiar estado
         change_status_action = QAction("🔄 Cambiar Estado", self)
         change_status_action.triggered.connect(lambda: self.change_issue_status(issue_data))
@@ -778,44 +1533,119 @@ Ejemplo de URL del servidor:
         """Maneja el cambio de estado exitoso"""
         # Actualizar el estado en las listas
         self.update_issue_status_in_lists(issue_key, new_status)
+        self.reload_issue_lists()
         
-        # Recargar las listas para obtener datos actualizados
+    def reload_issue_lists(self):
+        """Recarga las listas para obtener datos actualizados"""
         self.load_my_issues()
         
-        # Si hay un proyecto seleccionado, recargar también
-        current_project = self.projects_combo.currentText()
+        # Si hay varios proyectos o uno seleccionado, recargar también
+        if len(self.selected_project_keys) > 1:
+            self.load_multi_project_issues(self.selected_project_keys)
+            return
+        current_project = self.project_combo.currentText()
         if current_project and not current_project.startswith(("Selecciona", "🔄", "📭", "❌")):
-            project_data = self.projects_combo.itemData(self.projects_combo.currentIndex())
+            project_data = self.project_combo.itemData(self.project_combo.currentIndex())
             if project_data:
                 self.load_project_issues(project_data['key'])
     
+    def get_selected_issues(self, view):
+        """Obtiene los datos de los issues seleccionados en una lista"""
+        issues = []
+        for index in sorted(view.selectionModel().selectedIndexes(), key=lambda index: index.row()):
+            issue_data = index.data(JiraIssueListModel.ISSUE_ROLE)
+            if issue_data:
+                issues.append(issue_data)
+        return issues
+    
+    def bulk_update_issues(self, issues):
+        """Abre el diálogo para transicionar o comentar varios issues"""
+        try:
+            dialog = JiraBulkDialog(self, self.jira_service, issues)
+            dialog.issues_updated.connect(self.on_bulk_issues_updated)
+            dialog.exec()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error abriendo diálogo de acción masiva:\n{str(e)}")
+    
+    def on_bulk_issues_updated(self, issue_keys, new_status):
+        """Refleja en las listas los issues actualizados por una acción masiva"""
+        if new_status:
+            for issue_key in issue_keys:
+                self.update_issue_status_in_lists(issue_key, new_status)
+        self.reload_issue_lists()
+    
     def update_issue_status_in_lists(self, issue_key, new_status):
         """Actualiza el estado del issue en las listas sin recargar"""
-        # Actualizar en my_issues_list
-        for i in range(self.my_issues_list.count()):
-            item = self.my_issues_list.item(i)
-            issue_data = item.data(Qt.ItemDataRole.UserRole)
-            if issue_data and issue_data['key'] == issue_key:
-                issue_data['status'] = new_status
-                # Actualizar el texto del item
-                priority_icon = self.get_priority_icon(issue_data.get('priority', ''))
-                status_icon = self.get_status_icon(new_status)
-                item_text = f"{priority_icon} {issue_data['key']} - {issue_data['summary']}\n🏷️ {new_status} | 📋 {issue_data['issue_type']}"
-                item.setText(item_text)
-                break
-        
-        # Actualizar en project_issues_list
-        for i in range(self.project_issues_list.count()):
-            item = self.project_issues_list.item(i)
-            issue_data = item.data(Qt.ItemDataRole.UserRole)
-            if issue_data and issue_data['key'] == issue_key:
-                issue_data['status'] = new_status
-                # Actualizar el texto del item
-                status_icon = self.get_status_icon(new_status)
-                assignee = issue_data.get('assignee', 'Sin asignar')
-                item_text = f"{status_icon} {issue_data['key']} - {issue_data['summary']}\n👤 {assignee} | 🏷️ {new_status}"
-                item.setText(item_text)
-                break
+        # Cada modelo ubica el issue por clave y repinta solo esa fila
+        for model in (self.my_issues_model, self.project_issues_model, self.search_results_model):
+            model.update_issue(issue_key, status=new_status)
+    
+    def apply_webhook_event(self, event, payload):
+        """Aplica un evento de webhook de Jira a las listas y cachés sin consultar al servidor"""
+        try:
+            result = self.jira_service.apply_webhook_event(event, payload)
+        except Exception as e:
+            print(f"Error aplicando webhook de Jira: {e}")
+            return
+        if not result:
+            return
+        
+        issue_key, record = result['key'], result['record']
+        models = (self.my_issues_model, self.project_issues_model, self.search_results_model)
+        if result['action'] == 'deleted':
+            for model in models:
+                model.remove_issue(issue_key)
+        elif result['action'] == 'updated':
+            # Las listas no guardan la descripción
+            record.description = ''
+            changes = {field: value for field, value in record.to_dict().items() if field != 'key'}
+            for model in models:
+                model.update_issue(issue_key, **changes)
+            if self.issue_store:
+                try:
+                    scope = self.jira_service.get_store_scope()
+                    if self.issue_store.get_stored_keys(scope, [issue_key]):
+                        self.issue_store.upsert_issues(scope, [record])
+                except Exception as e:
+                    print(f"Error guardando issue del webhook: {e}")
+        print(f"Webhook de Jira aplicado: {event} {issue_key}")
+        
+        # Un issue nuevo, reasignado o resuelto puede entrar o salir de mis tareas
+        if result['action'] in ('created', 'deleted') or result['fields'] & {'assignee', 'resolution'}:
+            self.auto_refresh_my_issues()
+        
+        # Las áreas que muestran el issue recargan su detalle
+        showing = [widget for widget, issue_data in self.detail_targets.items()
+                   if issue_data.get('key') == issue_key]
+        if not showing:
+            return
+        if result['action'] == 'deleted':
+            for details_widget in showing:
+                details_widget.append("\n🗑️ El issue fue eliminado en Jira")
+            return
+        for details_widget in showing:
+            details_widget.setText(self.format_issue_details(self.detail_targets[details_widget]))
+        self.cancel_worker(self.detail_worker)
+        self.detail_worker = JiraDetailWorker(self.jira_service, [issue_key])
+        self.detail_worker.detail_loaded.connect(self.on_issue_detail_loaded)
+        self.detail_worker.error_occurred.connect(self.on_issue_detail_error)
+        self.detail_worker.start()
+    
+    def open_qa_metrics(self):
+        """Abre las métricas de QA de la JQL guardada (o la de la búsqueda)"""
+        if not self.jira_service.is_connected:
+            QMessageBox.warning(self, "⚠️ No Conectado", "Conéctate a Jira primero")
+            return
+        try:
+            if self.qa_metrics_service is None:
+                self.qa_metrics_service = QAMetricsService(self.jira_service)
+            jql = app_config.get("jira_qa_metrics_jql") or self.search_input.text().strip()
+            dialog = JiraQAMetricsDialog(self, self.qa_metrics_service, jql)
+            dialog.exec()
+            if dialog.jql_input.text().strip():
+                app_config.set("jira_qa_metrics_jql", dialog.jql_input.text().strip())
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error abriendo métricas de QA:\n{str(e)}")
     
     def open_issue_in_browser(self, issue_data):
         """Abre el issue en el navegador"""
@@ -858,38 +1688,21 @@ Ejemplo de URL del servidor:
 
     def filter_issues_by_status(self):
         """Filtra los issues por el estado seleccionado"""
-        if not hasattr(self, 'all_issues'):
+        if not hasattr(self, 'my_issues_proxy'):
             return
             
-        selected_status = self.status_filter.currentText()
-        
-        # Limpiar lista actual
-        self.my_issues_list.clear()
-        
+        selected_status = self.status_filter.currentData() or self.status_filter.currentText()
         # Si es "Todos los estados", mostrar todos
-        if selected_status == "Todos los estados":
-            issues_to_show = self.all_issues
-        else:
-            # Filtrar por estado
-            issues_to_show = [issue for issue in self.all_issues 
-                            if issue.get('status', '') == selected_status]
-        
-        # Agregar issues filtrados a la lista
-        for issue in issues_to_show:
-            status_icon = self.get_status_icon(issue.get('status', ''))
-            priority_icon = self.get_priority_icon(issue.get('priority', ''))
-            
-            item_text = f"{status_icon} {priority_icon} {issue['key']}: {issue['summary']}"
-            item = QListWidgetItem(item_text)
-            item.setData(256, issue)  # Guardamos los datos del issue
-            
-            # Aplicar estilos según el tema actual
-            if hasattr(self, 'theme_manager') and self.theme_manager:
-                current_theme = self.theme_manager.get_current_theme()
-                item.setBackground(QColor(current_theme.list_item_background))
-                item.setForeground(QColor(current_theme.text_color))
+        if selected_status.endswith("Todos los estados"):
+            selected_status = None
+        self.my_issues_proxy.set_filter('status', selected_status)
+        
+    def format_my_issue_item(self, issue):
+        """Texto de un issue en la lista de mis tareas"""
+        status_icon = self.get_status_icon(issue.get('status', ''))
+        priority_icon = self.get_priority_icon(issue.get('priority', ''))
             
-            self.my_issues_list.addItem(item)
+        return f"{status_icon} {priority_icon} {issue['key']}: {issue['summary']}"
     
     def clear_status_filter(self):
         """Limpia el filtro de estado y muestra todos los issues"""
@@ -0,0 +1,238 @@
+"""
+Autocompletado de JQL con metadatos de Jira guardados localmente
+El índice se arma una vez por cada actualización de los metadatos; cada
+sugerencia se resuelve en memoria, sin peticiones mientras se escribe.
+"""
+
+import bisect
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class JQLMetadataCache:
+    """Copia en disco de los metadatos de autocompletado de cada servidor/usuario"""
+    
+    def __init__(self, path: Path = None, ttl: float = 3600):
+        self.path = path or Path.home() / ".qa_generator" / "jql_metadata.json"
+        self.ttl = ttl
+    
+    def _read(self) -> Dict:
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error leyendo metadatos de JQL: {e}")
+        return {}
+    
+    def load(self, scope: str) -> Tuple[Optional[Dict], float]:
+        """Metadatos guardados del scope y cuándo se descargaron (0 si no hay)"""
+        entry = self._read().get(scope)
+        if not entry:
+            return None, 0.0
+        return entry.get('data'), entry.get('fetched_at', 0.0)
+    
+    def save(self, scope: str, data: Dict):
+        """Guarda los metadatos del scope (escritura atómica)"""
+        entries = self._read()
+        entries[scope] = {'fetched_at': time.time(), 'data': data}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+    
+    def is_stale(self, fetched_at: float) -> bool:
+        """Indica si los metadatos vencieron"""
+        return time.time() - fetched_at > self.ttl
+
+
+class JQLAutocompleteIndex:
+    """
+    Sugerencias de JQL según la posición del cursor
+    
+    Reconoce si se espera un campo, un operador, un valor o una palabra clave
+    y busca en listas ordenadas por prefijo (bisect); si faltan sugerencias
+    completa con las que contienen el texto. Las sugerencias son pares
+    (texto visible, texto a insertar).
+    """
+    
+    DEFAULT_FIELDS = ('project', 'status', 'assignee', 'reporter', 'priority', 'issuetype',
+                      'summary', 'description', 'text', 'labels', 'component', 'fixVersion',
+                      'sprint', 'resolution', 'created', 'updated', 'resolved', 'key')
+    DEFAULT_OPERATORS = ('=', '!=', '~', '!~', '>', '>=', '<', '<=', 'in', 'not in',
+                         'is', 'is not', 'was', 'was in', 'was not', 'was not in', 'changed')
+    OPERATOR_WORDS = {'in', 'not', 'is', 'was', 'changed'}
+    SYMBOL_OPERATORS = {'=', '!=', '~', '!~', '>', '>=', '<', '<='}
+    # Campo -> faceta de valores guardados
+    FIELD_VALUES = {
+        'status': 'status', 'project': 'project', 'priority': 'priority',
+        'issuetype': 'issuetype', 'type': 'issuetype',
+        'assignee': 'user', 'reporter': 'user', 'creator': 'user', 'watcher': 'user',
+    }
+    USER_FUNCTIONS = ('currentUser()',)
+    TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"?|\'(?:[^\'\\]|\\.)*\'?|[(),]|!=|!~|>=|<=|[=~<>]|[^\s(),=!~<>"\']+')
+    PLAIN_VALUE = re.compile(r'[\w.\-@]+')
+    
+    def __init__(self, metadata: Dict = None):
+        metadata = metadata or {}
+        fields = metadata.get('fields') or [
+            {'value': field, 'operators': list(self.DEFAULT_OPERATORS), 'types': [], 'orderable': True}
+            for field in self.DEFAULT_FIELDS
+        ]
+        self.reserved = {word.lower() for word in metadata.get('reserved') or []}
+        self.fields = {self._match_key(field['value']): field for field in fields}
+        self._order_entries = self._entries((field['value'], field['value'])
+                                            for field in fields if field.get('orderable', True))
+        self._values = {facet: self._entries((display, self.quote(value)) for display, value in pairs)
+                        for facet, pairs in (metadata.get('values') or {}).items()}
+        self._functions = metadata.get('functions') or []
+        # Listas fijas por estado; las de valores se arman la primera vez que se piden
+        self._field_state_entries = self._entries(
+            [(field['value'], field['value']) for field in fields] + [('NOT', 'NOT'), ('ORDER BY', 'ORDER BY')])
+        self._keyword_entries = self._entries((word, word) for word in ('AND', 'OR', 'ORDER BY'))
+        self._by_entries = self._entries([('BY', 'BY')])
+        self._direction_entries = self._entries([('ASC', 'ASC'), ('DESC', 'DESC'), (',', ',')])
+        self._empty_entries = self._entries([('EMPTY', 'EMPTY'), ('NULL', 'NULL')])
+        self._value_cache = {}  # Campo -> entradas de valores
+    
+    @staticmethod
+    def _match_key(text: str) -> str:
+        return text.strip('"\'').lower()
+    
+    @classmethod
+    def _entries(cls, pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str, str]]:
+        """Lista ordenada de (clave de búsqueda, texto visible, texto a insertar)"""
+        return sorted({(cls._match_key(display), display, insert) for display, insert in pairs if display})
+    
+    def quote(self, value: str) -> str:
+        """Valor listo para JQL (entre comillas si tiene espacios o es palabra reservada)"""
+        if self.PLAIN_VALUE.fullmatch(value) and value.lower() not in self.reserved:
+            return value
+        return '"{}"'.format(value.replace('\\', '\\\\').replace('"', '\\"'))
+    
+    @classmethod
+    def _match(cls, entries: List[Tuple[str, str, str]], prefix: str, limit: int) -> List[Tuple[str, str]]:
+        """Entradas que empiezan con el prefijo y, si faltan, las que lo contienen"""
+        prefix = cls._match_key(prefix)
+        matches = []
+        position = bisect.bisect_left(entries, (prefix,))
+        while position < len(entries) and len(matches) < limit and entries[position][0].startswith(prefix):
+            matches.append(entries[position][1:])
+            position += 1
+        if prefix and len(matches) < limit:
+            for key, display, insert in entries:
+                if prefix in key and not key.startswith(prefix):
+                    matches.append((display, insert))
+                    if len(matches) >= limit:
+                        break
+        return matches
+    
+    def _operators(self, field: Optional[str]) -> List[str]:
+        info = self.fields.get(self._match_key(field or ''))
+        return (info or {}).get('operators') or list(self.DEFAULT_OPERATORS)
+    
+    def _value_entries(self, field: Optional[str], operator: str) -> List[Tuple[str, str, str]]:
+        """Valores posibles de un campo: guardados, funciones compatibles y EMPTY"""
+        if operator in ('is', 'is not'):
+            return self._empty_entries
+        key = self._match_key(field or '')
+        cached = self._value_cache.get(key)
+        if cached is not None:
+            return cached
+        entries = list(self._values.get(self.FIELD_VALUES.get(key), []))
+        field_types = set((self.fields.get(key) or {}).get('types') or [])
+        functions = [function['value'] for function in self._functions
+                     if field_types & set(function.get('types') or [])]
+        if not self._functions and self.FIELD_VALUES.get(key) == 'user':
+            functions = list(self.USER_FUNCTIONS)
+        entries.extend(self._entries((function, function) for function in functions))
+        entries.sort()
+        self._value_cache[key] = entries
+        return entries
+    
+    def suggest(self, text: str, cursor: int = None, limit: int = 15) -> Tuple[int, List[Tuple[str, str]]]:
+        """
+        Sugerencias para el texto hasta el cursor
+        
+        Returns:
+            Tuple[int, List[Tuple[str, str]]]: Posición desde la que se reemplaza
+                el texto y pares (texto visible, texto a insertar)
+        """
+        cursor = len(text) if cursor is None else cursor
+        before = text[:cursor]
+        tokens = [(match.group(), match.start()) for match in self.TOKEN.finditer(before)]
+        
+        # El último token está a medio escribir si llega hasta el cursor
+        partial, start = '', cursor
+        if tokens:
+            token, position = tokens[-1]
+            if position + len(token) == cursor and token not in '(),' and token not in self.SYMBOL_OPERATORS:
+                partial, start = token, position
+                tokens.pop()
+        
+        state, field, operator_words, operator_start, in_list = 'field', None, [], cursor, False
+        for token, position in tokens:
+            lower = token.lower()
+            if state == 'operator':
+                if token in self.SYMBOL_OPERATORS:
+                    operator_words = [token]
+                    state = 'value'
+                    continue
+                if lower in self.OPERATOR_WORDS:
+                    if not operator_words:
+                        operator_start = position
+                    operator_words.append(lower)
+                    continue
+                state = 'value'
+            if state == 'field':
+                if token == '(' or lower == 'not':
+                    continue
+                if lower == 'order':
+                    state = 'order_by'
+                    continue
+                field, operator_words, state = token, [], 'operator'
+            elif state == 'value':
+                if token == '(':
+                    in_list = True
+                elif not in_list or token == ')':
+                    in_list = False
+                    state = 'keyword'
+            elif state == 'keyword':
+                if lower in ('and', 'or'):
+                    state = 'field'
+                elif lower == 'order':
+                    state = 'order_by'
+            elif state == 'order_by':
+                if lower == 'by':
+                    state = 'order_field'
+            elif state == 'order_field':
+                state = 'order_direction'
+            elif state == 'order_direction':
+                if token == ',':
+                    state = 'order_field'
+        
+        if state == 'operator':
+            phrase = ' '.join(operator_words + ([partial.lower()] if partial else []))
+            operators = [operator for operator in self._operators(field) if operator.startswith(phrase)]
+            if operators and (partial or ' '.join(operator_words) not in operators):
+                replace_start = operator_start if operator_words else start
+                return replace_start, [(operator, operator) for operator in operators[:limit]]
+            state = 'value'
+        
+        if state == 'field':
+            return start, self._match(self._field_state_entries, partial, limit)
+        if state == 'value':
+            operator = ' '.join(operator_words)
+            return start, self._match(self._value_entries(field, operator), partial, limit)
+        if state == 'keyword':
+            return start, self._match(self._keyword_entries, partial, limit)
+        if state == 'order_by':
+            return start, self._match(self._by_entries, partial, limit)
+        if state == 'order_field':
+            return start, self._match(self._order_entries, partial, limit)
+        return start, self._match(self._direction_entries, partial, limit)
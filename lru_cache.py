@@ -0,0 +1,46 @@
+"""
+Caché LRU acotada y segura entre hilos
+Compartida por los servicios de Git y Jira
+"""
+
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """Caché LRU acotada por número de entradas"""
+    
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Los workers y el hilo de la UI pueden usar la misma caché
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Obtiene una entrada y la marca como usada recientemente"""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+    
+    def put(self, key, value):
+        """Guarda una entrada descartando la menos usada si se supera el límite"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def discard(self, key):
+        """Elimina una entrada si existe"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+    
+    def clear(self):
+        """Limpia la caché"""
+        with self._lock:
+            self._entries.clear()
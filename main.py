@@ -10,6 +10,7 @@ Autor: Developer Full Stack
 Versión: 2.0.0
 """
 
+import re
 import sys
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
@@ -602,12 +603,17 @@ except ImportError:
     print("⚠️ GitHub widget no disponible - asegúrate de tener PyGithub instalado")
 
 try:
-    from jira_widget import JiraWidget
+    from jira_widget import JiraWidget, JiraAutofillWorker
+    from jira_batch_report_dialog import JiraBatchReportDialog
     JIRA_AVAILABLE = True
 except ImportError:
     JIRA_AVAILABLE = False
     print("⚠️ Jira widget no disponible - asegúrate de tener jira instalado")
 
+from git_local_widget import GitLocalWidget
+from webhook_receiver import WebhookReceiver
+from evidence_upload_dialog import EvidenceUploadDialog
+
 class QAGenerator(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -675,11 +681,46 @@ class QAGenerator(QMainWindow):
             self.jira_widget = self.create_jira_tab()
             self.widgets_with_threads.append(self.jira_widget)
         
+        # Pestaña de Git local
+        self.git_local_widget = self.create_git_local_tab()
+        self.widgets_with_threads.append(self.git_local_widget)
+        
         # Pestaña del chatbot RFlex
         self.create_rflex_chatbot_tab()
         
         main_layout.addWidget(self.tab_widget)
         
+        # Actualizaciones por webhook (opcional; la consulta periódica sigue como respaldo)
+        self._setup_webhook_receiver()
+        
+    def _setup_webhook_receiver(self):
+        """Inicia el receptor local de webhooks de Jira y GitHub si está habilitado"""
+        self.webhook_receiver = None
+        jira_widget = getattr(self, 'jira_widget', None)
+        github_widget = getattr(self, 'github_widget', None)
+        if not app_config.get("webhook_enabled", False) or not (jira_widget or github_widget):
+            return
+        
+        self.webhook_receiver = WebhookReceiver(
+            app_config.get("webhook_host") or WebhookReceiver.DEFAULT_HOST,
+            app_config.get("webhook_port") or WebhookReceiver.DEFAULT_PORT,
+            jira_secret=app_config.get("webhook_jira_secret"),
+            github_secret=app_config.get("webhook_github_secret")
+        )
+        if jira_widget:
+            self.webhook_receiver.jira_event.connect(jira_widget.apply_webhook_event)
+        if github_widget:
+            self.webhook_receiver.github_event.connect(github_widget.apply_webhook_event)
+            # Mientras el receptor corre, la caché de ramas se mantiene al día con los webhooks
+            self.webhook_receiver.server_started.connect(
+                lambda host, port: github_widget.github_service.set_webhooks_active(True))
+            self.webhook_receiver.finished.connect(
+                lambda: github_widget.github_service.set_webhooks_active(False))
+        self.webhook_receiver.server_started.connect(
+            lambda host, port: print(f"📡 Receptor de webhooks escuchando en http://{host}:{port}"))
+        self.webhook_receiver.error_occurred.connect(lambda message: print(f"⚠️ {message}"))
+        self.webhook_receiver.start()
+        
     def create_toolbar(self):
         """Crea la barra de herramientas con toggle de tema"""
         self.toolbar = QFrame()
@@ -804,6 +845,9 @@ class QAGenerator(QMainWindow):
         jira_layout.addWidget(QLabel("Jira:"))
         self.entry_jira = self.factory.create_input_field("Ingrese el número de Jira")
         jira_layout.addWidget(self.entry_jira)
+        self.btn_autocompletar_jira = self.factory.create_button("⚡ Autocompletar")
+        self.btn_autocompletar_jira.setToolTip("Completa título, PRs, ambientes y responsables desde el issue de Jira")
+        jira_layout.addWidget(self.btn_autocompletar_jira)
         basic_layout.addLayout(jira_layout)
         
         layout.addWidget(basic_group)
@@ -893,6 +937,27 @@ class QAGenerator(QMainWindow):
         self.tab_widget.addTab(jira_tab, "🔧 Jira")
         
         return jira_widget
+        
+    def create_git_local_tab(self):
+        """Crea la pestaña de Git local"""
+        git_local_tab = QWidget()
+        git_local_layout = QVBoxLayout(git_local_tab)
+        
+        # Título de la pestaña
+        git_local_title = QLabel("💻 GIT LOCAL")
+        git_local_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        git_local_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        git_local_title.setStyleSheet("color: #3D3D3D; background-color: #F5F7FA; padding: 15px; border-radius: 8px; border: 2px solid #616DB3; margin: 10px;")
+        git_local_layout.addWidget(git_local_title)
+        
+        # Widget de Git local
+        git_local_widget = GitLocalWidget()
+        git_local_layout.addWidget(git_local_widget)
+        
+        # Agregar pestaña al tab widget
+        self.tab_widget.addTab(git_local_tab, "💻 Git Local")
+        
+        return git_local_widget
 
     def create_basic_info_section(self, layout):
         """Crea la sección de información básica"""
@@ -1126,6 +1191,12 @@ class QAGenerator(QMainWindow):
         group_layout.addWidget(self.btn_copiar)
         self.btn_limpiar = self.factory.create_button("🧹 Limpiar Todo", "clearBtn")
         group_layout.addWidget(self.btn_limpiar)
+        self.btn_reportes_lote = self.factory.create_button("📦 Reportes del Sprint")
+        self.btn_reportes_lote.setToolTip("Genera un reporte QA por cada issue de un sprint o una JQL")
+        group_layout.addWidget(self.btn_reportes_lote)
+        self.btn_evidencias = self.factory.create_button("📎 Subir Evidencias")
+        self.btn_evidencias.setToolTip("Adjunta capturas o logs al issue de Jira y los publica en Slack")
+        group_layout.addWidget(self.btn_evidencias)
         group.setLayout(group_layout)
         layout.addWidget(group)
 
@@ -1167,11 +1238,14 @@ class QAGenerator(QMainWindow):
         self.btn_copiar.clicked.connect(self._on_copiar_texto)
         self.btn_limpiar.clicked.connect(self._on_limpiar_formulario)
         self.btn_enviar_slack.clicked.connect(self._on_enviar_a_slack_desde_acciones)
+        self.btn_reportes_lote.clicked.connect(self._on_reportes_lote)
+        self.btn_evidencias.clicked.connect(self._on_subir_evidencias)
         self.combo_destino_main.currentIndexChanged.connect(self._habilitar_envio_si_listo)
         
         # Conectar campos de texto
         self.entry_titulo.textChanged.connect(self._on_titulo_changed)
         self.entry_jira.textChanged.connect(self._on_jira_changed)
+        self.btn_autocompletar_jira.clicked.connect(self._on_autocompletar_jira)
     
     def _on_agregar_ambiente_pr(self):
         """Maneja el evento de agregar ambiente y PR"""
@@ -1285,6 +1359,73 @@ class QAGenerator(QMainWindow):
     def _on_jira_changed(self, text: str):
         """Maneja cambios en el link de Jira"""
         self.controller.actualizar_jira(text)
+    
+    def _on_autocompletar_jira(self):
+        """Reúne en background los datos del issue indicado en el campo Jira"""
+        jira_widget = getattr(self, 'jira_widget', None)
+        if not JIRA_AVAILABLE or not jira_widget or not jira_widget.jira_service.is_connected:
+            QMessageBox.warning(self, "Jira", "❌ Conéctate a Jira en la pestaña Jira para autocompletar.")
+            return
+        
+        # Acepta la clave o el link del issue
+        match = re.search(r'[A-Z][A-Z0-9_]+-\d+', self.entry_jira.text().upper())
+        if not match:
+            QMessageBox.warning(self, "Jira", "❌ Ingresa la clave del issue (ej: PROJ-123) o su link.")
+            return
+        
+        self.btn_autocompletar_jira.setEnabled(False)
+        self.btn_autocompletar_jira.setText("🔄 Autocompletando...")
+        self.autofill_worker = JiraAutofillWorker(jira_widget.jira_service, match.group(0),
+                                                  app_config.get("jira_qa_role_fields"))
+        self.autofill_worker.autofill_ready.connect(self._on_autocompletado_jira)
+        self.autofill_worker.error_occurred.connect(self._on_error_autocompletado_jira)
+        self.autofill_worker.start()
+    
+    def _on_autocompletado_jira(self, datos: dict):
+        """Carga en el controlador y en la UI los datos del issue en un solo paso"""
+        self.btn_autocompletar_jira.setEnabled(True)
+        self.btn_autocompletar_jira.setText("⚡ Autocompletar")
+        
+        # Ramas y commits que mencionan la clave, del índice local (sin peticiones)
+        ramas, commits = self._buscar_referencias_git(datos['key'])
+        datos = dict(datos, prs=list(datos.get('prs', [])) + ramas + commits)
+        
+        agregados = self.controller.autocompletar_desde_jira(datos)
+        tarea = self.controller.tarea
+        self.entry_titulo.setText(tarea.titulo)
+        self.entry_jira.setText(tarea.jira)
+        
+        listas = self.controller.obtener_todas_las_listas_para_ui()
+        for lista, items in ((self.lista_ambientes_prs, listas['ambientes_prs']),
+                             (self.lista_qa_usu, listas['qa_usabilidad']),
+                             (self.lista_qa_cod, listas['qa_codigo'])):
+            lista.clear()
+            lista.addItems(items)
+        
+        resumen = (f"✅ {datos['key']}: {agregados['prs']} PRs y {agregados['responsables']} responsables agregados"
+                   f"\n🌐 Ambientes: {', '.join(datos['environments']) or 'ninguno'}")
+        if ramas or commits:
+            resumen += f"\n🔗 Índice Git: {len(ramas)} ramas y {len(commits)} commits con la clave"
+        if datos.get('errors'):
+            resumen += "\n\n⚠️ Datos no disponibles:\n" + "\n".join(f"• {error}" for error in datos['errors'])
+        QMessageBox.information(self, "⚡ Autocompletar desde Jira", resumen)
+    
+    def _buscar_referencias_git(self, issue_key: str, max_commits: int = 10):
+        """Ramas y commits (los más recientes) que mencionan la clave, con el formato de los PRs"""
+        github_widget = getattr(self, 'github_widget', None)
+        if not github_widget:
+            return [], []
+        encontrados = github_widget.github_service.key_index.lookup(issue_key)
+        ramas = [{'url': rama['url']} for rama in encontrados['branches']]
+        commits = [{'url': commit['url'] or f"{commit['repo']}@{commit['sha'][:7]}"}
+                   for commit in encontrados['commits'][:max_commits]]
+        return ramas, commits
+    
+    def _on_error_autocompletado_jira(self, error_msg: str):
+        """Informa que no se pudo obtener el issue"""
+        self.btn_autocompletar_jira.setEnabled(True)
+        self.btn_autocompletar_jira.setText("⚡ Autocompletar")
+        QMessageBox.warning(self, "Jira", f"❌ No se pudo autocompletar:\n{error_msg}")
 
     def _habilitar_envio_si_listo(self):
         # Habilita el botón solo si hay conexión y destino
@@ -1336,6 +1477,70 @@ class QAGenerator(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Slack", f"❌ Error: {e}")
 
+    def _on_reportes_lote(self):
+        """Abre el generador de reportes QA de un sprint completo"""
+        jira_widget = getattr(self, 'jira_widget', None)
+        if not JIRA_AVAILABLE or not jira_widget or not jira_widget.jira_service.is_connected:
+            QMessageBox.warning(self, "Jira", "❌ Conéctate a Jira en la pestaña Jira para generar los reportes.")
+            return
+        
+        # El destino se fija al abrir: el lote envía desde su propio hilo
+        slack_sender = None
+        destino = ""
+        if self.slack_panel.use_case and self.combo_destino_main.currentIndex() >= 0:
+            use_case = self.slack_panel.use_case
+            canal_id = self.combo_destino_main.currentData()
+            destino = self.combo_destino_main.currentText()
+            usuario = self.slack_panel.usuario_input.text().strip() or 'desconocido'
+            
+            def slack_sender(texto):
+                resultado = use_case.execute(texto, canal_id)
+                fecha = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
+                db.save_historial_envio(fecha, destino, texto, 'Éxito' if resultado else 'Error', usuario)
+                return resultado
+        
+        dialog = JiraBatchReportDialog(
+            self, jira_widget.jira_service,
+            app_config.get("qa_batch_output_dir") or str(app_config.config_dir / "reportes"),
+            max_workers=app_config.get("qa_batch_max_workers", 4),
+            role_fields=app_config.get("jira_qa_role_fields"),
+            checkpoint_dir=app_config.config_dir / "batch_reports",
+            slack_sender=slack_sender, slack_destination=destino
+        )
+        dialog.exec()
+        if dialog.output_input.text().strip():
+            app_config.set("qa_batch_output_dir", dialog.output_input.text().strip())
+        if slack_sender:
+            self.slack_panel._load_historial()
+    
+    def _on_subir_evidencias(self):
+        """Abre la subida de evidencias al issue de Jira y al destino de Slack"""
+        jira_widget = getattr(self, 'jira_widget', None)
+        jira_service = None
+        if JIRA_AVAILABLE and jira_widget and jira_widget.jira_service.is_connected:
+            jira_service = jira_widget.jira_service
+        
+        slack_client = None
+        canal_id = None
+        destino = ""
+        if self.slack_panel.use_case and self.combo_destino_main.currentIndex() >= 0:
+            slack_client = self.slack_panel.slack_service.slack_client
+            canal_id = self.combo_destino_main.currentData()
+            destino = self.combo_destino_main.currentText()
+        
+        if not jira_service and not slack_client:
+            QMessageBox.warning(self, "Evidencias", "❌ Conéctate a Jira o configura Slack para subir evidencias.")
+            return
+        
+        # El issue del formulario es el destino por defecto
+        match = re.search(r'[A-Z][A-Z0-9_]+-\d+', self.entry_jira.text().upper())
+        dialog = EvidenceUploadDialog(
+            self, jira_service, match.group(0) if match else "",
+            slack_client=slack_client, slack_channel=canal_id, slack_destination=destino,
+            max_workers=app_config.get("evidence_max_workers", 3)
+        )
+        dialog.exec()
+    
     def _get_tarea_actual(self):
         return self.controller.tarea
 
@@ -1438,6 +1643,14 @@ def formatear_tarea_qa_para_historial(tarea):
                 print(f"🧽 Limpiando threads de {widget.__class__.__name__}")
                 widget.cleanup_threads()
         
+        # Detener el receptor de webhooks
+        receiver = getattr(self, 'webhook_receiver', None)
+        if receiver and receiver.isRunning():
+            receiver.stop()
+            if not receiver.wait(3000):
+                receiver.terminate()
+                receiver.wait()
+        
         print("✅ Threads limpiados")
     
     def closeEvent(self, event):
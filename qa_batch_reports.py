@@ -0,0 +1,244 @@
+"""
+Generación en lote de reportes QA para un sprint o una JQL
+Recorre los issues página por página, autocompleta una TareaQA por issue con
+un número acotado de hilos y guarda cada reporte en su propio archivo. El
+avance queda en un checkpoint para reanudar si el lote se interrumpe.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from controllers import TareaQAController
+from jira_query_cache import JiraQueryCache
+
+
+class QABatchCheckpoint:
+    """Avance de un lote guardado en disco después de cada reporte"""
+    
+    def __init__(self, path: Path, jql: str, output_dir: str):
+        self.path = Path(path)
+        self.jql = jql
+        self.output_dir = output_dir
+        self.done = {}        # Clave del issue -> archivo del reporte
+        self.failed = {}      # Clave del issue -> último error
+        self.slack_sent = []  # Claves ya enviadas a Slack
+        self.total = None
+    
+    @classmethod
+    def load(cls, path: Path, jql: str, output_dir: str) -> 'QABatchCheckpoint':
+        """Carga el checkpoint si corresponde a la misma JQL y carpeta; si no, uno vacío"""
+        checkpoint = cls(path, jql, output_dir)
+        try:
+            if checkpoint.path.exists():
+                with open(checkpoint.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('jql') == jql and data.get('output_dir') == output_dir:
+                    # Los reportes borrados a mano se vuelven a generar
+                    checkpoint.done = {key: file for key, file in data.get('done', {}).items()
+                                       if os.path.exists(file)}
+                    checkpoint.failed = data.get('failed', {})
+                    checkpoint.slack_sent = [key for key in data.get('slack_sent', [])
+                                             if key in checkpoint.done]
+                    checkpoint.total = data.get('total')
+        except Exception as e:
+            print(f"Error cargando checkpoint del lote: {e}")
+        return checkpoint
+    
+    def save(self):
+        """Escribe el checkpoint de forma atómica (un corte no deja el archivo a medias)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'jql': self.jql,
+                'output_dir': self.output_dir,
+                'done': self.done,
+                'failed': self.failed,
+                'slack_sent': self.slack_sent,
+                'total': self.total,
+                'updated': time.time()
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+    
+    def delete(self):
+        """Elimina el checkpoint (el lote terminó sin pendientes)"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def pending_slack(self) -> List[str]:
+        """Reportes generados que todavía no se enviaron a Slack"""
+        sent = set(self.slack_sent)
+        return [key for key in self.done if key not in sent]
+
+
+class QABatchReportPipeline:
+    """
+    Genera el reporte QA de cada issue de una JQL
+    
+    Los issues se piden por páginas y solo se toma el siguiente cuando hay lugar
+    entre los max_workers autocompletados en curso, así que el lote no espera a
+    tener toda la búsqueda ni la guarda completa en memoria. Los reportes se
+    escriben y, si hay un enviador de Slack, se envían en orden de llegada
+    desde el hilo que ejecuta run().
+    """
+    
+    CHECKPOINT_DIR = Path.home() / ".qa_generator" / "batch_reports"
+    DEFAULT_MAX_WORKERS = 4
+    
+    def __init__(self, jira_service, output_dir: str, max_workers: int = DEFAULT_MAX_WORKERS,
+                 role_fields: Dict[str, List[str]] = None,
+                 slack_sender: Optional[Callable[[str], bool]] = None,
+                 checkpoint_dir: Path = CHECKPOINT_DIR):
+        self.jira_service = jira_service
+        self.output_dir = str(Path(output_dir).expanduser())
+        self.max_workers = max(1, max_workers)
+        self.role_fields = role_fields
+        self.slack_sender = slack_sender
+        self.checkpoint_dir = Path(checkpoint_dir)
+    
+    @staticmethod
+    def sprint_jql(sprint: str) -> str:
+        """JQL de un sprint por id o nombre; vacío para los sprints abiertos"""
+        sprint = sprint.strip()
+        if not sprint:
+            clause = "sprint in openSprints()"
+        elif sprint.isdigit():
+            clause = f"sprint = {sprint}"
+        else:
+            clause = 'sprint = "{}"'.format(sprint.replace('\\', '\\\\').replace('"', '\\"'))
+        return f"{clause} ORDER BY key ASC"
+    
+    def checkpoint_path(self, jql: str) -> Path:
+        """Archivo de checkpoint de una JQL y carpeta de salida"""
+        source = f"{JiraQueryCache.normalize_jql(jql)}\n{self.output_dir}"
+        return self.checkpoint_dir / f"{hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]}.json"
+    
+    def load_checkpoint(self, jql: str) -> QABatchCheckpoint:
+        """Checkpoint existente (o vacío) del lote"""
+        return QABatchCheckpoint.load(self.checkpoint_path(jql), JiraQueryCache.normalize_jql(jql),
+                                      self.output_dir)
+    
+    def build_report(self, issue_key: str) -> Dict:
+        """Autocompleta la tarea QA de un issue y devuelve su texto"""
+        datos = self.jira_service.get_qa_autofill(issue_key, self.role_fields)
+        controller = TareaQAController()
+        controller.autocompletar_desde_jira(datos)
+        return {'key': datos['key'], 'text': controller.generar_texto(), 'warnings': datos['errors']}
+    
+    def save_report(self, issue_key: str, text: str) -> str:
+        """Guarda el reporte en la carpeta de salida"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        file_name = re.sub(r'[^\w.-]', '_', issue_key) + '.txt'
+        path = os.path.join(self.output_dir, file_name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+    
+    def run(self, jql: str, restart: bool = False,
+            on_progress: Callable[[str, bool, str, int, Optional[int]], None] = None,
+            should_stop: Callable[[], bool] = None) -> Dict:
+        """
+        Ejecuta el lote reanudando desde el checkpoint de la misma JQL
+        
+        Args:
+            jql: Query JQL de los issues
+            restart: Ignorar el checkpoint y generar todo de nuevo
+            on_progress: Recibe (clave, éxito, mensaje, reportes listos, total)
+            should_stop: Devuelve True para no tomar más issues
+        
+        Returns:
+            Dict: generated, skipped, failed (clave -> error), sent, stopped y output_dir
+        """
+        checkpoint = self.load_checkpoint(jql)
+        if restart:
+            checkpoint = QABatchCheckpoint(checkpoint.path, checkpoint.jql, self.output_dir)
+        
+        try:
+            checkpoint.total = self.jira_service.count_issues(jql)
+        except Exception as e:
+            print(f"No se pudo contar los issues del lote: {e}")
+        checkpoint.save()
+        
+        summary = {'generated': 0, 'skipped': 0, 'failed': {}, 'sent': 0,
+                   'stopped': False, 'output_dir': self.output_dir}
+        
+        def report(issue_key, success, message):
+            if on_progress:
+                on_progress(issue_key, success, message, len(checkpoint.done), checkpoint.total)
+        
+        def send_to_slack(issue_key):
+            if not self.slack_sender:
+                return
+            try:
+                with open(checkpoint.done[issue_key], 'r', encoding='utf-8') as f:
+                    text = f.read()
+                if not self.slack_sender(text):
+                    raise Exception("Slack rechazó el mensaje")
+                checkpoint.slack_sent.append(issue_key)
+                checkpoint.save()
+                summary['sent'] += 1
+            except Exception as e:
+                report(issue_key, False, f"Reporte guardado, pero no se envió a Slack: {e}")
+        
+        # Reportes de una ejecución anterior que quedaron sin enviar
+        for issue_key in checkpoint.pending_slack() if self.slack_sender else []:
+            if should_stop and should_stop():
+                break
+            send_to_slack(issue_key)
+        
+        def handle(future, issue_key):
+            try:
+                result = future.result()
+                checkpoint.done[issue_key] = self.save_report(issue_key, result['text'])
+                checkpoint.failed.pop(issue_key, None)
+                checkpoint.save()
+                summary['generated'] += 1
+                warnings = "; ".join(result['warnings'])
+                report(issue_key, True, f"Datos incompletos: {warnings}" if warnings else "")
+                send_to_slack(issue_key)
+            except Exception as e:
+                checkpoint.failed[issue_key] = str(e)
+                checkpoint.save()
+                summary['failed'][issue_key] = str(e)
+                report(issue_key, False, str(e))
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        in_flight = {}
+        try:
+            for page in self.jira_service.iter_search_pages(jql, fields=['summary'], use_cache=False):
+                for issue in page:
+                    if should_stop and should_stop():
+                        summary['stopped'] = True
+                        break
+                    if issue.key in checkpoint.done:
+                        summary['skipped'] += 1
+                        continue
+                    # Sin lugar libre: procesar lo que termine antes de tomar otro issue
+                    while len(in_flight) >= self.max_workers:
+                        finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            handle(future, in_flight.pop(future))
+                    in_flight[executor.submit(self.build_report, issue.key)] = issue.key
+                if summary['stopped']:
+                    break
+            
+            for future in list(in_flight):
+                wait([future])
+                handle(future, in_flight.pop(future))
+        except Exception as e:
+            raise Exception(f"Error generando el lote de reportes: {e}")
+        finally:
+            executor.shutdown(wait=True)
+        
+        # Sin fallos ni pendientes no hay nada que reanudar
+        if not summary['stopped'] and not checkpoint.failed and not (
+                self.slack_sender and checkpoint.pending_slack()):
+            checkpoint.delete()
+        return summary
@@ -231,9 +231,9 @@ class LightTheme:
     
     @staticmethod
     def get_listwidget_style():
-        """Estilos para QListWidget (listas)"""
+        """Estilos para QListWidget y QListView (listas)"""
         return f"""
-        QListWidget {{
+        QListView {{
             background-color: #F5F7FA;
             border: 2px solid #616DB3;
             border-radius: 6px;
@@ -241,11 +241,11 @@ class LightTheme:
             font-size: 11px;
             padding: 5px;
         }}
-        QListWidget::item {{
+        QListView::item {{
             padding: 5px;
             border-bottom: 1px solid #A4B3DC;
         }}
-        QListWidget::item:selected {{
+        QListView::item:selected {{
             background-color: #616DB3;
             color: #FFFFFF;
         }}
@@ -530,9 +530,9 @@ class DarkTheme:
     
     @staticmethod
     def get_listwidget_style():
-        """Estilos para QListWidget (listas)"""
+        """Estilos para QListWidget y QListView (listas)"""
         return f"""
-        QListWidget {{
+        QListView {{
             background-color: #44475a;
             border: 2px solid #6272a4;
             border-radius: 6px;
@@ -540,11 +540,11 @@ class DarkTheme:
             font-size: 11px;
             padding: 5px;
         }}
-        QListWidget::item {{
+        QListView::item {{
             padding: 5px;
             border-bottom: 1px solid #6272a4;
         }}
-        QListWidget::item:selected {{
+        QListView::item:selected {{
             background-color: #6272a4;
             color: #f8f8f2;
         }}
@@ -0,0 +1,153 @@
+"""
+Receptor local de webhooks de Jira y GitHub
+Un servidor HTTP mínimo sobre asyncio corre en su propio hilo y reenvía cada
+evento a la UI con señales; la consulta periódica sigue como respaldo.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+from typing import Optional, Tuple
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class WebhookReceiver(QThread):
+    """
+    Servidor de webhooks embebido
+    
+    Acepta POST /jira (eventos de issues) y POST /github (push, create y
+    delete). Si hay secreto configurado, el cuerpo se valida con la firma
+    HMAC-SHA256 (X-Hub-Signature-256 en GitHub, X-Hub-Signature en Jira).
+    """
+    
+    jira_event = pyqtSignal(str, dict)    # webhookEvent, payload
+    github_event = pyqtSignal(str, dict)  # X-GitHub-Event, payload
+    server_started = pyqtSignal(str, int)
+    error_occurred = pyqtSignal(str)
+    
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8765
+    MAX_BODY_SIZE = 10 * 1024 * 1024
+    READ_TIMEOUT = 10
+    GITHUB_EVENTS = ('push', 'create', 'delete')
+    
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 jira_secret: str = None, github_secret: str = None):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.jira_secret = jira_secret
+        self.github_secret = github_secret
+        self._loop = None
+        self._stop_event = None
+    
+    def run(self):
+        """Ejecuta el servidor en un event loop propio hasta que se llame stop()"""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        except Exception as e:
+            self.error_occurred.emit(f"Error en el receptor de webhooks: {e}")
+        finally:
+            self._loop.close()
+            self._loop = None
+    
+    def stop(self):
+        """Detiene el servidor desde cualquier hilo"""
+        loop, stop_event = self._loop, self._stop_event
+        if loop and stop_event:
+            try:
+                loop.call_soon_threadsafe(stop_event.set)
+            except RuntimeError:
+                pass  # El loop ya se cerró
+    
+    async def _serve(self):
+        self._stop_event = asyncio.Event()
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        async with server:
+            self.server_started.emit(self.host, self.port)
+            await self._stop_event.wait()
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atiende una petición por conexión y la cierra"""
+        try:
+            status, body = await asyncio.wait_for(self._handle_request(reader), self.READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            status, body = 408, "Request Timeout"
+        except Exception as e:
+            print(f"Error atendiendo webhook: {e}")
+            status, body = 400, "Bad Request"
+        
+        payload = body.encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {body}\r\n"
+            f"Content-Type: text/plain; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n\r\n".encode('ascii') + payload
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+    
+    async def _handle_request(self, reader: asyncio.StreamReader) -> Tuple[int, str]:
+        """Lee la petición, valida la firma y emite el evento; devuelve (status, texto)"""
+        request_line = (await reader.readline()).decode('latin-1').strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            return 400, "Bad Request"
+        method, target, _ = parts
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        
+        path = target.split('?', 1)[0].rstrip('/')
+        if path not in ('/jira', '/github'):
+            return 404, "Not Found"
+        if method != 'POST':
+            return 405, "Method Not Allowed"
+        
+        length = int(headers.get('content-length') or 0)
+        if length > self.MAX_BODY_SIZE:
+            return 413, "Payload Too Large"
+        body = await reader.readexactly(length) if length else b''
+        
+        if path == '/jira':
+            if not self.verify_signature(self.jira_secret, body, headers.get('x-hub-signature')):
+                return 401, "Unauthorized"
+            payload = json.loads(body or b'{}')
+            event = payload.get('webhookEvent') or ''
+            if not event:
+                return 400, "Bad Request"
+            self.jira_event.emit(event, payload)
+            return 200, "OK"
+        
+        if not self.verify_signature(self.github_secret, body, headers.get('x-hub-signature-256')):
+            return 401, "Unauthorized"
+        event = headers.get('x-github-event', '')
+        if event == 'ping':
+            return 200, "OK"
+        if event not in self.GITHUB_EVENTS:
+            return 202, "Accepted"  # Evento sin efecto en la app
+        self.github_event.emit(event, json.loads(body or b'{}'))
+        return 200, "OK"
+    
+    @staticmethod
+    def sign(secret: str, body: bytes) -> str:
+        """Firma HMAC-SHA256 con el formato de las cabeceras X-Hub-Signature"""
+        return "sha256=" + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    
+    @classmethod
+    def verify_signature(cls, secret: Optional[str], body: bytes, signature: Optional[str]) -> bool:
+        """Sin secreto configurado se acepta todo; con secreto la firma debe coincidir"""
+        if not secret:
+            return True
+        if not signature:
+            return False
+        return hmac.compare_digest(cls.sign(secret, body), signature)
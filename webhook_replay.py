@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Reenvía payloads de webhooks guardados al receptor local (para desarrollo)
+
+Ejemplos:
+    python webhook_replay.py jira issue_updated.json
+    python webhook_replay.py github push.json --event push --secret mi-secreto
+"""
+
+import sys
+import json
+import time
+import argparse
+import requests
+from webhook_receiver import WebhookReceiver
+
+
+def load_payloads(paths):
+    """Lee cada archivo: un payload JSON o una lista de payloads"""
+    payloads = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        payloads.extend(data if isinstance(data, list) else [data])
+    return payloads
+
+
+def replay(source, payloads, event="push", host=WebhookReceiver.DEFAULT_HOST,
+           port=WebhookReceiver.DEFAULT_PORT, secret=None, delay=0.0):
+    """Envía los payloads en orden y devuelve la cantidad aceptada"""
+    url = f"http://{host}:{port}/{source}"
+    accepted = 0
+    for position, payload in enumerate(payloads, 1):
+        body = json.dumps(payload).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if source == 'github':
+            headers['X-GitHub-Event'] = event
+            if secret:
+                headers['X-Hub-Signature-256'] = WebhookReceiver.sign(secret, body)
+        elif secret:
+            headers['X-Hub-Signature'] = WebhookReceiver.sign(secret, body)
+        
+        response = requests.post(url, data=body, headers=headers, timeout=10)
+        label = payload.get('webhookEvent', '') if source == 'jira' else event
+        print(f"{'✅' if response.ok else '❌'} [{position}/{len(payloads)}] {label}: "
+              f"{response.status_code} {response.text}")
+        accepted += response.ok
+        if delay and position < len(payloads):
+            time.sleep(delay)
+    return accepted
+
+
+def main():
+    """Función principal del reenvío"""
+    parser = argparse.ArgumentParser(description='Reenvía webhooks guardados al receptor local de QA Generator')
+    parser.add_argument('source', choices=['jira', 'github'],
+                       help='Origen del webhook')
+    parser.add_argument('files', nargs='+',
+                       help='Archivos JSON con un payload o una lista de payloads')
+    parser.add_argument('--event', default='push', choices=list(WebhookReceiver.GITHUB_EVENTS) + ['ping'],
+                       help='Evento de GitHub (default: push)')
+    parser.add_argument('--host', default=WebhookReceiver.DEFAULT_HOST,
+                       help=f'Host del receptor (default: {WebhookReceiver.DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=WebhookReceiver.DEFAULT_PORT,
+                       help=f'Puerto del receptor (default: {WebhookReceiver.DEFAULT_PORT})')
+    parser.add_argument('--secret',
+                       help='Secreto para firmar los payloads')
+    parser.add_argument('--delay', type=float, default=0.0,
+                       help='Segundos entre envíos (default: 0)')
+    
+    args = parser.parse_args()
+    payloads = load_payloads(args.files)
+    accepted = replay(args.source, payloads, args.event, args.host, args.port, args.secret, args.delay)
+    return 0 if accepted == len(payloads) else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except requests.RequestException as e:
+        print(f"❌ No se pudo conectar con el receptor: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)